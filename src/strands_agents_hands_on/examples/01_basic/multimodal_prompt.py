@@ -2,21 +2,23 @@ from pathlib import Path
 
 from strands import Agent
 
+from strands_agents_hands_on.examples.image_preprocessing import ImagePreprocessor
+
 agent = Agent()
 
 image1_path = Path("data/images/image1.png")
 image2_path = Path("data/images/image2.png")
 
-with image1_path.open("rb") as fp:
-    image1_bytes = fp.read()
-
-with image2_path.open("rb") as fp:
-    image2_bytes = fp.read()
+# 画像は縮小・再エンコードしてから送り、同じ内容の画像は再処理せずキャッシュから返す
+preprocessor = ImagePreprocessor()
 
 response = agent(
     [
         {"text": "これら2つの画像を比較して、違いを説明してください"},
-        {"image": {"format": "png", "source": {"bytes": image1_bytes}}},
-        {"image": {"format": "png", "source": {"bytes": image2_bytes}}},
+        preprocessor.content_block(image1_path),
+        preprocessor.content_block(image2_path),
     ]
 )
+
+stats = preprocessor.stats
+print(f"\n画像の削減: {stats.bytes_saved:,}B (追加レイテンシ {stats.mean_latency_ms:.1f}ms/枚)")
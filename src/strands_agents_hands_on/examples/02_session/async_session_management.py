@@ -0,0 +1,269 @@
+"""Usage example for the asyncio SQLite session repository.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.async_session_management user-123
+
+    # 2回目の実行: セッションが保存されているか確認
+    uv run python -m strands_agents_hands_on.examples.02_session.async_session_management user-123 second
+"""
+
+import asyncio
+import atexit
+import logging
+import queue
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Self
+
+from strands import Agent
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+from .custom_session_management import SQLiteSessionRepository
+
+logger = logging.getLogger(__name__)
+
+_Request = tuple[Callable[..., Any], tuple[Any, ...], Future[Any]]
+
+
+class AsyncSQLiteSessionRepository(SessionRepository):
+    """SQLite session repository that keeps all database I/O off the event loop.
+
+    Every operation is sent through a request queue to one dedicated worker thread,
+    in the same way aiosqlite drives a connection, so requests are executed in the
+    order they were submitted and no new dependency is needed.
+
+    The ``*_async`` methods await the result without blocking the event loop. The
+    ``SessionRepository`` methods form the sync adapter used by
+    ``RepositorySessionManager``: reads block until the worker answers, while writes
+    are only enqueued, because the session manager calls them from hook callbacks that
+    run on the event loop during ``invoke_async``/``stream_async``. FIFO ordering still
+    guarantees that a read observes every write submitted before it. Failed
+    fire-and-forget writes are logged.
+    """
+
+    def __init__(self, db_path: str = "sessions.db", **pool_kwargs: Any) -> None:
+        """Initialize the async repository and start its worker thread.
+
+        Args:
+            db_path: Path to the SQLite database file
+            **pool_kwargs: Connection pool options forwarded to SQLiteSessionRepository
+
+        """
+        self._repository = SQLiteSessionRepository(db_path=db_path, **pool_kwargs)
+        self._requests: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="sqlite-async-worker", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        """Execute queued requests until the stop sentinel is received."""
+        while (request := self._requests.get()) is not None:
+            func, args, future = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:  # noqa: BLE001
+                future.set_exception(e)
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future[Any]:
+        """Queue a call for the worker thread and return its future."""
+        if self._closed:
+            raise RuntimeError("Cannot operate on a closed repository.")
+        future: Future[Any] = Future()
+        self._requests.put((func, args, future))
+        return future
+
+    def _submit_write(self, func: Callable[..., Any], *args: Any) -> None:
+        """Queue a write without waiting for it, logging it if it fails."""
+        self._submit(func, *args).add_done_callback(_log_write_failure)
+
+    # Async API
+    async def create_session_async(self, session: Session) -> Session:
+        """Create a new session."""
+        return await asyncio.wrap_future(self._submit(self._repository.create_session, session))
+
+    async def read_session_async(self, session_id: str) -> Session | None:
+        """Read a session by ID."""
+        return await asyncio.wrap_future(self._submit(self._repository.read_session, session_id))
+
+    async def create_agent_async(self, session_id: str, session_agent: SessionAgent) -> None:
+        """Create a new agent."""
+        await asyncio.wrap_future(self._submit(self._repository.create_agent, session_id, session_agent))
+
+    async def read_agent_async(self, session_id: str, agent_id: str) -> SessionAgent | None:
+        """Read an agent by ID."""
+        return await asyncio.wrap_future(self._submit(self._repository.read_agent, session_id, agent_id))
+
+    async def update_agent_async(self, session_id: str, session_agent: SessionAgent) -> None:
+        """Update an existing agent."""
+        await asyncio.wrap_future(self._submit(self._repository.update_agent, session_id, session_agent))
+
+    async def create_message_async(self, session_id: str, agent_id: str, session_message: SessionMessage) -> None:
+        """Create a new message."""
+        await asyncio.wrap_future(self._submit(self._repository.create_message, session_id, agent_id, session_message))
+
+    async def read_message_async(self, session_id: str, agent_id: str, message_id: int) -> SessionMessage | None:
+        """Read a message by ID."""
+        return await asyncio.wrap_future(self._submit(self._repository.read_message, session_id, agent_id, message_id))
+
+    async def update_message_async(self, session_id: str, agent_id: str, session_message: SessionMessage) -> None:
+        """Update an existing message."""
+        await asyncio.wrap_future(self._submit(self._repository.update_message, session_id, agent_id, session_message))
+
+    async def list_messages_async(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[SessionMessage]:
+        """List messages for a session."""
+        return await asyncio.wrap_future(
+            self._submit(self._repository.list_messages, session_id, agent_id, limit, offset)
+        )
+
+    async def drain_async(self) -> None:
+        """Wait until every request submitted so far has been executed."""
+        await asyncio.wrap_future(self._submit(_noop))
+
+    # Sync adapter (SessionRepository)
+    def create_session(self, session: Session, **_kwargs: Any) -> Session:
+        """Create a new session and wait for it to be stored."""
+        return self._submit(self._repository.create_session, session).result()
+
+    def read_session(self, session_id: str, **_kwargs: Any) -> Session | None:
+        """Read a session by ID."""
+        return self._submit(self._repository.read_session, session_id).result()
+
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **_kwargs: Any) -> None:
+        """Queue the creation of a new agent."""
+        self._submit_write(self._repository.create_agent, session_id, session_agent)
+
+    def read_agent(self, session_id: str, agent_id: str, **_kwargs: Any) -> SessionAgent | None:
+        """Read an agent by ID."""
+        return self._submit(self._repository.read_agent, session_id, agent_id).result()
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **_kwargs: Any) -> None:
+        """Queue an agent update."""
+        self._submit_write(self._repository.update_agent, session_id, session_agent)
+
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **_kwargs: Any) -> None:
+        """Queue the creation of a new message."""
+        self._submit_write(self._repository.create_message, session_id, agent_id, session_message)
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **_kwargs: Any) -> SessionMessage | None:
+        """Read a message by ID."""
+        return self._submit(self._repository.read_message, session_id, agent_id, message_id).result()
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **_kwargs: Any) -> None:
+        """Queue a message update."""
+        self._submit_write(self._repository.update_message, session_id, agent_id, session_message)
+
+    def list_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        **_kwargs: Any,
+    ) -> list[SessionMessage]:
+        """List messages for a session."""
+        return self._submit(self._repository.list_messages, session_id, agent_id, limit, offset).result()
+
+    def drain(self) -> None:
+        """Block until every request submitted so far has been executed."""
+        self._submit(_noop).result()
+
+    # Lifecycle
+    def close(self) -> None:
+        """Execute the remaining queued requests, stop the worker and close the database."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._requests.put(None)
+        self._worker.join()
+        self._repository.close()
+
+    async def aclose(self) -> None:
+        """Close the repository without blocking the event loop."""
+        await asyncio.to_thread(self.close)
+
+    def __enter__(self) -> Self:
+        """Use the repository as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Close the repository."""
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        """Use the repository as an async context manager that closes it on exit."""
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Close the repository."""
+        await self.aclose()
+
+
+def _noop() -> None:
+    """Marker request used to wait for the queue to drain."""
+
+
+def _log_write_failure(future: Future[Any]) -> None:
+    """Log the error of a fire-and-forget write."""
+    if not future.cancelled() and (error := future.exception()) is not None:
+        logger.error("async session write failed", exc_info=error)
+
+
+async def main(session_id: str, *, second: bool) -> None:
+    db_path = "data/sessions.db"
+    Path("data").mkdir(exist_ok=True)
+
+    async with AsyncSQLiteSessionRepository(db_path=db_path) as sqlite_repo:
+        session_manager = RepositorySessionManager(session_id=session_id, session_repository=sqlite_repo)
+        agent = Agent(session_manager=session_manager)
+
+        if second:
+            print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+            await agent.invoke_async("さっき私が教えた数字は何でしたか?")
+        else:
+            print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+            await agent.invoke_async("私の好きな数字は42です。覚えておいてください。")
+            print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+            print(
+                "uv run python -m strands_agents_hands_on.examples.02_session."
+                f"async_session_management {session_id} second"
+            )
+
+        # セッションに保存されたメッセージをイベントループをブロックせずに取得
+        messages = await sqlite_repo.list_messages_async(session_id, agent.agent_id)
+        print(f"\n保存済みメッセージ数: {len(messages)}")
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "async_session_management <session_id> [second]"
+        )
+        sys.exit(1)
+
+    asyncio.run(
+        main(
+            sys.argv[1],
+            second=len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second",
+        )
+    )
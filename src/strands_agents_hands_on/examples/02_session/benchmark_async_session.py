@@ -0,0 +1,98 @@
+"""Benchmark event-loop latency while many sessions persist messages concurrently.
+
+Usage:
+    # 500 セッションが同時に書き込む間のイベントループ遅延を計測
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_async_session
+
+    # セッション数とセッションあたりのメッセージ数を変更
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_async_session --sessions 1000 --messages 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from strands.types.session import Session, SessionAgent, SessionMessage, SessionType
+
+from .async_session_management import AsyncSQLiteSessionRepository
+from .custom_session_management import SQLiteSessionRepository
+
+HEARTBEAT_INTERVAL = 0.001
+
+
+def _make_message(index: int) -> SessionMessage:
+    role = "user" if index % 2 == 0 else "assistant"
+    return SessionMessage.from_message({"role": role, "content": [{"text": f"message {index} " * 8}]}, index)
+
+
+async def _heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up a task that sleeps HEARTBEAT_INTERVAL."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(time.perf_counter() - start - HEARTBEAT_INTERVAL)
+
+
+async def _persist_sync(repo: SQLiteSessionRepository, session_id: str, messages: int) -> None:
+    """Persist a session by calling the blocking repository from a coroutine."""
+    repo.create_session(Session(session_id=session_id, session_type=SessionType.AGENT))
+    repo.create_agent(session_id, SessionAgent(agent_id="default", state={}, conversation_manager_state={}))
+    for index in range(messages):
+        repo.create_message(session_id, "default", _make_message(index))
+        await asyncio.sleep(0)
+
+
+async def _persist_async(repo: AsyncSQLiteSessionRepository, session_id: str, messages: int) -> None:
+    """Persist a session through the async repository."""
+    await repo.create_session_async(Session(session_id=session_id, session_type=SessionType.AGENT))
+    await repo.create_agent_async(session_id, SessionAgent(agent_id="default", state={}, conversation_manager_state={}))
+    for index in range(messages):
+        await repo.create_message_async(session_id, "default", _make_message(index))
+
+
+async def bench(mode: str, db_path: str, sessions: int, messages: int) -> None:
+    """Run ``sessions`` concurrent persisting tasks and print event-loop lag statistics."""
+    lags: list[float] = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+
+    start = time.perf_counter()
+    if mode == "sync":
+        sync_repo = SQLiteSessionRepository(db_path=db_path)
+        await asyncio.gather(*(_persist_sync(sync_repo, f"sync-{i}", messages) for i in range(sessions)))
+        sync_repo.close()
+    else:
+        async with AsyncSQLiteSessionRepository(db_path=db_path) as async_repo:
+            await asyncio.gather(*(_persist_async(async_repo, f"async-{i}", messages) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await heartbeat
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{mode:>6} | {sessions * messages / elapsed:>12,.0f} | {statistics.median(lags_ms):>8.2f} | "
+        f"{p99:>8.2f} | {lags_ms[-1]:>8.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=10, help="messages persisted by each session")
+    args = parser.parse_args()
+
+    print(f"sessions={args.sessions} messages/session={args.messages}")
+    print(f"{'mode':>6} | {'messages/sec':>12} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | {'max (ms)':>8}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode in ("sync", "async"):
+            asyncio.run(bench(mode, str(Path(tmp_dir) / f"{mode}.db"), args.sessions, args.messages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark restoring long sessions with OFFSET pagination and keyset iteration.
+
+Usage:
+    # 10k / 50k メッセージのセッションの復元時間を計測
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_list_messages
+
+    # セッションサイズを指定
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_list_messages --sizes 10000 100000
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from strands.types.session import Session, SessionAgent, SessionMessage, SessionType
+
+from .custom_session_management import INSERT_MESSAGE_SQL, SQLiteSessionRepository
+
+PAGE_SIZE = 500
+TAIL_SIZE = 100
+
+# The pre-keyset implementation: one LIMIT/OFFSET query per page
+OFFSET_PAGE_SQL = """
+    SELECT message_id, message, redact_message, created_at, updated_at, blob_refs
+    FROM messages
+    WHERE session_id = ? AND agent_id = ?
+    ORDER BY message_id ASC
+    LIMIT ? OFFSET ?
+"""
+
+
+def _populate(repo: SQLiteSessionRepository, session_id: str, size: int) -> None:
+    repo.create_session(Session(session_id=session_id, session_type=SessionType.AGENT))
+    repo.create_agent(session_id, SessionAgent(agent_id="default", state={}, conversation_manager_state={}))
+    blobs: dict[str, bytes] = {}
+    rows = [
+        repo._message_insert_params(  # noqa: SLF001
+            session_id,
+            "default",
+            SessionMessage.from_message(
+                {"role": "user" if i % 2 == 0 else "assistant", "content": [{"text": f"message {i} " * 16}]}, i
+            ),
+            blobs,
+        )
+        for i in range(size)
+    ]
+    with sqlite3.connect(repo.db_path) as conn:
+        conn.executemany(INSERT_MESSAGE_SQL, rows)
+
+
+def _offset_pages(repo: SQLiteSessionRepository, session_id: str, offset: int) -> int:
+    """Restore by paging with LIMIT/OFFSET and decoding each page eagerly."""
+    count = 0
+    with sqlite3.connect(repo.db_path) as conn:
+        while True:
+            rows = conn.execute(OFFSET_PAGE_SQL, (session_id, "default", PAGE_SIZE, offset)).fetchall()
+            messages = [repo._row_to_message(row, {}) for row in rows]  # noqa: SLF001
+            count += len(messages)
+            offset += PAGE_SIZE
+            if len(rows) < PAGE_SIZE:
+                return count
+
+
+def _keyset(repo: SQLiteSessionRepository, session_id: str, offset: int) -> int:
+    """Restore by streaming iter_messages, as list_messages does."""
+    after_message_id = offset - 1 if offset else None
+    return sum(1 for _ in repo.iter_messages(session_id, "default", after_message_id, batch_size=PAGE_SIZE))
+
+
+def _measure(func: Callable[..., int], *args: Any) -> tuple[float, float]:
+    """Return (seconds, peak traced MiB) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"page/batch size={PAGE_SIZE}, tail restore = last {TAIL_SIZE} messages")
+    print(f"{'messages':>9} | {'method':>7} | {'full (ms)':>9} | {'peak (MiB)':>10} | {'tail (ms)':>9}")
+    print("-" * 58)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = SQLiteSessionRepository(db_path=str(Path(tmp_dir) / "bench.db"))
+        for size in args.sizes:
+            session_id = f"bench-{size}"
+            _populate(repo, session_id, size)
+            for label, func in (("offset", _offset_pages), ("keyset", _keyset)):
+                full, peak = _measure(func, repo, session_id, 0)
+                tail, _ = _measure(func, repo, session_id, size - TAIL_SIZE)
+                print(f"{size:>9} | {label:>7} | {full * 1000:>9.1f} | {peak:>10.2f} | {tail * 1000:>9.2f}")
+
+            start = time.perf_counter()
+            repo.list_messages(session_id, "default", offset=size - TAIL_SIZE)
+            print(
+                f"{size:>9} | list_messages(offset={size - TAIL_SIZE}): {(time.perf_counter() - start) * 1000:.2f} ms"
+            )
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark message codecs and blob storage on an image-heavy session.
+
+Usage:
+    # data/images の画像を含むメッセージを保存し、DBサイズと list_messages の時間を比較
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_message_codec
+
+    # メッセージ数を変更
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_message_codec --messages 500
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from strands.types.session import Session, SessionAgent, SessionMessage, SessionType
+
+from .custom_session_management import SQLiteSessionRepository
+from .message_codec import CompactBinaryCodec, JSONCodec, MessageCodec, ZlibCodec
+
+IMAGE_PATHS = (Path("data/images/image1.png"), Path("data/images/image2.png"))
+
+# (label, codec, store image bytes in the blob table)
+CONFIGURATIONS: tuple[tuple[str, MessageCodec, bool], ...] = (
+    ("json (inline)", JSONCodec(), False),
+    ("json + blobs", JSONCodec(), True),
+    ("binary + blobs", CompactBinaryCodec(), True),
+    ("zlib + blobs", ZlibCodec(), True),
+)
+
+
+def _make_message(index: int, images: list[bytes]) -> SessionMessage:
+    """Build a message that sends one of the sample images, as in the multimodal examples."""
+    if index % 2 == 0:
+        content = [
+            {"text": "これら2つの画像を比較して、違いを説明してください"},
+            {"image": {"format": "png", "source": {"bytes": images[index // 2 % len(images)]}}},
+        ]
+        return SessionMessage.from_message({"role": "user", "content": content}, index)
+    return SessionMessage.from_message({"role": "assistant", "content": [{"text": "画像の説明です。" * 20}]}, index)
+
+
+def bench(
+    db_path: Path, codec: MessageCodec, *, use_blobs: bool, messages: int, images: list[bytes]
+) -> tuple[float, float, float]:
+    """Write ``messages`` messages, restore them and return (write seconds, list seconds, DB size in MiB)."""
+    repo = SQLiteSessionRepository(db_path=str(db_path), codec=codec)
+    if not use_blobs:
+        repo.blob_min_size = sys.maxsize
+    repo.create_session(Session(session_id="bench", session_type=SessionType.AGENT))
+    repo.create_agent("bench", SessionAgent(agent_id="default", state={}, conversation_manager_state={}))
+
+    start = time.perf_counter()
+    for index in range(messages):
+        repo.create_message("bench", "default", _make_message(index, images))
+    write_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    repo.list_messages("bench", "default")
+    list_elapsed = time.perf_counter() - start
+    repo.close()
+
+    size_mb = sum(path.stat().st_size for path in db_path.parent.glob(f"{db_path.name}*")) / 1024 / 1024
+    return write_elapsed, list_elapsed, size_mb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    images = [path.read_bytes() for path in IMAGE_PATHS]
+    print(f"messages={args.messages} images={[f'{len(image) / 1024:.0f} KiB' for image in images]}")
+    print(f"{'codec':>15} | {'write (s)':>9} | {'list (ms)':>9} | {'db (MiB)':>8}")
+    print("-" * 52)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for index, (label, codec, use_blobs) in enumerate(CONFIGURATIONS):
+            db_path = Path(tmp_dir) / f"codec-{index}.db"
+            write_elapsed, list_elapsed, size_mb = bench(
+                db_path, codec, use_blobs=use_blobs, messages=args.messages, images=images
+            )
+            print(f"{label:>15} | {write_elapsed:>9.2f} | {list_elapsed * 1000:>9.1f} | {size_mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark restoring S3 sessions sequentially and in parallel, against moto's local S3 stand-in.
+
+Usage:
+    # メッセージ数ごとの復元時間を計測 (リクエストごとに 20ms の遅延を付与、moto は dev 依存に含まれる)
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_s3_session
+
+    # メッセージ数と疑似ネットワーク遅延を変更
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_s3_session \
+        --sizes 100 1000 --latency-ms 50
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import boto3
+from moto import mock_aws
+from strands.session.s3_session_manager import S3SessionManager
+from strands.types.session import SessionAgent, SessionMessage
+
+from .parallel_s3_session_management import ParallelS3SessionManager
+
+BUCKET = "strands-agents-hands-on-bench"
+REGION = "us-east-1"
+
+
+def _make_message(index: int) -> SessionMessage:
+    role = "user" if index % 2 == 0 else "assistant"
+    return SessionMessage.from_message({"role": role, "content": [{"text": f"message {index} " * 16}]}, index)
+
+
+def _add_latency(boto_session: boto3.Session, latency: float) -> None:
+    """Delay every S3 request by ``latency`` seconds to emulate the network round-trip."""
+
+    def sleep(**_kwargs: Any) -> None:
+        time.sleep(latency)
+
+    boto_session.events.register("before-send.s3", sleep)
+
+
+def _restore(manager: S3SessionManager, session_id: str, expected: int) -> float:
+    start = time.perf_counter()
+    messages = manager.list_messages(session_id, "default")
+    elapsed = time.perf_counter() - start
+    if len(messages) != expected:
+        msg = f"restored {len(messages)} messages, expected {expected}"
+        raise RuntimeError(msg)
+    return elapsed
+
+
+def bench(boto_session: boto3.Session, size: int, workers: int, cache_dir: str) -> dict[str, float]:
+    """Store a session of ``size`` messages and return the restore latency of each configuration."""
+    session_id = f"bench-{size}"
+    sequential = S3SessionManager(session_id=session_id, bucket=BUCKET, boto_session=boto_session)
+    sequential.create_agent(session_id, SessionAgent(agent_id="default", state={}, conversation_manager_state={}))
+    for index in range(size):
+        sequential.create_message(session_id, "default", _make_message(index))
+
+    parallel = ParallelS3SessionManager(
+        session_id=session_id, bucket=BUCKET, boto_session=boto_session, max_workers=workers
+    )
+    cached = ParallelS3SessionManager(
+        session_id=session_id, bucket=BUCKET, boto_session=boto_session, max_workers=workers, cache_dir=cache_dir
+    )
+    results = {
+        "sequential": _restore(sequential, session_id, size),
+        "parallel": _restore(parallel, session_id, size),
+        "cache cold": _restore(cached, session_id, size),
+        "cache warm": _restore(cached, session_id, size),
+    }
+    parallel.pack_segments(session_id, "default")
+    results["segments"] = _restore(parallel, session_id, size)
+    parallel.close()
+    cached.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="emulated latency of each S3 request")
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} latency/request={args.latency_ms}ms")
+    labels = ("sequential", "parallel", "cache cold", "cache warm", "segments")
+    print(f"{'messages':>8} | " + " | ".join(f"{label + ' (s)':>14}" for label in labels))
+    print("-" * (11 + 17 * len(labels)))
+    with mock_aws(), tempfile.TemporaryDirectory() as tmp_dir:
+        boto_session = boto3.Session(region_name=REGION)
+        boto_session.client("s3").create_bucket(Bucket=BUCKET)
+        _add_latency(boto_session, args.latency_ms / 1000)
+        for size in args.sizes:
+            results = bench(boto_session, size, args.workers, str(Path(tmp_dir) / f"cache-{size}"))
+            print(f"{size:>8} | " + " | ".join(f"{results[label]:>14.3f}" for label in labels))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark for the SQLite session repository.
+
+Usage:
+    # 1, 8, 64 並列の書き込みスレッドでメッセージ書き込み性能を計測
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_sqlite_session
+
+    # synchronous モードを変更 (--messages でスレッドあたりのメッセージ数も変更可能)
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_sqlite_session --synchronous FULL
+
+    # write-behind バッチ書き込みを有効化
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_sqlite_session --write-behind
+
+    # セッションを 8 つの DB ファイルにシャーディング (--write-behind と組み合わせ可能)
+    uv run python -m strands_agents_hands_on.examples.02_session.benchmark_sqlite_session --shards 8
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from strands.types.session import Session, SessionAgent, SessionMessage, SessionType
+
+from .custom_session_management import SQLiteSessionRepository
+from .sharded_session_management import ShardedSQLiteSessionRepository
+from .write_behind_session_management import WriteBehindSQLiteSessionRepository
+
+WRITER_COUNTS = (1, 8, 64)
+
+
+def _make_message(index: int) -> SessionMessage:
+    role = "user" if index % 2 == 0 else "assistant"
+    return SessionMessage.from_message({"role": role, "content": [{"text": f"message {index} " * 8}]}, index)
+
+
+def bench_concurrent_writers(
+    repo: SQLiteSessionRepository | ShardedSQLiteSessionRepository,
+    writers: int,
+    messages_per_writer: int,
+) -> float:
+    """Write messages from ``writers`` threads, each to its own session, and return messages/sec."""
+    run_id = time.perf_counter_ns()
+    session_ids = [f"bench-{run_id}-{writers}-{i}" for i in range(writers)]
+    for session_id in session_ids:
+        repo.create_session(Session(session_id=session_id, session_type=SessionType.AGENT))
+        repo.create_agent(session_id, SessionAgent(agent_id="default", state={}, conversation_manager_state={}))
+
+    barrier = threading.Barrier(writers + 1)
+
+    def write(session_id: str) -> None:
+        barrier.wait()
+        for index in range(messages_per_writer):
+            repo.create_message(session_id, "default", _make_message(index))
+
+    threads = [threading.Thread(target=write, args=(session_id,)) for session_id in session_ids]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    if isinstance(repo, WriteBehindSQLiteSessionRepository | ShardedSQLiteSessionRepository):
+        repo.flush()
+    elapsed = time.perf_counter() - start
+
+    return writers * messages_per_writer / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="messages written by each writer thread")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--synchronous", default="NORMAL")
+    parser.add_argument("--write-behind", action="store_true", help="buffer writes and flush them in batches")
+    parser.add_argument("--shards", type=int, default=1, help="number of database files sessions are spread over")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "bench.db")
+        repo: SQLiteSessionRepository | ShardedSQLiteSessionRepository
+        if args.shards > 1:
+            repo = ShardedSQLiteSessionRepository(
+                shard_dir=tmp_dir,
+                shard_count=args.shards,
+                repository_class=WriteBehindSQLiteSessionRepository if args.write_behind else SQLiteSessionRepository,
+                pool_size=args.pool_size,
+                synchronous=args.synchronous,
+            )
+        elif args.write_behind:
+            repo = WriteBehindSQLiteSessionRepository(
+                db_path=db_path,
+                pool_size=args.pool_size,
+                synchronous=args.synchronous,
+            )
+        else:
+            repo = SQLiteSessionRepository(db_path=db_path, pool_size=args.pool_size, synchronous=args.synchronous)
+        print(
+            f"pool_size={args.pool_size} synchronous={args.synchronous} "
+            f"write_behind={args.write_behind} shards={args.shards} messages/writer={args.messages}"
+        )
+        print(f"{'writers':>8} | {'messages/sec':>12}")
+        print("-" * 23)
+        for writers in WRITER_COUNTS:
+            throughput = bench_concurrent_writers(repo, writers, args.messages)
+            print(f"{writers:>8} | {throughput:>12,.0f}")
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
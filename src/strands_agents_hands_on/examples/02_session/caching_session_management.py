@@ -0,0 +1,241 @@
+"""Usage example for an in-process LRU cache in front of a session repository.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.caching_session_management user-123
+
+    # 2回目の実行: セッションが保存されているか確認
+    uv run python -m strands_agents_hands_on.examples.02_session.caching_session_management user-123 second
+"""
+
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from strands import Agent
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+from .custom_session_management import SQLiteSessionRepository
+
+CacheKey = tuple[Any, ...]
+
+
+@dataclass
+class CacheStats:
+    """Counters of a CachingSessionRepository.
+
+    Attributes:
+        hits: Reads answered from the cache
+        misses: Reads forwarded to the wrapped repository (including expired entries)
+        evictions: Entries dropped because the cache was full
+        expirations: Entries dropped because they outlived the TTL
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of reads answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachingSessionRepository(SessionRepository):
+    """Bounded LRU cache with TTL in front of any SessionRepository.
+
+    ``read_session``, ``read_agent`` and ``read_message`` results are cached in memory,
+    so repeated reads of a hot session skip the storage round-trip. Writes go to the
+    wrapped repository first and then invalidate the affected entry, because some
+    repositories (such as Strands' S3 and file managers) store values that differ from
+    the ones passed in, for example by keeping the original ``created_at``.
+
+    Cached values are copied on the way in and out, as callers like
+    ``RepositorySessionManager`` mutate the objects they get back. ``list_messages`` is
+    passed through uncached: sessions are restored through it and rarely read a message
+    again, so copying every listed message (images included) into the cache would cost
+    time and evict the hot session and agent entries.
+
+    The wrapped repository can be the SQLite repository of this package or a
+    ``FileSessionManager``/``S3SessionManager``, which are repositories themselves.
+    """
+
+    def __init__(self, repository: SessionRepository, max_entries: int = 1024, ttl: float | None = 60.0) -> None:
+        """Initialize the caching repository.
+
+        Args:
+            repository: Repository to cache reads from
+            max_entries: Maximum number of cached sessions, agents and messages
+            ttl: Seconds an entry stays valid (None to keep entries until evicted)
+
+        """
+        self.repository = repository
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._stats = CacheStats()
+        # Incremented by every invalidation, so a load racing with a write is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Copy of the current cache counters."""
+        with self._lock:
+            return copy.copy(self._stats)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    # Session methods
+    def create_session(self, session: Session, **kwargs: Any) -> Session:
+        """Create a new session."""
+        created = self.repository.create_session(session, **kwargs)
+        self._invalidate(("session", session.session_id))
+        return created
+
+    def read_session(self, session_id: str, **kwargs: Any) -> Session | None:
+        """Read a session by ID."""
+        key = ("session", session_id)
+        return self._read(key, lambda: self.repository.read_session(session_id, **kwargs))
+
+    # Agent methods
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """Create a new agent."""
+        self.repository.create_agent(session_id, session_agent, **kwargs)
+        self._invalidate(("agent", session_id, session_agent.agent_id))
+
+    def read_agent(self, session_id: str, agent_id: str, **kwargs: Any) -> SessionAgent | None:
+        """Read an agent by ID."""
+        key = ("agent", session_id, agent_id)
+        return self._read(key, lambda: self.repository.read_agent(session_id, agent_id, **kwargs))
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """Update an existing agent."""
+        self.repository.update_agent(session_id, session_agent, **kwargs)
+        self._invalidate(("agent", session_id, session_agent.agent_id))
+
+    # Message methods
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """Create a new message."""
+        self.repository.create_message(session_id, agent_id, session_message, **kwargs)
+        self._invalidate(("message", session_id, agent_id, session_message.message_id))
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs: Any) -> SessionMessage | None:
+        """Read a message by ID."""
+        key = ("message", session_id, agent_id, message_id)
+        return self._read(key, lambda: self.repository.read_message(session_id, agent_id, message_id, **kwargs))
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """Update an existing message."""
+        self.repository.update_message(session_id, agent_id, session_message, **kwargs)
+        self._invalidate(("message", session_id, agent_id, session_message.message_id))
+
+    def list_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        **kwargs: Any,
+    ) -> list[SessionMessage]:
+        """List messages for a session."""
+        return self.repository.list_messages(session_id, agent_id, limit=limit, offset=offset, **kwargs)
+
+    # Cache helpers
+    def _read(self, key: CacheKey, load: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, loading and caching it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+                self._stats.expirations += 1
+            self._stats.misses += 1
+            generation = self._generation
+
+        value = load()
+        # Missing rows are not cached, so a create from another process becomes visible at once
+        if value is not None:
+            self._store(key, value, generation)
+        return value
+
+    def _store(self, key: CacheKey, value: Any, generation: int) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (expires_at, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "caching_session_management <session_id> [second]"
+        )
+        sys.exit(1)
+
+    session_id = sys.argv[1]
+
+    db_path = "data/sessions.db"
+    Path("data").mkdir(exist_ok=True)
+
+    # S3SessionManager や FileSessionManager もそのままラップできる
+    with SQLiteSessionRepository(db_path=db_path) as sqlite_repo:
+        caching_repo = CachingSessionRepository(sqlite_repo, max_entries=1024, ttl=60.0)
+        session_manager = RepositorySessionManager(session_id=session_id, session_repository=caching_repo)
+        agent = Agent(session_manager=session_manager)
+
+        if len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second":
+            print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+            response = agent("さっき私が教えた数字は何でしたか?")
+        else:
+            print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+            response = agent("私の好きな数字は42です。覚えておいてください。")
+            print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+            print(
+                "uv run python -m strands_agents_hands_on.examples.02_session."
+                f"caching_session_management {session_id} second"
+            )
+
+        # 同じセッションを読み直すとストレージにアクセスせずキャッシュから返される
+        for _ in range(3):
+            caching_repo.read_session(session_id)
+            caching_repo.read_agent(session_id, agent.agent_id)
+        stats = caching_repo.stats
+        print(
+            f"\nキャッシュ: hits={stats.hits} misses={stats.misses} evictions={stats.evictions} "
+            f"expirations={stats.expirations} hit_rate={stats.hit_rate:.0%}"
+        )
@@ -11,9 +11,12 @@ Usage:
 import json
 import sqlite3
 import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Self
 
 from strands import Agent
 from strands.session.repository_session_manager import RepositorySessionManager
@@ -21,23 +24,173 @@ from strands.session.session_repository import SessionRepository
 from strands.types.content import Message
 from strands.types.session import Session, SessionAgent, SessionMessage, SessionType
 
+from .message_codec import MessageCodec, dumps, extract_blobs, loads, resolve_blobs
+from .sqlite_pool import SQLiteConnectionPool
+
+# SQL statements are shared module constants so every pooled connection reuses its prepared statement cache
+INSERT_SESSION_SQL = """
+    INSERT INTO sessions (session_id, session_type, created_at, updated_at)
+    VALUES (?, ?, ?, ?)
+"""
+SELECT_SESSION_SQL = """
+    SELECT session_id, session_type, created_at, updated_at
+    FROM sessions
+    WHERE session_id = ?
+"""
+INSERT_AGENT_SQL = """
+    INSERT INTO agents (agent_id, session_id, state, conversation_manager_state, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SELECT_AGENT_SQL = """
+    SELECT agent_id, state, conversation_manager_state, created_at, updated_at
+    FROM agents
+    WHERE session_id = ? AND agent_id = ?
+"""
+UPDATE_AGENT_SQL = """
+    UPDATE agents
+    SET state = ?, conversation_manager_state = ?, updated_at = ?
+    WHERE session_id = ? AND agent_id = ?
+"""
+INSERT_MESSAGE_SQL = """
+    INSERT INTO messages (
+        session_id, agent_id, message_id, message, redact_message, blob_refs, created_at, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SELECT_MESSAGE_SQL = """
+    SELECT message_id, message, redact_message, created_at, updated_at, blob_refs
+    FROM messages
+    WHERE session_id = ? AND agent_id = ? AND message_id = ?
+"""
+UPDATE_MESSAGE_SQL = """
+    UPDATE messages
+    SET message = ?, redact_message = ?, blob_refs = ?, updated_at = ?
+    WHERE session_id = ? AND agent_id = ? AND message_id = ?
+"""
+ITER_MESSAGES_SQL = """
+    SELECT message_id, message, redact_message, created_at, updated_at, blob_refs
+    FROM messages
+    WHERE session_id = ? AND agent_id = ? AND message_id > ?
+    ORDER BY message_id ASC
+    LIMIT ?
+"""
+# Resolves a row offset to a message_id using only the primary key index
+MESSAGE_ID_AT_OFFSET_SQL = """
+    SELECT message_id
+    FROM messages
+    WHERE session_id = ? AND agent_id = ?
+    ORDER BY message_id ASC
+    LIMIT 1 OFFSET ?
+"""
+SELECT_PRUNED_COUNT_SQL = """
+    SELECT pruned_message_count
+    FROM agents
+    WHERE session_id = ? AND agent_id = ?
+"""
+UPSERT_SNAPSHOT_SQL = """
+    INSERT INTO snapshots (session_id, agent_id, last_message_id, snapshot, blob_refs, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (session_id, agent_id) DO UPDATE SET
+        last_message_id = excluded.last_message_id,
+        snapshot = excluded.snapshot,
+        blob_refs = excluded.blob_refs,
+        created_at = excluded.created_at
+"""
+SELECT_SNAPSHOT_SQL = """
+    SELECT last_message_id, snapshot, blob_refs, created_at
+    FROM snapshots
+    WHERE session_id = ? AND agent_id = ?
+"""
+INSERT_BLOB_SQL = """
+    INSERT OR IGNORE INTO blobs (hash, data)
+    VALUES (?, ?)
+"""
+# Maximum number of host parameters bound in one "hash IN (...)" query
+BLOB_QUERY_BATCH_SIZE = 500
+
+
+@dataclass
+class AgentSnapshot:
+    """Materialized restore state of an agent, stored as a single row.
+
+    Attributes:
+        last_message_id: ID of the newest message included in the snapshot
+        state: Agent state at snapshot time
+        conversation_manager_state: Conversation manager state at snapshot time
+        messages: Messages the conversation manager had not removed at snapshot time
+        created_at: ISO format timestamp for when the snapshot was taken
+
+    """
+
+    last_message_id: int
+    state: dict[str, Any]
+    conversation_manager_state: dict[str, Any]
+    messages: list[SessionMessage]
+    created_at: str = field(default_factory=lambda: datetime.now(UTC).isoformat())
+
 
 class SQLiteSessionRepository(SessionRepository):
-    """SQLite-based session repository implementation."""
+    """SQLite-based session repository implementation.
+
+    Messages are encoded with a pluggable ``MessageCodec`` (JSON by default). Bytes
+    values of at least ``blob_min_size`` bytes, such as image and document sources,
+    are stored once in the content-addressed ``blobs`` table and referenced by their
+    SHA-256 digest from the message.
+
+    ``write_snapshot``/``read_snapshot`` store one ``AgentSnapshot`` per agent for fast
+    cold starts, and ``compact`` deletes messages that conversation managers have
+    removed for good. Pruned messages are counted per agent so ``list_messages``
+    offsets keep pointing at the same messages after compaction.
+    """
 
-    def __init__(self, db_path: str = "sessions.db") -> None:
+    blob_min_size: int = 1024
+
+    def __init__(  # noqa: PLR0913
+        self,
+        db_path: str = "sessions.db",
+        pool_size: int = 8,
+        synchronous: str = "NORMAL",
+        cache_size: int = -64_000,
+        mmap_size: int = 256 * 1024 * 1024,
+        codec: MessageCodec | None = None,
+    ) -> None:
         """Initialize SQLite session repository.
 
         Args:
             db_path: Path to the SQLite database file
+            pool_size: Maximum number of pooled connections
+            synchronous: ``PRAGMA synchronous`` mode (NORMAL is durable under WAL except on power loss)
+            cache_size: ``PRAGMA cache_size`` per connection (negative values are KiB)
+            mmap_size: ``PRAGMA mmap_size`` per connection in bytes
+            codec: Codec for new messages (JSON text when None); rows written by any codec stay readable
 
         """
         self.db_path = db_path
+        self.codec = codec
+        self._pool = SQLiteConnectionPool(
+            db_path,
+            pool_size=pool_size,
+            synchronous=synchronous,
+            cache_size=cache_size,
+            mmap_size=mmap_size,
+        )
         self._init_database()
 
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._pool.close()
+
+    def __enter__(self) -> Self:
+        """Use the repository as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Close the repository."""
+        self.close()
+
     def _init_database(self) -> None:
         """Initialize database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection(write=True) as conn:
             cursor = conn.cursor()
 
             # Sessions table
@@ -57,6 +210,7 @@ class SQLiteSessionRepository(SessionRepository):
                     session_id TEXT NOT NULL,
                     state TEXT NOT NULL,
                     conversation_manager_state TEXT NOT NULL,
+                    pruned_message_count INTEGER NOT NULL DEFAULT 0,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     PRIMARY KEY (session_id, agent_id),
@@ -72,6 +226,7 @@ class SQLiteSessionRepository(SessionRepository):
                     message_id INTEGER NOT NULL,
                     message TEXT NOT NULL,
                     redact_message TEXT,
+                    blob_refs TEXT,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     PRIMARY KEY (session_id, agent_id, message_id),
@@ -79,6 +234,36 @@ class SQLiteSessionRepository(SessionRepository):
                 )
             """)
 
+            # Add columns missing from databases created by earlier versions
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(messages)")}
+            if "blob_refs" not in columns:
+                cursor.execute("ALTER TABLE messages ADD COLUMN blob_refs TEXT")
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(agents)")}
+            if "pruned_message_count" not in columns:
+                cursor.execute("ALTER TABLE agents ADD COLUMN pruned_message_count INTEGER NOT NULL DEFAULT 0")
+
+            # Content-addressed blobs (image/document bytes) shared by messages
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    hash TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
+                )
+            """)
+
+            # Latest restore snapshot of each agent
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    session_id TEXT NOT NULL,
+                    agent_id TEXT NOT NULL,
+                    last_message_id INTEGER NOT NULL,
+                    snapshot TEXT NOT NULL,
+                    blob_refs TEXT,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (session_id, agent_id),
+                    FOREIGN KEY (session_id, agent_id) REFERENCES agents (session_id, agent_id)
+                )
+            """)
+
             # Create indexes for better query performance
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_messages_session_agent
@@ -89,61 +274,60 @@ class SQLiteSessionRepository(SessionRepository):
                 ON agents (session_id)
             """)
 
-            conn.commit()
-
     # Session methods
     def create_session(self, session: Session, **_kwargs: Any) -> Session:
         """Create a new session."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO sessions (session_id, session_type, created_at, updated_at)
-                VALUES (?, ?, ?, ?)
-                """,
+        with self._pool.connection(write=True) as conn:
+            conn.execute(
+                INSERT_SESSION_SQL,
                 (
                     session.session_id,
-                    session.session_type.value,
+                    SessionType(session.session_type).value,
                     session.created_at or datetime.now(UTC).isoformat(),
                     session.updated_at or datetime.now(UTC).isoformat(),
                 ),
             )
-            conn.commit()
         return session
 
     def read_session(self, session_id: str, **_kwargs: Any) -> Session | None:
         """Read a session by ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT session_id, session_type, created_at, updated_at
-                FROM sessions
-                WHERE session_id = ?
-                """,
-                (session_id,),
+        with self._pool.connection() as conn:
+            row = conn.execute(SELECT_SESSION_SQL, (session_id,)).fetchone()
+
+        if row:
+            return Session(
+                session_id=row[0],
+                session_type=SessionType(row[1]),
+                created_at=row[2],
+                updated_at=row[3],
             )
-            row = cursor.fetchone()
-
-            if row:
-                return Session(
-                    session_id=row[0],
-                    session_type=SessionType(row[1]),
-                    created_at=row[2],
-                    updated_at=row[3],
-                )
-            return None
+        return None
+
+    def list_sessions(self) -> list[Session]:
+        """List every session in the database, ordered by session_id."""
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT session_id, session_type, created_at, updated_at FROM sessions ORDER BY session_id"
+            ).fetchall()
+
+        return [
+            Session(session_id=row[0], session_type=SessionType(row[1]), created_at=row[2], updated_at=row[3])
+            for row in rows
+        ]
+
+    def delete_session(self, session_id: str) -> None:
+        """Delete a session with its agents, messages and snapshots."""
+        with self._pool.connection(write=True) as conn:
+            for table in ("snapshots", "messages", "agents", "sessions"):
+                conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))  # noqa: S608
+            self._delete_orphan_blobs(conn)
 
     # Agent methods
     def create_agent(self, session_id: str, session_agent: SessionAgent, **_kwargs: Any) -> None:
         """Create a new agent."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO agents (agent_id, session_id, state, conversation_manager_state, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+        with self._pool.connection(write=True) as conn:
+            conn.execute(
+                INSERT_AGENT_SQL,
                 (
                     session_agent.agent_id,
                     session_id,
@@ -153,118 +337,85 @@ class SQLiteSessionRepository(SessionRepository):
                     session_agent.updated_at or datetime.now(UTC).isoformat(),
                 ),
             )
-            conn.commit()
 
     def read_agent(self, session_id: str, agent_id: str, **_kwargs: Any) -> SessionAgent | None:
         """Read an agent by ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT agent_id, state, conversation_manager_state, created_at, updated_at
-                FROM agents
-                WHERE session_id = ? AND agent_id = ?
-                """,
-                (session_id, agent_id),
+        with self._pool.connection() as conn:
+            row = conn.execute(SELECT_AGENT_SQL, (session_id, agent_id)).fetchone()
+
+        if row:
+            return SessionAgent(
+                agent_id=row[0],
+                state=json.loads(row[1]),
+                conversation_manager_state=json.loads(row[2]),
+                created_at=row[3],
+                updated_at=row[4],
             )
-            row = cursor.fetchone()
-
-            if row:
-                return SessionAgent(
-                    agent_id=row[0],
-                    state=json.loads(row[1]),
-                    conversation_manager_state=json.loads(row[2]),
-                    created_at=row[3],
-                    updated_at=row[4],
-                )
-            return None
+        return None
+
+    def list_agents(self, session_id: str) -> list[SessionAgent]:
+        """List the agents of a session."""
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT agent_id, state, conversation_manager_state, created_at, updated_at "
+                "FROM agents WHERE session_id = ? ORDER BY agent_id",
+                (session_id,),
+            ).fetchall()
+
+        return [
+            SessionAgent(
+                agent_id=row[0],
+                state=json.loads(row[1]),
+                conversation_manager_state=json.loads(row[2]),
+                created_at=row[3],
+                updated_at=row[4],
+            )
+            for row in rows
+        ]
 
     def update_agent(self, session_id: str, session_agent: SessionAgent, **_kwargs: Any) -> None:
         """Update an existing agent."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE agents
-                SET state = ?, conversation_manager_state = ?, updated_at = ?
-                WHERE session_id = ? AND agent_id = ?
-                """,
-                (
-                    json.dumps(session_agent.state),
-                    json.dumps(session_agent.conversation_manager_state),
-                    datetime.now(UTC).isoformat(),
-                    session_id,
-                    session_agent.agent_id,
-                ),
+        with self._pool.connection(write=True) as conn:
+            conn.execute(UPDATE_AGENT_SQL, self._agent_update_params(session_id, session_agent))
+
+    def set_pruned_message_count(self, session_id: str, agent_id: str, count: int) -> None:
+        """Record that the first ``count`` messages of an agent are not stored here.
+
+        ``list_messages`` offsets are positions in the full history, so an agent whose
+        messages were imported without their pruned prefix needs this count.
+        """
+        with self._pool.connection(write=True) as conn:
+            conn.execute(
+                "UPDATE agents SET pruned_message_count = ? WHERE session_id = ? AND agent_id = ?",
+                (count, session_id, agent_id),
             )
-            conn.commit()
 
     # Message methods
     def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **_kwargs: Any) -> None:
         """Create a new message."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO messages (session_id, agent_id, message_id, message, redact_message, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    agent_id,
-                    session_message.message_id,
-                    json.dumps(dict(session_message.message)),
-                    json.dumps(dict(session_message.redact_message)) if session_message.redact_message else None,
-                    session_message.created_at or datetime.now(UTC).isoformat(),
-                    session_message.updated_at or datetime.now(UTC).isoformat(),
-                ),
-            )
-            conn.commit()
+        blobs: dict[str, bytes] = {}
+        params = self._message_insert_params(session_id, agent_id, session_message, blobs)
+        with self._pool.connection(write=True) as conn:
+            conn.executemany(INSERT_BLOB_SQL, blobs.items())
+            conn.execute(INSERT_MESSAGE_SQL, params)
 
     def read_message(self, session_id: str, agent_id: str, message_id: int, **_kwargs: Any) -> SessionMessage | None:
         """Read a message by ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT message_id, message, redact_message, created_at, updated_at
-                FROM messages
-                WHERE session_id = ? AND agent_id = ? AND message_id = ?
-                """,
-                (session_id, agent_id, message_id),
-            )
-            row = cursor.fetchone()
-
-            if row:
-                return SessionMessage(
-                    message_id=row[0],
-                    message=Message(**json.loads(row[1])),
-                    redact_message=Message(**json.loads(row[2])) if row[2] else None,
-                    created_at=row[3],
-                    updated_at=row[4],
-                )
-            return None
+        with self._pool.connection() as conn:
+            row = conn.execute(SELECT_MESSAGE_SQL, (session_id, agent_id, message_id)).fetchone()
+            if row is None:
+                return None
+            blobs = self._fetch_blobs(conn, [row])
+
+        return self._row_to_message(row, blobs)
 
     def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **_kwargs: Any) -> None:
         """Update an existing message."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE messages
-                SET message = ?, redact_message = ?, updated_at = ?
-                WHERE session_id = ? AND agent_id = ? AND message_id = ?
-                """,
-                (
-                    json.dumps(dict(session_message.message)),
-                    json.dumps(dict(session_message.redact_message)) if session_message.redact_message else None,
-                    datetime.now(UTC).isoformat(),
-                    session_id,
-                    agent_id,
-                    session_message.message_id,
-                ),
-            )
-            conn.commit()
+        blobs: dict[str, bytes] = {}
+        params = self._message_update_params(session_id, agent_id, session_message, blobs)
+        with self._pool.connection(write=True) as conn:
+            conn.executemany(INSERT_BLOB_SQL, blobs.items())
+            conn.execute(UPDATE_MESSAGE_SQL, params)
 
     def list_messages(
         self,
@@ -274,33 +425,261 @@ class SQLiteSessionRepository(SessionRepository):
         offset: int = 0,
         **_kwargs: Any,
     ) -> list[SessionMessage]:
-        """List messages for a session."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        """List messages for a session.
+
+        ``offset`` is resolved to a message_id once, then the messages are read with
+        keyset pagination through ``iter_messages``. Offsets count messages removed by
+        ``compact`` as well, so they are unaffected by compaction.
+        """
+        after_message_id = None
+        if offset > 0:
+            with self._pool.connection() as conn:
+                pruned = conn.execute(SELECT_PRUNED_COUNT_SQL, (session_id, agent_id)).fetchone()
+                position = offset - (pruned[0] if pruned else 0)
+                row = conn.execute(MESSAGE_ID_AT_OFFSET_SQL, (session_id, agent_id, position)).fetchone()
+            if row is None:
+                return []
+            after_message_id = row[0] - 1
+
+        messages = self.iter_messages(session_id, agent_id, after_message_id=after_message_id)
+        return list(islice(messages, limit))
+
+    def iter_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        after_message_id: int | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SessionMessage]:
+        """Stream messages in message_id order using keyset pagination.
 
-            query = """
-                SELECT message_id, message, redact_message, created_at, updated_at
-                FROM messages
-                WHERE session_id = ? AND agent_id = ?
-                ORDER BY message_id ASC
-                LIMIT ? OFFSET ?
-            """
-
-            # SQLite requires explicit limit, use -1 for no limit
-            actual_limit = limit if limit is not None else -1
-            cursor.execute(query, (session_id, agent_id, actual_limit, offset))
-            rows = cursor.fetchall()
-
-            return [
-                SessionMessage(
-                    message_id=row[0],
-                    message=Message(**json.loads(row[1])),
-                    redact_message=Message(**json.loads(row[2])) if row[2] else None,
-                    created_at=row[3],
-                    updated_at=row[4],
+        Each batch is one ``message_id > ?`` range scan on the primary key, so the cost
+        of a page does not grow with its position in the session, and rows are decoded
+        only when the caller advances the iterator. No connection is held between
+        batches, so the iterator can be consumed slowly or abandoned.
+
+        Args:
+            session_id: Session to read
+            agent_id: Agent to read
+            after_message_id: Only yield messages with a greater message_id (all messages when None)
+            batch_size: Number of rows fetched per query
+
+        Yields:
+            Messages in ascending message_id order
+
+        """
+        last_message_id = after_message_id if after_message_id is not None else -1
+        while True:
+            with self._pool.connection() as conn:
+                rows = conn.execute(ITER_MESSAGES_SQL, (session_id, agent_id, last_message_id, batch_size)).fetchall()
+                blobs = self._fetch_blobs(conn, rows)
+
+            for row in rows:
+                yield self._row_to_message(row, blobs)
+
+            if len(rows) < batch_size:
+                return
+            last_message_id = rows[-1][0]
+
+    # Snapshot and compaction methods
+    def write_snapshot(self, session_id: str, agent_id: str, snapshot: AgentSnapshot) -> None:
+        """Store the snapshot of an agent, replacing the previous one."""
+        blobs: dict[str, bytes] = {}
+        payload = {
+            "state": snapshot.state,
+            "conversation_manager_state": snapshot.conversation_manager_state,
+            "messages": [
+                {
+                    "message_id": message.message_id,
+                    "message": message.message,
+                    "redact_message": message.redact_message,
+                    "created_at": message.created_at,
+                    "updated_at": message.updated_at,
+                }
+                for message in snapshot.messages
+            ],
+        }
+        encoded = dumps(extract_blobs(payload, blobs, self.blob_min_size), self.codec)
+        with self._pool.connection(write=True) as conn:
+            conn.executemany(INSERT_BLOB_SQL, blobs.items())
+            conn.execute(
+                UPSERT_SNAPSHOT_SQL,
+                (session_id, agent_id, snapshot.last_message_id, encoded, " ".join(blobs) or None, snapshot.created_at),
+            )
+
+    def read_snapshot(self, session_id: str, agent_id: str) -> AgentSnapshot | None:
+        """Read the latest snapshot of an agent."""
+        with self._pool.connection() as conn:
+            row = conn.execute(SELECT_SNAPSHOT_SQL, (session_id, agent_id)).fetchone()
+            if row is None:
+                return None
+            # Reuse the message row layout so _fetch_blobs finds blob_refs at index 5
+            blobs = self._fetch_blobs(conn, [(None, None, None, None, None, row[2])])
+
+        payload = _decode_message(row[1], blobs if row[2] else None)
+        return AgentSnapshot(
+            last_message_id=row[0],
+            state=payload["state"],
+            conversation_manager_state=payload["conversation_manager_state"],
+            messages=[SessionMessage(**message) for message in payload["messages"]],
+            created_at=row[3],
+        )
+
+    def compact(self, *, vacuum: bool = False) -> dict[str, int]:
+        """Delete messages that conversation managers will never load again.
+
+        A message is prunable once its position is below the ``removed_message_count``
+        stored in the agent's conversation manager state, because
+        ``RepositorySessionManager`` restores agents with
+        ``list_messages(offset=removed_message_count)``. Blobs no longer referenced by
+        any message or snapshot are deleted as well.
+
+        Args:
+            vacuum: Run VACUUM afterwards to return the freed pages to the file system
+
+        Returns:
+            Number of deleted ``messages`` and ``blobs``
+
+        """
+        deleted_messages = 0
+        with self._pool.connection(write=True) as conn:
+            agents = conn.execute(
+                "SELECT session_id, agent_id, conversation_manager_state, pruned_message_count FROM agents"
+            ).fetchall()
+            for session_id, agent_id, conversation_manager_state, pruned in agents:
+                removed = json.loads(conversation_manager_state).get("removed_message_count", 0)
+                if removed <= pruned:
+                    continue
+                row = conn.execute(MESSAGE_ID_AT_OFFSET_SQL, (session_id, agent_id, removed - pruned)).fetchone()
+                cursor = conn.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND agent_id = ? AND message_id < ?",
+                    (session_id, agent_id, row[0] if row else sys.maxsize),
+                )
+                conn.execute(
+                    "UPDATE agents SET pruned_message_count = ? WHERE session_id = ? AND agent_id = ?",
+                    (pruned + cursor.rowcount, session_id, agent_id),
                 )
-                for row in rows
-            ]
+                deleted_messages += cursor.rowcount
+
+            deleted_blobs = self._delete_orphan_blobs(conn)
+
+        if vacuum:
+            with self._pool.connection(write=True) as conn:
+                conn.execute("VACUUM")
+
+        return {"messages": deleted_messages, "blobs": deleted_blobs}
+
+    def delete_orphan_blobs(self) -> int:
+        """Delete blobs no longer referenced by any message or snapshot and return their number."""
+        with self._pool.connection(write=True) as conn:
+            return self._delete_orphan_blobs(conn)
+
+    @staticmethod
+    def _delete_orphan_blobs(conn: sqlite3.Connection) -> int:
+        live_blobs = {
+            digest
+            for (blob_refs,) in conn.execute(
+                "SELECT blob_refs FROM messages WHERE blob_refs IS NOT NULL "
+                "UNION ALL SELECT blob_refs FROM snapshots WHERE blob_refs IS NOT NULL"
+            )
+            for digest in blob_refs.split()
+        }
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_blobs (hash TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM live_blobs")
+        conn.executemany("INSERT INTO live_blobs (hash) VALUES (?)", ((digest,) for digest in live_blobs))
+        return conn.execute("DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM live_blobs)").rowcount
+
+    # Row conversion helpers
+    @staticmethod
+    def _agent_update_params(session_id: str, session_agent: SessionAgent) -> tuple[Any, ...]:
+        """Build the UPDATE_AGENT_SQL parameters for an agent."""
+        return (
+            json.dumps(session_agent.state),
+            json.dumps(session_agent.conversation_manager_state),
+            datetime.now(UTC).isoformat(),
+            session_id,
+            session_agent.agent_id,
+        )
+
+    def _encode_message(self, message: Message | None, blobs: dict[str, bytes]) -> str | bytes | None:
+        """Encode a message with the configured codec, moving large bytes values into ``blobs``."""
+        if message is None:
+            return None
+        return dumps(extract_blobs(dict(message), blobs, self.blob_min_size), self.codec)
+
+    def _message_insert_params(
+        self,
+        session_id: str,
+        agent_id: str,
+        session_message: SessionMessage,
+        blobs: dict[str, bytes],
+    ) -> tuple[Any, ...]:
+        """Build the INSERT_MESSAGE_SQL parameters for a message, collecting its blobs into ``blobs``."""
+        message_blobs: dict[str, bytes] = {}
+        message = self._encode_message(session_message.message, message_blobs)
+        redact_message = self._encode_message(session_message.redact_message, message_blobs)
+        blobs.update(message_blobs)
+        return (
+            session_id,
+            agent_id,
+            session_message.message_id,
+            message,
+            redact_message,
+            " ".join(message_blobs) or None,
+            session_message.created_at or datetime.now(UTC).isoformat(),
+            session_message.updated_at or datetime.now(UTC).isoformat(),
+        )
+
+    def _message_update_params(
+        self,
+        session_id: str,
+        agent_id: str,
+        session_message: SessionMessage,
+        blobs: dict[str, bytes],
+    ) -> tuple[Any, ...]:
+        """Build the UPDATE_MESSAGE_SQL parameters for a message, collecting its blobs into ``blobs``."""
+        message_blobs: dict[str, bytes] = {}
+        message = self._encode_message(session_message.message, message_blobs)
+        redact_message = self._encode_message(session_message.redact_message, message_blobs)
+        blobs.update(message_blobs)
+        return (
+            message,
+            redact_message,
+            " ".join(message_blobs) or None,
+            datetime.now(UTC).isoformat(),
+            session_id,
+            agent_id,
+            session_message.message_id,
+        )
+
+    @staticmethod
+    def _fetch_blobs(conn: sqlite3.Connection, rows: list[tuple[Any, ...]]) -> dict[str, bytes]:
+        """Fetch the blobs referenced by message rows with as few queries as possible."""
+        digests = list({digest for row in rows if row[5] for digest in row[5].split()})
+        blobs: dict[str, bytes] = {}
+        for start in range(0, len(digests), BLOB_QUERY_BATCH_SIZE):
+            batch = digests[start : start + BLOB_QUERY_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            blobs.update(conn.execute(f"SELECT hash, data FROM blobs WHERE hash IN ({placeholders})", batch))  # noqa: S608
+        return blobs
+
+    @staticmethod
+    def _row_to_message(row: tuple[Any, ...], blobs: dict[str, bytes]) -> SessionMessage:
+        """Convert a (message_id, message, redact_message, created_at, updated_at, blob_refs) row."""
+        row_blobs = blobs if row[5] else None
+        return SessionMessage(
+            message_id=row[0],
+            message=Message(**_decode_message(row[1], row_blobs)),
+            redact_message=Message(**_decode_message(row[2], row_blobs)) if row[2] else None,
+            created_at=row[3],
+            updated_at=row[4],
+        )
+
+
+def _decode_message(value: str | bytes, blobs: dict[str, bytes] | None) -> dict[str, Any]:
+    """Decode a stored message, resolving blob references when the row has any."""
+    message = loads(value)
+    return resolve_blobs(message, blobs) if blobs is not None else message
 
 
 if __name__ == "__main__":
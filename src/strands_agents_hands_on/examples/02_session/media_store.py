@@ -0,0 +1,395 @@
+"""Keep image and document bytes out of agent history and sessions with a content-addressed media store.
+
+Usage:
+    # 画像付きのターンを繰り返し、会話履歴とセッションファイルのサイズをメディアストアの有無で比較
+    uv run python -m strands_agents_hands_on.examples.02_session.media_store
+
+    # ターン数、画像サイズ、リクエストに含める画像の最大数を変更
+    uv run python -m strands_agents_hands_on.examples.02_session.media_store --turns 50 --image-kb 500 --max-media 2
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import AsyncGenerator, AsyncIterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel
+from strands import Agent
+from strands.hooks import AgentInitializedEvent, HookProvider, HookRegistry, MessageAddedEvent
+from strands.models.model import Model
+from strands.session.file_session_manager import FileSessionManager
+from strands.session.session_manager import SessionManager
+from strands.types.content import Message, Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolSpec
+
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+T = TypeVar("T", bound=BaseModel)
+
+# Content blocks whose ``source.bytes`` is moved to the store
+MEDIA_BLOCK_TYPES = ("image", "document", "video")
+# Key of the reference replacing the bytes. It differs from message_codec's blob reference,
+# which the SQLite session repositories resolve against their own blob table
+MEDIA_REF_KEY = "__media_ref__"
+
+
+@dataclass
+class MediaStoreStats:
+    """Counters of a MediaStore.
+
+    Attributes:
+        stored: Media written to the store
+        deduplicated: Media already in the store when added
+        bytes_stored: Bytes written to the store
+        reads: Media read back to build model requests
+        bytes_read: Bytes read back
+
+    """
+
+    stored: int = 0
+    deduplicated: int = 0
+    bytes_stored: int = 0
+    reads: int = 0
+    bytes_read: int = 0
+
+
+class MediaStore:
+    """Content-addressed store of media bytes on the local filesystem.
+
+    Each distinct payload is written once, as ``<root>/<first 2 hex digits>/<sha256>``,
+    so the same image sent in many turns or sessions takes the space of one.
+    """
+
+    def __init__(self, root: str = "data/media") -> None:
+        """Initialize the store, creating its directory if needed.
+
+        Args:
+            root: Directory holding the media files
+
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.stats = MediaStoreStats()
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        """Return whether the store holds the digest."""
+        return self._path(digest).exists()
+
+    def put(self, data: bytes) -> str:
+        """Store the bytes if they are new and return their SHA-256 digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            with self._lock:
+                self.stats.deduplicated += 1
+            return digest
+
+        path.parent.mkdir(exist_ok=True)
+        # Write to a temporary file first, so readers never see a partial payload
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        Path(tmp_path).replace(path)
+        with self._lock:
+            self.stats.stored += 1
+            self.stats.bytes_stored += len(data)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the bytes of a digest.
+
+        Raises:
+            KeyError: If the store does not hold the digest
+
+        """
+        try:
+            data = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            msg = f"Media {digest} not found in {self.root}"
+            raise KeyError(msg) from None
+        with self._lock:
+            self.stats.reads += 1
+            self.stats.bytes_read += len(data)
+        return data
+
+
+def _media_sources(content: list[Any]) -> list[tuple[dict[str, Any], str]]:
+    """Return the media blocks of a content list (including tool results) with their block type, in order."""
+    found: list[tuple[dict[str, Any], str]] = []
+    for block in content:
+        found.extend((block, block_type) for block_type in MEDIA_BLOCK_TYPES if block_type in block)
+        if "toolResult" in block:
+            found.extend(_media_sources(block["toolResult"].get("content", [])))
+    return found
+
+
+def media_ref(block: dict[str, Any], block_type: str) -> str | None:
+    """Return the digest a media block refers to, or None if it carries inline bytes."""
+    data = block[block_type].get("source", {}).get("bytes")
+    return data[MEDIA_REF_KEY] if isinstance(data, dict) and MEDIA_REF_KEY in data else None
+
+
+class MediaHistory(HookProvider):
+    """Replace inline media bytes in the agent's messages with references to a MediaStore.
+
+    Every message added to the conversation has the ``source.bytes`` of its image,
+    document and video blocks (also inside tool results) moved to the store and
+    replaced with ``{"__media_ref__": digest}``. Messages restored from older
+    sessions are rewritten when the agent starts.
+
+    Session managers register their hooks before the agent's ``hooks``, so they
+    persist each message before this provider rewrites it. To store references in
+    sessions too, wrap the session manager in MediaSessionManager instead.
+
+    Models cannot read references: wrap the agent's model in MediaResolvingModel.
+    """
+
+    def __init__(self, store: MediaStore, min_size: int = 1024) -> None:
+        """Initialize the hook provider.
+
+        Args:
+            store: Store receiving the media bytes
+            min_size: Smallest payload moved to the store (smaller ones stay inline)
+
+        """
+        self.store = store
+        self.min_size = min_size
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(MessageAddedEvent, self._on_message_added)
+        registry.add_callback(AgentInitializedEvent, self._on_agent_initialized)
+
+    def _on_message_added(self, event: MessageAddedEvent) -> None:
+        self.reference(event.message["content"])
+
+    def _on_agent_initialized(self, event: AgentInitializedEvent) -> None:
+        for message in event.agent.messages:
+            self.reference(message["content"])
+
+    def reference(self, content: list[Any]) -> int:
+        """Move inline media bytes of a content list to the store in place and return the number moved."""
+        moved = 0
+        for block, block_type in _media_sources(content):
+            source = block[block_type].get("source", {})
+            data = source.get("bytes")
+            if isinstance(data, bytes | bytearray) and len(data) >= self.min_size:
+                source["bytes"] = {MEDIA_REF_KEY: self.store.put(bytes(data))}
+                moved += 1
+        return moved
+
+
+class MediaSessionManager(SessionManager):
+    """Session manager wrapper moving media bytes to a MediaStore before the wrapped manager persists them.
+
+    Each message is rewritten in place, so the agent's history holds the same
+    references as the session.
+    """
+
+    def __init__(self, session_manager: SessionManager, history: MediaHistory) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            session_manager: Session manager persisting the rewritten messages
+            history: MediaHistory moving the bytes to its store
+
+        """
+        self.session_manager = session_manager
+        self.history = history
+
+    def initialize(self, agent: Agent, **kwargs: Any) -> None:
+        self.session_manager.initialize(agent, **kwargs)
+        # Sessions written without the store still hold inline bytes
+        for message in agent.messages:
+            self.history.reference(message["content"])
+
+    def append_message(self, message: Message, agent: Agent, **kwargs: Any) -> None:
+        self.history.reference(message["content"])
+        self.session_manager.append_message(message, agent, **kwargs)
+
+    def redact_latest_message(self, redact_message: Message, agent: Agent, **kwargs: Any) -> None:
+        self.history.reference(redact_message["content"])
+        self.session_manager.redact_latest_message(redact_message, agent, **kwargs)
+
+    def sync_agent(self, agent: Agent, **kwargs: Any) -> None:
+        self.session_manager.sync_agent(agent, **kwargs)
+
+
+class MediaResolvingModel(Model):
+    """Model wrapper putting the bytes of media references back into each request.
+
+    The bytes are read from the store while the request is built and are not kept
+    afterwards, so the agent's memory holds only the references. With ``max_media``,
+    only the most recent media blocks are sent and older ones are replaced with a
+    short text placeholder, dropping them from the model's context entirely.
+    """
+
+    def __init__(self, model: Model, store: MediaStore, max_media: int | None = None) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            model: Model to send the requests to
+            store: Store holding the referenced bytes
+            max_media: Maximum number of media blocks per request, keeping the most recent (None for all)
+
+        """
+        self.model = model
+        self.store = store
+        self.max_media = max_media
+
+    @property
+    def config(self) -> Any:
+        """Config of the wrapped model."""
+        return self.model.get_config()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.model.update_config(**model_config)
+
+    def get_config(self) -> Any:
+        return self.model.get_config()
+
+    def resolve(self, messages: Messages) -> Messages:
+        """Return a copy of the messages with references replaced by their bytes."""
+        resolved = [{**message, "content": _copy_content(message["content"])} for message in messages]
+        media = [found for message in resolved for found in _media_sources(message["content"])]
+        keep_from = len(media) - self.max_media if self.max_media is not None else 0
+        for index, (block, block_type) in enumerate(media):
+            digest = media_ref(block, block_type)
+            if index < keep_from:
+                label = f"sha256:{digest[:12]}" if digest else "inline"
+                block.clear()
+                block["text"] = f"[{block_type} omitted from context ({label})]"
+            elif digest is not None:
+                block[block_type]["source"]["bytes"] = self.store.get(digest)
+        return cast("Messages", resolved)
+
+    def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        return self.model.stream(self.resolve(messages), tool_specs, system_prompt, **kwargs)
+
+    def structured_output(
+        self,
+        output_model: type[T],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, T | Any], None]:
+        return self.model.structured_output(output_model, self.resolve(prompt), system_prompt, **kwargs)
+
+
+def _copy_content(content: list[Any]) -> list[Any]:
+    """Copy the content blocks that contain media, down to their source, and share everything else."""
+    copied: list[Any] = []
+    for block in content:
+        if "toolResult" in block:
+            tool_result = block["toolResult"]
+            block = {**block, "toolResult": {**tool_result, "content": _copy_content(tool_result.get("content", []))}}  # noqa: PLW2901
+        for block_type in MEDIA_BLOCK_TYPES:
+            if block_type in block:
+                media = block[block_type]
+                source = {**media.get("source", {})}
+                block = {**block, block_type: {**media, "source": source}}  # noqa: PLW2901
+        copied.append(block)
+    return copied
+
+
+class RecordingStubModel(StubModel):
+    """StubModel recording the media bytes each request carries."""
+
+    def __init__(self) -> None:
+        super().__init__(default_text="画像を確認しました")
+        self.request_media_bytes: list[int] = []
+
+    def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        sizes = [
+            len(data)
+            for message in messages
+            for block, block_type in _media_sources(message["content"])
+            if isinstance(data := block[block_type]["source"].get("bytes"), bytes)
+        ]
+        self.request_media_bytes.append(sum(sizes))
+        return super().stream(messages, tool_specs, system_prompt, **kwargs)
+
+
+def _history_bytes(agent: Agent) -> int:
+    return sum(
+        len(data)
+        for message in agent.messages
+        for block, block_type in _media_sources(message["content"])
+        if isinstance(data := block[block_type]["source"].get("bytes"), bytes)
+    )
+
+
+def _dir_size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def _run(args: argparse.Namespace, workdir: Path, *, use_store: bool) -> tuple[int, int, int, int]:
+    """Run the scripted conversation and return history, session and store sizes and the last request's media bytes."""
+    model = RecordingStubModel()
+    sessions = workdir / ("with_store" if use_store else "without_store")
+    session_manager = FileSessionManager(session_id="media-demo", storage_dir=str(sessions))
+    store = MediaStore(str(workdir / "media"))
+    if use_store:
+        agent = Agent(
+            model=MediaResolvingModel(model, store, max_media=args.max_media),
+            session_manager=MediaSessionManager(session_manager, MediaHistory(store)),
+            callback_handler=None,
+        )
+    else:
+        agent = Agent(model=model, session_manager=session_manager, callback_handler=None)
+
+    for turn in range(args.turns):
+        # 8種類の画像を順番に送る (2周目以降はストアで重複排除される)
+        image = (turn % 8).to_bytes(4, "big") * (args.image_kb * 256)
+        agent([{"text": f"{turn + 1}枚目の画像です"}, {"image": {"format": "png", "source": {"bytes": image}}}])
+
+    store_size = _dir_size(workdir / "media") if use_store else 0
+    return _history_bytes(agent), _dir_size(sessions), store_size, model.request_media_bytes[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--image-kb", type=int, default=200)
+    parser.add_argument("--max-media", type=int, default=4, help="media blocks sent per request (most recent first)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="media_store_"))
+    try:
+        print(f"{args.turns} turns, {args.image_kb}KB image per turn, max_media={args.max_media}")
+        print(f"{'':>14} | {'history':>10} | {'session':>10} | {'media store':>11} | {'last request':>12}")
+        print("-" * 70)
+        for label, use_store in (("inline bytes", False), ("MediaStore", True)):
+            history, session, store, request = _run(args, workdir, use_store=use_store)
+            print(
+                f"{label:>14} | {history / 1e6:>8.2f}MB | {session / 1e6:>8.2f}MB | "
+                f"{store / 1e6:>9.2f}MB | {request / 1e6:>10.2f}MB"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Pluggable encodings for messages persisted by the SQLite session repositories.
+
+Stored payloads are self-describing, so a database can hold rows written with
+different codecs and switching codecs never breaks existing sessions:
+
+- ``str`` values are JSON (the original TEXT format)
+- ``bytes`` values start with a one-byte tag identifying the codec that wrote them
+
+Large ``bytes`` values (image and document sources) can be moved out of the
+message into a content-addressed blob table with ``extract_blobs`` and put back
+with ``resolve_blobs``.
+"""
+
+import hashlib
+import json
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, ClassVar
+
+from strands.types.session import decode_bytes_values, encode_bytes_values
+
+BLOB_REF_KEY = "__blob_ref__"
+
+
+class MessageCodec(ABC):
+    """Encoder/decoder for message payloads."""
+
+    tag: ClassVar[bytes]
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """Encode an object to bytes (without the codec tag)."""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode bytes produced by ``encode``."""
+
+
+class JSONCodec(MessageCodec):
+    """JSON encoding; bytes values are base64-encoded the same way Strands' own session managers do."""
+
+    tag = b"j"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(encode_bytes_values(obj), ensure_ascii=False, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return decode_bytes_values(json.loads(data))
+
+
+class CompactBinaryCodec(MessageCodec):
+    """Compact binary encoding using the MessagePack wire format.
+
+    Only the types that appear in messages are supported (None, bool, int, float,
+    str, bytes, list/tuple and dict). Bytes are stored raw instead of base64, which
+    keeps image and document payloads a third smaller than JSON.
+    """
+
+    tag = b"m"
+
+    def encode(self, obj: Any) -> bytes:
+        parts: list[bytes] = []
+        _pack(obj, parts)
+        return b"".join(parts)
+
+    def decode(self, data: bytes) -> Any:
+        obj, _ = _unpack(memoryview(data), 0)
+        return obj
+
+
+class ZlibCodec(MessageCodec):
+    """Wrap another codec and compress its output with zlib."""
+
+    tag = b"z"
+
+    def __init__(self, inner: MessageCodec | None = None, level: int = 6) -> None:
+        """Initialize the compressing codec.
+
+        Args:
+            inner: Codec whose output is compressed (defaults to CompactBinaryCodec)
+            level: zlib compression level (1-9)
+
+        """
+        self.inner = inner or CompactBinaryCodec()
+        self.level = level
+
+    def encode(self, obj: Any) -> bytes:
+        return zlib.compress(self.inner.tag + self.inner.encode(obj), self.level)
+
+    def decode(self, data: bytes) -> Any:
+        return loads(zlib.decompress(data))
+
+
+# Codecs used to decode stored payloads, keyed by tag
+DECODERS: dict[bytes, MessageCodec] = {codec.tag: codec for codec in (JSONCodec(), CompactBinaryCodec(), ZlibCodec())}
+
+
+def dumps(obj: Any, codec: MessageCodec | None = None) -> str | bytes:
+    """Encode an object for storage.
+
+    ``None`` and ``JSONCodec`` produce JSON text, other codecs produce tagged bytes.
+    """
+    if codec is None or isinstance(codec, JSONCodec):
+        return json.dumps(encode_bytes_values(obj))
+    return codec.tag + codec.encode(obj)
+
+
+def loads(value: str | bytes) -> Any:
+    """Decode a value produced by ``dumps`` with any registered codec."""
+    if isinstance(value, str):
+        return decode_bytes_values(json.loads(value))
+    tag, data = bytes(value[:1]), value[1:]
+    decoder = DECODERS.get(tag)
+    if decoder is None:
+        msg = f"Unknown message codec tag: {tag!r}"
+        raise ValueError(msg)
+    return decoder.decode(data)
+
+
+# Content-addressed blobs
+def extract_blobs(obj: Any, blobs: dict[str, bytes], min_size: int) -> Any:
+    """Replace bytes values of at least ``min_size`` with references to their SHA-256 digest.
+
+    Args:
+        obj: Message (or part of one) to walk
+        blobs: Dictionary that receives the extracted ``{digest: bytes}``
+        min_size: Smallest bytes value moved to the blob table
+
+    Returns:
+        A copy of ``obj`` with large bytes values replaced by ``{"__blob_ref__": digest}``
+
+    """
+    if isinstance(obj, bytes | bytearray) and len(obj) >= min_size:
+        digest = hashlib.sha256(obj).hexdigest()
+        blobs[digest] = bytes(obj)
+        return {BLOB_REF_KEY: digest}
+    if isinstance(obj, dict):
+        return {key: extract_blobs(value, blobs, min_size) for key, value in obj.items()}
+    if isinstance(obj, list | tuple):
+        return [extract_blobs(item, blobs, min_size) for item in obj]
+    return obj
+
+
+def resolve_blobs(obj: Any, blobs: Mapping[str, bytes]) -> Any:
+    """Replace blob references created by ``extract_blobs`` with their bytes."""
+    if isinstance(obj, dict):
+        if len(obj) == 1 and BLOB_REF_KEY in obj:
+            return blobs[obj[BLOB_REF_KEY]]
+        return {key: resolve_blobs(value, blobs) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [resolve_blobs(item, blobs) for item in obj]
+    return obj
+
+
+# MessagePack subset
+_FIXMAP_MAX = 16
+_FIXARRAY_MAX = 16
+_FIXSTR_MAX = 32
+_POSITIVE_FIXINT_MAX = 128
+_NEGATIVE_FIXINT_MIN = -32
+_UINT8_MAX = 1 << 8
+_UINT16_MAX = 1 << 16
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = 1 << 63
+_UINT64_MAX = 1 << 64
+# Tag prefixes of the "fix" formats that carry their size in the tag byte
+_FIXMAP_PREFIX = 0b1000
+_FIXARRAY_PREFIX = 0b1001
+_FIXSTR_PREFIX = 0b101
+_NEGATIVE_FIXINT_TAG = 0xE0
+
+
+def _pack_length(size: int, parts: list[bytes], tags: tuple[int, int, int]) -> None:
+    """Append an 8/16/32-bit length header using the given type tags."""
+    if size < _UINT8_MAX:
+        parts.append(struct.pack(">BB", tags[0], size))
+    elif size < _UINT16_MAX:
+        parts.append(struct.pack(">BH", tags[1], size))
+    else:
+        parts.append(struct.pack(">BI", tags[2], size))
+
+
+def _pack(obj: Any, parts: list[bytes]) -> None:  # noqa: C901, PLR0912
+    if obj is None:
+        parts.append(b"\xc0")
+    elif obj is True:
+        parts.append(b"\xc3")
+    elif obj is False:
+        parts.append(b"\xc2")
+    elif isinstance(obj, int):
+        if 0 <= obj < _POSITIVE_FIXINT_MAX:
+            parts.append(struct.pack(">B", obj))
+        elif _NEGATIVE_FIXINT_MIN <= obj < 0:
+            parts.append(struct.pack(">b", obj))
+        elif _INT64_MIN <= obj < _INT64_MAX:
+            parts.append(struct.pack(">Bq", 0xD3, obj))
+        elif 0 <= obj < _UINT64_MAX:
+            parts.append(struct.pack(">BQ", 0xCF, obj))
+        else:
+            msg = f"Integer out of range: {obj}"
+            raise OverflowError(msg)
+    elif isinstance(obj, float):
+        parts.append(struct.pack(">Bd", 0xCB, obj))
+    elif isinstance(obj, str):
+        data = obj.encode()
+        if len(data) < _FIXSTR_MAX:
+            parts.append(struct.pack(">B", 0xA0 | len(data)))
+        else:
+            _pack_length(len(data), parts, (0xD9, 0xDA, 0xDB))
+        parts.append(data)
+    elif isinstance(obj, bytes | bytearray | memoryview):
+        _pack_length(len(obj), parts, (0xC4, 0xC5, 0xC6))
+        parts.append(bytes(obj))
+    elif isinstance(obj, list | tuple):
+        if len(obj) < _FIXARRAY_MAX:
+            parts.append(struct.pack(">B", 0x90 | len(obj)))
+        else:
+            parts.append(struct.pack(">BI", 0xDD, len(obj)))
+        for item in obj:
+            _pack(item, parts)
+    elif isinstance(obj, dict):
+        if len(obj) < _FIXMAP_MAX:
+            parts.append(struct.pack(">B", 0x80 | len(obj)))
+        else:
+            parts.append(struct.pack(">BI", 0xDF, len(obj)))
+        for key, value in obj.items():
+            _pack(key, parts)
+            _pack(value, parts)
+    else:
+        msg = f"Object of type {type(obj).__name__} is not supported by CompactBinaryCodec"
+        raise TypeError(msg)
+
+
+# Fixed-size formats: tag -> (struct format, size)
+_FIXED_FORMATS: dict[int, tuple[str, int]] = {
+    0xCA: (">f", 4),
+    0xCB: (">d", 8),
+    0xCC: (">B", 1),
+    0xCD: (">H", 2),
+    0xCE: (">I", 4),
+    0xCF: (">Q", 8),
+    0xD0: (">b", 1),
+    0xD1: (">h", 2),
+    0xD2: (">i", 4),
+    0xD3: (">q", 8),
+}
+# Variable-size formats: tag -> (kind, length format, length size)
+_SIZED_FORMATS: dict[int, tuple[str, str, int]] = {
+    0xC4: ("bin", ">B", 1),
+    0xC5: ("bin", ">H", 2),
+    0xC6: ("bin", ">I", 4),
+    0xD9: ("str", ">B", 1),
+    0xDA: ("str", ">H", 2),
+    0xDB: ("str", ">I", 4),
+    0xDC: ("array", ">H", 2),
+    0xDD: ("array", ">I", 4),
+    0xDE: ("map", ">H", 2),
+    0xDF: ("map", ">I", 4),
+}
+_CONSTANTS: dict[int, Any] = {0xC0: None, 0xC2: False, 0xC3: True}
+
+
+def _unpack_container(data: memoryview, offset: int, kind: str, size: int) -> tuple[Any, int]:
+    if kind == "array":
+        items = []
+        for _ in range(size):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    mapping = {}
+    for _ in range(size):
+        key, offset = _unpack(data, offset)
+        mapping[key], offset = _unpack(data, offset)
+    return mapping, offset
+
+
+def _unpack(data: memoryview, offset: int) -> tuple[Any, int]:  # noqa: PLR0911
+    tag = data[offset]
+    offset += 1
+    if tag < _POSITIVE_FIXINT_MAX:
+        return tag, offset
+    if tag >= _NEGATIVE_FIXINT_TAG:
+        return tag - _UINT8_MAX, offset
+    if tag >> 4 == _FIXMAP_PREFIX:
+        return _unpack_container(data, offset, "map", tag & 0x0F)
+    if tag >> 4 == _FIXARRAY_PREFIX:
+        return _unpack_container(data, offset, "array", tag & 0x0F)
+    if tag >> 5 == _FIXSTR_PREFIX:
+        end = offset + (tag & 0x1F)
+        return str(data[offset:end], "utf-8"), end
+    if tag in _CONSTANTS:
+        return _CONSTANTS[tag], offset
+    if tag in _FIXED_FORMATS:
+        fmt, size = _FIXED_FORMATS[tag]
+        return struct.unpack_from(fmt, data, offset)[0], offset + size
+    if tag in _SIZED_FORMATS:
+        kind, fmt, size = _SIZED_FORMATS[tag]
+        length = struct.unpack_from(fmt, data, offset)[0]
+        offset += size
+        if kind in {"array", "map"}:
+            return _unpack_container(data, offset, kind, length)
+        end = offset + length
+        value = data[offset:end]
+        return (str(value, "utf-8") if kind == "str" else bytes(value)), end
+    msg = f"Unsupported MessagePack type tag: {tag:#x}"
+    raise ValueError(msg)
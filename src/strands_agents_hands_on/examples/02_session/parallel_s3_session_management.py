@@ -0,0 +1,348 @@
+"""Usage example for parallel S3 session I/O with a local read-through cache.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.parallel_s3_session_management user-123
+
+    # 2回目の実行: メッセージを並列に取得してセッションを復元
+    uv run python -m strands_agents_hands_on.examples.02_session.parallel_s3_session_management user-123 second
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, cast
+
+import boto3
+from botocore.config import Config as BotocoreConfig
+from botocore.exceptions import ClientError
+from strands import Agent
+from strands.session.s3_session_manager import MESSAGE_PREFIX, S3SessionManager
+from strands.types.exceptions import SessionException
+from strands.types.session import SessionMessage
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment_"
+# S3 DeleteObjects accepts at most this many keys per request
+DELETE_BATCH_SIZE = 1000
+
+
+class ParallelS3SessionManager(S3SessionManager):
+    """S3SessionManager that restores sessions with concurrent requests.
+
+    The key layout is the same as ``S3SessionManager``, plus optional segment objects:
+
+    - ``list_messages`` lists the message objects and fetches them through a bounded
+      thread pool instead of one GET after another.
+    - With ``cache_dir``, every object read or written is kept on local disk with its
+      ETag. Objects whose ETag in the listing matches the cache are not downloaded at
+      all, and single reads are revalidated with ``If-None-Match``.
+    - ``pack_segments`` packs ``segment_size`` consecutive messages into one
+      ``segment_<first>_<last>.json`` object, so long sessions need far fewer GETs.
+      Individual message objects written later (for example by a redaction) take
+      precedence over the segment. Plain ``S3SessionManager`` does not read segments.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        session_id: str,
+        bucket: str,
+        prefix: str = "",
+        boto_session: boto3.Session | None = None,
+        boto_client_config: BotocoreConfig | None = None,
+        region_name: str | None = None,
+        max_workers: int = 16,
+        cache_dir: str | None = None,
+        segment_size: int = 100,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the parallel S3 session manager.
+
+        Args:
+            session_id: ID for the session
+            bucket: S3 bucket name
+            prefix: S3 key prefix for storage organization
+            boto_session: Optional boto3 session
+            boto_client_config: Optional boto3 client configuration
+            region_name: AWS region for S3 storage
+            max_workers: Maximum number of concurrent S3 requests
+            cache_dir: Directory of the local read-through cache (None to disable it)
+            segment_size: Number of messages packed into one segment by ``pack_segments``
+            **kwargs: Additional keyword arguments forwarded to S3SessionManager
+
+        """
+        # Set before super().__init__(), which already reads the session through this class
+        self.max_workers = max_workers
+        self.segment_size = segment_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-session")
+
+        # Let every worker thread keep its own HTTP connection
+        pool_config = BotocoreConfig(max_pool_connections=max_workers)
+        client_config = boto_client_config.merge(pool_config) if boto_client_config else pool_config
+        super().__init__(
+            session_id=session_id,
+            bucket=bucket,
+            prefix=prefix,
+            boto_session=boto_session,
+            boto_client_config=client_config,
+            region_name=region_name,
+            **kwargs,
+        )
+
+    # S3 object I/O
+    def _read_s3_object(self, key: str) -> dict[str, Any] | None:
+        """Read a JSON object, revalidating the cached copy with its ETag."""
+        cached = self._cache_get(key)
+        try:
+            if cached:
+                response = self.client.get_object(Bucket=self.bucket, Key=key, IfNoneMatch=cached[0])
+            else:
+                response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if cached and code in {"304", "NotModified"}:
+                return cached[1]
+            if code == "NoSuchKey":
+                return None
+            msg = f"S3 error reading {key}: {e}"
+            raise SessionException(msg) from e
+
+        try:
+            data = cast("dict[str, Any]", json.loads(response["Body"].read().decode("utf-8")))
+        except json.JSONDecodeError as e:
+            msg = f"Invalid JSON in S3 object {key}: {e}"
+            raise SessionException(msg) from e
+        self._cache_put(key, response["ETag"], data)
+        return data
+
+    def _read_listed_object(self, key: str, etag: str) -> dict[str, Any] | None:
+        """Read an object whose ETag is known from a listing, skipping the GET on a cache hit."""
+        cached = self._cache_get(key)
+        if cached and cached[0] == etag:
+            return cached[1]
+        return self._read_s3_object(key)
+
+    def _write_s3_object(self, key: str, data: dict[str, Any]) -> None:
+        """Write a JSON object and keep it in the cache."""
+        try:
+            content = json.dumps(data, indent=2, ensure_ascii=False)
+            response = self.client.put_object(
+                Bucket=self.bucket, Key=key, Body=content.encode("utf-8"), ContentType="application/json"
+            )
+        except ClientError as e:
+            msg = f"Failed to write S3 object {key}: {e}"
+            raise SessionException(msg) from e
+        self._cache_put(key, response["ETag"], data)
+
+    def _list_message_objects(
+        self, session_id: str, agent_id: str
+    ) -> tuple[dict[int, tuple[str, str]], list[tuple[int, int, str, str]]]:
+        """List message objects as ``{message_id: (key, etag)}`` and segments as ``(first, last, key, etag)``."""
+        messages_prefix = f"{self._get_agent_path(session_id, agent_id)}messages/"
+        messages: dict[int, tuple[str, str]] = {}
+        segments: list[tuple[int, int, str, str]] = []
+        try:
+            for page in self.client.get_paginator("list_objects_v2").paginate(
+                Bucket=self.bucket, Prefix=messages_prefix
+            ):
+                for obj in page.get("Contents", []):
+                    key, etag = obj["Key"], obj["ETag"]
+                    filename = key.rsplit("/", 1)[-1]
+                    if not filename.endswith(".json"):
+                        continue
+                    if filename.startswith(MESSAGE_PREFIX):
+                        messages[int(filename[len(MESSAGE_PREFIX) : -5])] = (key, etag)
+                    elif filename.startswith(SEGMENT_PREFIX):
+                        first, last = filename[len(SEGMENT_PREFIX) : -5].split("_")
+                        segments.append((int(first), int(last), key, etag))
+        except ClientError as e:
+            msg = f"S3 error listing messages: {e}"
+            raise SessionException(msg) from e
+        return messages, segments
+
+    # Message methods
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs: Any) -> SessionMessage | None:
+        """Read a message, looking it up in its segment if it has no object of its own."""
+        message = super().read_message(session_id, agent_id, message_id, **kwargs)
+        if message is not None:
+            return message
+
+        _, segments = self._list_message_objects(session_id, agent_id)
+        for first, last, key, etag in segments:
+            if first <= message_id <= last:
+                segment = self._read_listed_object(key, etag) or {"messages": []}
+                for message_data in segment["messages"]:
+                    if message_data["message_id"] == message_id:
+                        return SessionMessage.from_dict(message_data)
+        return None
+
+    def list_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        **kwargs: Any,
+    ) -> list[SessionMessage]:
+        """List messages for an agent, fetching message and segment objects concurrently."""
+        objects, segments = self._list_message_objects(session_id, agent_id)
+        message_ids = sorted(set(objects).union(*(range(first, last + 1) for first, last, _, _ in segments)))
+        selected = message_ids[offset : offset + limit if limit is not None else None]
+        if not selected:
+            return []
+
+        # Segments are only needed for selected messages without an object of their own
+        missing = {message_id for message_id in selected if message_id not in objects}
+        needed = [
+            (key, etag)
+            for first, last, key, etag in segments
+            if any(first <= message_id <= last for message_id in missing)
+        ]
+        needed_objects = [objects[message_id] for message_id in selected if message_id in objects]
+        results = list(self._executor.map(lambda item: self._read_listed_object(*item), needed + needed_objects))
+
+        messages_by_id: dict[int, dict[str, Any]] = {}
+        for segment in results[: len(needed)]:
+            for message_data in (segment or {"messages": []})["messages"]:
+                messages_by_id[message_data["message_id"]] = message_data
+        for message_data in results[len(needed) :]:
+            if message_data:
+                messages_by_id[message_data["message_id"]] = message_data
+
+        return [SessionMessage.from_dict(messages_by_id[i]) for i in selected if i in messages_by_id]
+
+    def pack_segments(self, session_id: str, agent_id: str) -> int:
+        """Pack complete runs of ``segment_size`` message objects into segment objects.
+
+        Only blocks aligned to ``segment_size`` that are stored entirely as individual
+        objects, and that do not contain the latest message (which may still be
+        redacted), are packed. The individual objects are deleted once the segment is
+        written.
+
+        Returns:
+            Number of messages packed
+
+        """
+        objects, segments = self._list_message_objects(session_id, agent_id)
+        if not objects:
+            return 0
+        packed_blocks = {first for first, _, _, _ in segments}
+        latest = max(objects)
+
+        packed = 0
+        for first in range(0, latest - self.segment_size + 1, self.segment_size):
+            last = first + self.segment_size - 1
+            block = range(first, last + 1)
+            if first in packed_blocks or last >= latest or any(i not in objects for i in block):
+                continue
+
+            messages = list(self._executor.map(lambda i: self._read_listed_object(*objects[i]), block))
+            segment_key = f"{self._get_agent_path(session_id, agent_id)}messages/{SEGMENT_PREFIX}{first}_{last}.json"
+            self._write_s3_object(segment_key, {"messages": messages})
+            self._delete_s3_objects([objects[i][0] for i in block])
+            packed += len(block)
+        return packed
+
+    def _delete_s3_objects(self, keys: list[str]) -> None:
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            try:
+                self.client.delete_objects(
+                    Bucket=self.bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                )
+            except ClientError as e:
+                msg = f"Failed to delete S3 objects: {e}"
+                raise SessionException(msg) from e
+            for key in batch:
+                self._cache_delete(key)
+
+    # Local read-through cache
+    def _cache_path(self, key: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{hashlib.sha256(f'{self.bucket}/{key}'.encode()).hexdigest()}.json"
+
+    def _cache_get(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        """Return the cached ``(etag, data)`` of an object."""
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            logger.warning("key=<%s> | ignoring unreadable cache entry", key)
+            return None
+        return entry["etag"], entry["data"]
+
+    def _cache_put(self, key: str, etag: str, data: dict[str, Any]) -> None:
+        path = self._cache_path(key)
+        if path is None:
+            return
+        # Write to a temporary file first, so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps({"etag": etag, "data": data}, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _cache_delete(self, key: str) -> None:
+        path = self._cache_path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Shut down the request thread pool."""
+        self._executor.shutdown()
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "parallel_s3_session_management <session_id> [second]"
+        )
+        sys.exit(1)
+
+    session_id = sys.argv[1]
+
+    boto_session = boto3.Session(region_name="us-east-1")
+
+    session_manager = ParallelS3SessionManager(
+        session_id=session_id,
+        bucket="strands-agents-hands-on",
+        prefix="sessions",
+        boto_session=boto_session,
+        region_name="us-east-1",
+        max_workers=16,
+        cache_dir="data/s3_cache",
+    )
+
+    agent = Agent(session_manager=session_manager)
+
+    if len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second":
+        print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+        response = agent("さっき私が教えた数字は何でしたか?")
+    else:
+        print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+        response = agent("私の好きな数字は42です。覚えておいてください。")
+        print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+        print(
+            "uv run python -m strands_agents_hands_on.examples.02_session."
+            f"parallel_s3_session_management {session_id} second"
+        )
+
+    # 古いメッセージをセグメントにまとめて、次回の復元で取得するオブジェクト数を減らす
+    packed = session_manager.pack_segments(session_id, agent.agent_id)
+    print(f"\nセグメントにまとめたメッセージ数: {packed}")
+    session_manager.close()
@@ -0,0 +1,352 @@
+"""Usage example for sharding sessions over several SQLite database files.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.sharded_session_management user-123
+
+    # 2回目の実行: セッションが保存されているか確認
+    uv run python -m strands_agents_hands_on.examples.02_session.sharded_session_management user-123 second
+
+    # 全シャードのセッションを一覧表示 (管理用)
+    uv run python -m strands_agents_hands_on.examples.02_session.sharded_session_management list
+
+    # シャード数を変更してセッションを再配置 (オフライン実行)
+    uv run python -m strands_agents_hands_on.examples.02_session.sharded_session_management rebalance 8
+
+    # 既存の単一DB (data/sessions.db) のセッションをシャードへ取り込む (オフライン実行、元のDBは変更しない)
+    uv run python -m strands_agents_hands_on.examples.02_session.sharded_session_management migrate data/sessions.db
+"""
+
+import hashlib
+import heapq
+import sqlite3
+import sys
+from collections import defaultdict
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Self
+
+from strands import Agent
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+from .custom_session_management import SQLiteSessionRepository
+from .write_behind_session_management import WriteBehindSQLiteSessionRepository
+
+# Tables holding per-session rows, in foreign key order
+SESSION_TABLES = ("sessions", "agents", "messages", "snapshots")
+
+
+def shard_index(session_id: str, shard_count: int) -> int:
+    """Return the shard a session belongs to.
+
+    A cryptographic hash is used instead of ``hash()``, which is randomized per process.
+    """
+    digest = hashlib.blake2b(session_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest) % shard_count
+
+
+class ShardedSQLiteSessionRepository(SessionRepository):
+    """Session repository that spreads sessions over ``shard_count`` SQLite files.
+
+    Each session is stored in ``sessions-NNN.db`` chosen by hashing its session_id, and
+    each shard is a SQLiteSessionRepository with its own connection pool and writer
+    lock. Writers of different sessions therefore rarely contend on the same SQLite
+    write lock, and write throughput grows with the number of shards.
+
+    ``list_sessions`` lists sessions across all shards for administration,
+    ``rebalance`` changes the number of shards, moving only the sessions whose shard
+    changes, and ``import_database`` copies the sessions of an existing single-file
+    repository into the shards.
+    """
+
+    def __init__(
+        self,
+        shard_dir: str = "data/shards",
+        shard_count: int = 4,
+        repository_class: type[SQLiteSessionRepository] = SQLiteSessionRepository,
+        **repo_kwargs: Any,
+    ) -> None:
+        """Initialize the sharded repository.
+
+        Args:
+            shard_dir: Directory holding the shard database files
+            shard_count: Number of shards; must match the existing files, use ``rebalance`` to change it
+            repository_class: Repository of each shard, such as WriteBehindSQLiteSessionRepository
+            **repo_kwargs: Options forwarded to each shard's repository
+
+        """
+        self.shard_dir = Path(shard_dir)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        existing = len(list(self.shard_dir.glob("sessions-*.db")))
+        if existing and existing != shard_count:
+            msg = f"{shard_dir} has {existing} shards, not {shard_count}; use rebalance() to change the shard count"
+            raise ValueError(msg)
+
+        self._repository_class = repository_class
+        self._repo_kwargs = repo_kwargs
+        self.shards = [self._open_shard(index) for index in range(shard_count)]
+
+    def _shard_path(self, index: int) -> Path:
+        return self.shard_dir / f"sessions-{index:03d}.db"
+
+    def _open_shard(self, index: int) -> SQLiteSessionRepository:
+        return self._repository_class(db_path=str(self._shard_path(index)), **self._repo_kwargs)
+
+    def shard_for(self, session_id: str) -> SQLiteSessionRepository:
+        """Return the shard storing a session."""
+        return self.shards[shard_index(session_id, len(self.shards))]
+
+    # Session methods
+    def create_session(self, session: Session, **kwargs: Any) -> Session:
+        """Create a new session."""
+        return self.shard_for(session.session_id).create_session(session, **kwargs)
+
+    def read_session(self, session_id: str, **kwargs: Any) -> Session | None:
+        """Read a session by ID."""
+        return self.shard_for(session_id).read_session(session_id, **kwargs)
+
+    def list_sessions(self) -> list[Session]:
+        """List the sessions of every shard, ordered by session_id."""
+        return list(heapq.merge(*(shard.list_sessions() for shard in self.shards), key=lambda s: s.session_id))
+
+    # Agent methods
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """Create a new agent."""
+        self.shard_for(session_id).create_agent(session_id, session_agent, **kwargs)
+
+    def read_agent(self, session_id: str, agent_id: str, **kwargs: Any) -> SessionAgent | None:
+        """Read an agent by ID."""
+        return self.shard_for(session_id).read_agent(session_id, agent_id, **kwargs)
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """Update an existing agent."""
+        self.shard_for(session_id).update_agent(session_id, session_agent, **kwargs)
+
+    # Message methods
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """Create a new message."""
+        self.shard_for(session_id).create_message(session_id, agent_id, session_message, **kwargs)
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs: Any) -> SessionMessage | None:
+        """Read a message by ID."""
+        return self.shard_for(session_id).read_message(session_id, agent_id, message_id, **kwargs)
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """Update an existing message."""
+        self.shard_for(session_id).update_message(session_id, agent_id, session_message, **kwargs)
+
+    def list_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        **kwargs: Any,
+    ) -> list[SessionMessage]:
+        """List messages for a session."""
+        return self.shard_for(session_id).list_messages(session_id, agent_id, limit, offset, **kwargs)
+
+    def iter_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        after_message_id: int | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SessionMessage]:
+        """Stream messages for a session in message_id order."""
+        return self.shard_for(session_id).iter_messages(session_id, agent_id, after_message_id, batch_size)
+
+    # Administration
+    def flush(self) -> None:
+        """Write the pending writes of write-behind shards."""
+        for shard in self.shards:
+            if isinstance(shard, WriteBehindSQLiteSessionRepository):
+                shard.flush()
+
+    def compact(self, *, vacuum: bool = False) -> dict[str, int]:
+        """Compact every shard and return the total number of deleted messages and blobs."""
+        totals = {"messages": 0, "blobs": 0}
+        for shard in self.shards:
+            for key, deleted in shard.compact(vacuum=vacuum).items():
+                totals[key] += deleted
+        return totals
+
+    def rebalance(self, shard_count: int) -> int:
+        """Redistribute the sessions over ``shard_count`` shards.
+
+        Only sessions whose shard changes are moved, together with their agents,
+        messages, snapshot and blobs. Each move is committed before the rows are deleted
+        from the old shard, so an interrupted rebalance can simply be run again. Shards
+        beyond the new count are deleted once they are empty.
+
+        This must run while no other process is using the shards.
+
+        Args:
+            shard_count: New number of shards
+
+        Returns:
+            Number of sessions moved
+
+        """
+        self.flush()
+        old_shards = self.shards
+        new_shards = [old_shards[i] if i < len(old_shards) else self._open_shard(i) for i in range(shard_count)]
+
+        moved = 0
+        for index, shard in enumerate(old_shards):
+            targets: dict[int, list[str]] = defaultdict(list)
+            for session in shard.list_sessions():
+                target = shard_index(session.session_id, shard_count)
+                if target != index:
+                    targets[target].append(session.session_id)
+
+            for target, session_ids in targets.items():
+                _move_sessions(Path(shard.db_path), Path(new_shards[target].db_path), session_ids)
+                moved += len(session_ids)
+            if targets:
+                shard.delete_orphan_blobs()
+
+            if index >= shard_count:
+                shard.close()
+                for path in self.shard_dir.glob(f"{self._shard_path(index).name}*"):
+                    path.unlink()
+
+        self.shards = new_shards
+        return moved
+
+    def import_database(self, db_path: str) -> int:
+        """Copy the sessions of a single-file SQLiteSessionRepository into the shards.
+
+        The source database is left unchanged, and sessions already in the shards are
+        overwritten, so an interrupted import can simply be run again. Like ``rebalance``,
+        this must run while no other process is using the source or the shards.
+
+        Args:
+            db_path: Path to the database file of the SQLiteSessionRepository
+
+        Returns:
+            Number of sessions copied
+
+        """
+        self.flush()
+        # Opening the source runs its schema migrations, so its columns match the shards
+        with SQLiteSessionRepository(db_path=db_path) as source:
+            targets: dict[int, list[str]] = defaultdict(list)
+            for session in source.list_sessions():
+                targets[shard_index(session.session_id, len(self.shards))].append(session.session_id)
+
+        for target, session_ids in targets.items():
+            _move_sessions(Path(db_path), Path(self.shards[target].db_path), session_ids, delete_source=False)
+        return sum(len(session_ids) for session_ids in targets.values())
+
+    # Lifecycle
+    def close(self) -> None:
+        """Close every shard."""
+        for shard in self.shards:
+            shard.close()
+
+    def __enter__(self) -> Self:
+        """Use the repository as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Close the repository."""
+        self.close()
+
+
+def _move_sessions(source: Path, target: Path, session_ids: list[str], *, delete_source: bool = True) -> None:
+    """Copy sessions from one database file to another, then delete them from the source unless told not to."""
+    conn = sqlite3.connect(source, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS target", (str(target),))
+        conn.execute("CREATE TEMP TABLE moving (session_id TEXT PRIMARY KEY)")
+        conn.executemany(
+            "INSERT INTO temp.moving (session_id) VALUES (?)", ((session_id,) for session_id in session_ids)
+        )
+
+        conn.execute("BEGIN IMMEDIATE")
+        # Name the columns, as migrated databases may have them in a different order
+        for table in SESSION_TABLES:
+            columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA target.table_info({table})"))
+            conn.execute(
+                f"INSERT OR REPLACE INTO target.{table} ({columns}) "  # noqa: S608
+                f"SELECT {columns} FROM main.{table} WHERE session_id IN (SELECT session_id FROM temp.moving)"
+            )
+        blob_refs = conn.execute(
+            "SELECT blob_refs FROM main.messages WHERE blob_refs IS NOT NULL "
+            "AND session_id IN (SELECT session_id FROM temp.moving) "
+            "UNION ALL SELECT blob_refs FROM main.snapshots WHERE blob_refs IS NOT NULL "
+            "AND session_id IN (SELECT session_id FROM temp.moving)"
+        ).fetchall()
+        digests = {digest for (refs,) in blob_refs for digest in refs.split()}
+        conn.execute("CREATE TEMP TABLE moving_blobs (hash TEXT PRIMARY KEY)")
+        conn.executemany("INSERT INTO temp.moving_blobs (hash) VALUES (?)", ((digest,) for digest in digests))
+        conn.execute(
+            "INSERT OR IGNORE INTO target.blobs (hash, data) "
+            "SELECT hash, data FROM main.blobs WHERE hash IN (SELECT hash FROM temp.moving_blobs)"
+        )
+        conn.execute("COMMIT")
+        if not delete_source:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        for table in reversed(SESSION_TABLES):
+            conn.execute(
+                f"DELETE FROM main.{table} WHERE session_id IN (SELECT session_id FROM temp.moving)"  # noqa: S608
+            )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id, list, rebalance <shard_count> または migrate <db_path> が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "sharded_session_management <session_id> [second] | list | rebalance <shard_count> | migrate <db_path>"
+        )
+        sys.exit(1)
+
+    shard_dir = "data/shards"
+    shard_count = len(list(Path(shard_dir).glob("sessions-*.db"))) or 4
+
+    with ShardedSQLiteSessionRepository(shard_dir=shard_dir, shard_count=shard_count) as sharded_repo:
+        if sys.argv[1] == "list":
+            # 全シャードのセッションを session_id 順に表示
+            for session in sharded_repo.list_sessions():
+                print(f"{session.session_id}\tshard={shard_index(session.session_id, shard_count)}")
+            sys.exit(0)
+
+        if sys.argv[1] == "rebalance":
+            new_shard_count = int(sys.argv[SECOND_ARG_INDEX])
+            moved = sharded_repo.rebalance(new_shard_count)
+            print(f"シャード数: {shard_count} -> {new_shard_count}, 移動したセッション数: {moved}")
+            sys.exit(0)
+
+        if sys.argv[1] == "migrate":
+            source_path = sys.argv[SECOND_ARG_INDEX]
+            copied = sharded_repo.import_database(source_path)
+            print(f"{source_path} から {copied} 件のセッションを {shard_count} シャードへ取り込みました")
+            sys.exit(0)
+
+        session_id = sys.argv[1]
+        session_manager = RepositorySessionManager(session_id=session_id, session_repository=sharded_repo)
+        agent = Agent(session_manager=session_manager)
+
+        if len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second":
+            print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+            response = agent("さっき私が教えた数字は何でしたか?")
+        else:
+            print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+            response = agent("私の好きな数字は42です。覚えておいてください。")
+            print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+            print(
+                "uv run python -m strands_agents_hands_on.examples.02_session."
+                f"sharded_session_management {session_id} second"
+            )
@@ -0,0 +1,209 @@
+"""Usage example for restoring agents from session snapshots.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.snapshot_session_management user-123
+
+    # 2回目の実行: スナップショットと新しいメッセージだけを読み込んで復元
+    uv run python -m strands_agents_hands_on.examples.02_session.snapshot_session_management user-123 second
+
+    # 会話マネージャーが二度と読み込まないメッセージを削除 (オフライン実行)
+    uv run python -m strands_agents_hands_on.examples.02_session.snapshot_session_management compact
+"""
+
+import sys
+from pathlib import Path
+from typing import Any
+
+from strands import Agent
+from strands.agent.state import AgentState
+from strands.hooks import AfterInvocationEvent, HookRegistry
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.types.content import Message
+from strands.types.exceptions import SessionException
+from strands.types.session import SessionAgent, SessionMessage
+
+from .custom_session_management import AgentSnapshot, SQLiteSessionRepository
+
+
+class SnapshotSessionManager(RepositorySessionManager):
+    """RepositorySessionManager that restores agents from periodic snapshots.
+
+    After an invocation that added at least ``snapshot_interval`` messages since the
+    last snapshot, the messages the conversation manager still keeps are written
+    together with the agent state as one snapshot row. A cold start then reads that
+    row plus the messages created after it, instead of replaying the whole history.
+
+    Snapshots rely on message IDs being positions in the history, which holds for
+    messages written by ``RepositorySessionManager`` (sequential from 0).
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        session_repository: SQLiteSessionRepository,
+        snapshot_interval: int = 50,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the session manager.
+
+        Args:
+            session_id: ID to use for the session
+            session_repository: SQLite repository storing the messages and snapshots
+            snapshot_interval: Number of new messages after which a snapshot is written
+            **kwargs: Additional keyword arguments forwarded to RepositorySessionManager
+
+        """
+        super().__init__(session_id=session_id, session_repository=session_repository, **kwargs)
+        self.sqlite_repository = session_repository
+        self.snapshot_interval = snapshot_interval
+        # Messages not yet removed by the conversation manager, per agent
+        self._windows: dict[str, list[SessionMessage]] = {}
+        # Newest message_id covered by the stored snapshot (-1 if there is none)
+        self._snapshot_message_ids: dict[str, int] = {}
+        # Agents whose snapshot contains a message that has since been redacted
+        self._stale_snapshots: set[str] = set()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        """Register the session hooks plus a snapshot check at the end of each invocation."""
+        # AfterInvocationEvent callbacks run in reverse registration order, so registering
+        # the snapshot first makes it run after the final sync_agent of the invocation.
+        registry.add_callback(AfterInvocationEvent, self._snapshot_after_invocation)
+        super().register_hooks(registry, **kwargs)
+
+    def append_message(self, message: Message, agent: Agent, **kwargs: Any) -> None:
+        """Append a message to the agent's session and to its snapshot window."""
+        super().append_message(message, agent, **kwargs)
+        latest_agent_message = self._latest_agent_message[agent.agent_id]
+        if latest_agent_message is not None:
+            self._windows[agent.agent_id].append(latest_agent_message)
+
+    def redact_latest_message(self, redact_message: Message, agent: Agent, **kwargs: Any) -> None:
+        """Redact the latest message, marking the snapshot stale if it already contains it."""
+        super().redact_latest_message(redact_message, agent, **kwargs)
+        latest_agent_message = self._latest_agent_message[agent.agent_id]
+        if latest_agent_message is not None and latest_agent_message.message_id <= self._snapshot_message_ids.get(
+            agent.agent_id, -1
+        ):
+            self._stale_snapshots.add(agent.agent_id)
+
+    def initialize(self, agent: Agent, **kwargs: Any) -> None:
+        """Initialize an agent from its snapshot and the messages created after it.
+
+        Args:
+            agent: Agent to initialize from the session
+            **kwargs: Additional keyword arguments for future extensibility
+
+        """
+        session_agent = self.session_repository.read_agent(self.session_id, agent.agent_id)
+        if session_agent is None:
+            super().initialize(agent, **kwargs)
+            messages = [SessionMessage.from_message(message, i) for i, message in enumerate(agent.messages[:-1])]
+            latest_agent_message = self._latest_agent_message[agent.agent_id]
+            self._windows[agent.agent_id] = [*messages, latest_agent_message] if latest_agent_message else messages
+            self._snapshot_message_ids[agent.agent_id] = -1
+            return
+
+        if agent.agent_id in self._latest_agent_message:
+            raise SessionException("The `agent_id` of an agent must be unique in a session.")
+
+        agent.state = AgentState(session_agent.state)
+        prepend_messages = agent.conversation_manager.restore_from_session(session_agent.conversation_manager_state)
+        session_messages = self._load_messages(agent.agent_id, agent.conversation_manager.removed_message_count)
+
+        self._latest_agent_message[agent.agent_id] = session_messages[-1] if session_messages else None
+        self._windows[agent.agent_id] = session_messages
+        agent.messages = (prepend_messages or []) + [
+            session_message.to_message() for session_message in session_messages
+        ]
+
+    def snapshot(self, agent: Agent) -> None:
+        """Write a snapshot of the agent's current restore state."""
+        latest_agent_message = self._latest_agent_message[agent.agent_id]
+        if latest_agent_message is None:
+            return
+
+        removed_message_count = agent.conversation_manager.removed_message_count
+        window = [message for message in self._windows[agent.agent_id] if message.message_id >= removed_message_count]
+        self._windows[agent.agent_id] = window
+
+        session_agent = SessionAgent.from_agent(agent)
+        self.sqlite_repository.write_snapshot(
+            self.session_id,
+            agent.agent_id,
+            AgentSnapshot(
+                last_message_id=latest_agent_message.message_id,
+                state=session_agent.state,
+                conversation_manager_state=session_agent.conversation_manager_state,
+                messages=window,
+            ),
+        )
+        self._snapshot_message_ids[agent.agent_id] = latest_agent_message.message_id
+        self._stale_snapshots.discard(agent.agent_id)
+
+    def _load_messages(self, agent_id: str, offset: int) -> list[SessionMessage]:
+        """Read the messages from ``offset`` on, using the snapshot when it covers that offset."""
+        snapshot = self.sqlite_repository.read_snapshot(self.session_id, agent_id)
+        if snapshot is None or snapshot.conversation_manager_state.get("removed_message_count", 0) > offset:
+            self._snapshot_message_ids[agent_id] = -1
+            return self.sqlite_repository.list_messages(self.session_id, agent_id, offset=offset)
+
+        self._snapshot_message_ids[agent_id] = snapshot.last_message_id
+        messages = [message for message in snapshot.messages if message.message_id >= offset]
+        messages.extend(
+            self.sqlite_repository.iter_messages(
+                self.session_id, agent_id, after_message_id=max(snapshot.last_message_id, offset - 1)
+            )
+        )
+        return messages
+
+    def _snapshot_after_invocation(self, event: AfterInvocationEvent) -> None:
+        agent_id = event.agent.agent_id
+        latest_agent_message = self._latest_agent_message.get(agent_id)
+        if latest_agent_message is None:
+            return
+        new_messages = latest_agent_message.message_id - self._snapshot_message_ids[agent_id]
+        if new_messages >= self.snapshot_interval or agent_id in self._stale_snapshots:
+            self.snapshot(event.agent)
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id または compact が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "snapshot_session_management <session_id> [second] | compact"
+        )
+        sys.exit(1)
+
+    db_path = "data/sessions.db"
+    Path("data").mkdir(exist_ok=True)
+
+    with SQLiteSessionRepository(db_path=db_path) as sqlite_repo:
+        if sys.argv[1] == "compact":
+            # 会話マネージャーに削除済みのメッセージと参照されなくなったBLOBを削除してVACUUM
+            deleted = sqlite_repo.compact(vacuum=True)
+            print(f"削除したメッセージ数: {deleted['messages']}, 削除したBLOB数: {deleted['blobs']}")
+            sys.exit(0)
+
+        session_id = sys.argv[1]
+        # デモのため、メッセージが2件増えるごとにスナップショットを保存
+        session_manager = SnapshotSessionManager(
+            session_id=session_id, session_repository=sqlite_repo, snapshot_interval=2
+        )
+        agent = Agent(session_manager=session_manager)
+
+        if len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second":
+            print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+            response = agent("さっき私が教えた数字は何でしたか?")
+        else:
+            print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+            response = agent("私の好きな数字は42です。覚えておいてください。")
+            print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+            print(
+                "uv run python -m strands_agents_hands_on.examples.02_session."
+                f"snapshot_session_management {session_id} second"
+            )
@@ -0,0 +1,139 @@
+"""Thread-safe SQLite connection pool used by the session repositories."""
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+VALID_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of long-lived SQLite connections configured for WAL mode.
+
+    Connections are created lazily up to ``pool_size`` and reused across calls, so a
+    request no longer pays for ``sqlite3.connect`` and schema/pragmas setup each time.
+    Each connection keeps its own prepared statement cache (``cached_statements``), so
+    executing the same SQL text repeatedly skips re-parsing.
+
+    SQLite allows only one writer at a time, so writes are serialized with a lock in
+    the pool instead of letting threads spin on ``SQLITE_BUSY``. Readers run in
+    parallel thanks to WAL journaling.
+    """
+
+    busy_timeout: float = 5.0
+    cached_statements: int = 256
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 8,
+        synchronous: str = "NORMAL",
+        cache_size: int = -64_000,
+        mmap_size: int = 256 * 1024 * 1024,
+    ) -> None:
+        """Initialize the connection pool.
+
+        Args:
+            db_path: Path to the SQLite database file
+            pool_size: Maximum number of open connections
+            synchronous: ``PRAGMA synchronous`` mode (OFF, NORMAL, FULL, EXTRA)
+            cache_size: ``PRAGMA cache_size`` (negative values are KiB, positive values are pages)
+            mmap_size: ``PRAGMA mmap_size`` in bytes (0 disables memory-mapped I/O)
+
+        Raises:
+            ValueError: If pool_size is not positive or synchronous is not a valid mode
+
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        synchronous = synchronous.upper()
+        if synchronous not in VALID_SYNCHRONOUS_MODES:
+            msg = f"synchronous must be one of {VALID_SYNCHRONOUS_MODES}, got {synchronous!r}"
+            raise ValueError(msg)
+
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=pool_size)
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the configured pragmas."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while below pool_size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+            if len(self._all) < self.pool_size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+
+        return self._idle.get()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, closing it if the pool was closed meanwhile."""
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, *, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of the ``with`` block.
+
+        The block runs inside a transaction: it is committed on success and rolled
+        back if an exception is raised.
+
+        Args:
+            write: Hold the pool-wide writer lock while the connection is in use
+
+        Yields:
+            A pooled SQLite connection
+
+        """
+        conn = self._acquire()
+        try:
+            if write:
+                with self._write_lock, conn:
+                    yield conn
+            else:
+                with conn:
+                    yield conn
+        finally:
+            self._release(conn)
+
+    def close(self) -> None:
+        """Close every connection owned by the pool."""
+        with self._lock:
+            self._closed = True
+            connections, self._all = self._all, []
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,365 @@
+"""Usage example for tiered session storage: active sessions in SQLite, idle sessions in S3.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.tiered_session_management user-123
+
+    # 2回目の実行: S3 に退避されたセッションは最初のアクセスで SQLite に戻される
+    uv run python -m strands_agents_hands_on.examples.02_session.tiered_session_management user-123 second
+"""
+
+import atexit
+import logging
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Self
+
+import boto3
+from strands import Agent
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.s3_session_manager import AGENT_PREFIX, SESSION_PREFIX, S3SessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+from .custom_session_management import SQLiteSessionRepository
+from .parallel_s3_session_management import ParallelS3SessionManager
+
+logger = logging.getLogger(__name__)
+
+
+class TieredSessionRepository(SessionRepository):
+    """Session repository serving active sessions from SQLite and keeping idle ones in S3.
+
+    Every request is served by the hot SQLite repository. A session that is not there
+    but exists in the cold S3 store is promoted back to SQLite on its first access.
+
+    A background thread demotes sessions that have not been accessed for
+    ``idle_timeout`` seconds: the session is copied to S3 without holding any lock,
+    and only removed from SQLite if it was not accessed while being copied, so
+    demotion never delays requests. Cold copies left behind by a promotion or an
+    aborted demotion are deleted in the background as well; a session present in
+    SQLite always takes precedence over its S3 copy.
+
+    Each request holds its session's lock from the promotion check to the end of the
+    SQLite call, so a demotion cannot remove the session in between. Session IDs found
+    in neither store are remembered (up to ``absent_cache_size``), so new sessions do
+    not cost an S3 request on every access; this assumes no other process writes
+    sessions to the S3 prefix.
+
+    Promotion relies on message IDs being positions in the history (sequential from 0,
+    as written by ``RepositorySessionManager``) to keep ``list_messages`` offsets of
+    compacted sessions. Access times are kept in memory, so after a restart every
+    session is considered freshly accessed.
+    """
+
+    def __init__(
+        self,
+        hot: SQLiteSessionRepository,
+        cold: S3SessionManager,
+        idle_timeout: float = 3600.0,
+        demote_interval: float = 60.0,
+        absent_cache_size: int = 10_000,
+    ) -> None:
+        """Initialize the tiered repository and start its demotion thread.
+
+        Args:
+            hot: SQLite repository holding active sessions
+            cold: S3 session manager (for example ParallelS3SessionManager) holding idle sessions
+            idle_timeout: Seconds without access after which a session is moved to S3
+            demote_interval: Seconds between two scans for idle sessions
+            absent_cache_size: Maximum number of session IDs remembered as missing from S3
+
+        """
+        self.hot = hot
+        self.cold = cold
+        self.idle_timeout = idle_timeout
+        self.demote_interval = demote_interval
+        self.absent_cache_size = absent_cache_size
+
+        now = time.monotonic()
+        self._hot_sessions = {session.session_id for session in hot.list_sessions()}
+        self._last_access = dict.fromkeys(self._hot_sessions, now)
+        # Cold copies of sessions that are in SQLite, to delete in the background
+        self._stale_cold: set[str] = set()
+        # Session IDs known to be in neither store, least recently checked first
+        self._absent: OrderedDict[str, None] = OrderedDict()
+        self._absent_lock = threading.Lock()
+        # Per-session locks, dropped once no thread holds or waits for them
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock_users: Counter[str] = Counter()
+        self._locks_lock = threading.Lock()
+        self._demote_lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._demoter = threading.Thread(target=self._demote_loop, name="session-demoter", daemon=True)
+        self._demoter.start()
+        atexit.register(self.close)
+
+    @contextmanager
+    def _session_lock(self, session_id: str) -> Iterator[None]:
+        with self._locks_lock:
+            lock = self._locks.setdefault(session_id, threading.Lock())
+            self._lock_users[session_id] += 1
+        try:
+            with lock:
+                yield
+        finally:
+            with self._locks_lock:
+                self._lock_users[session_id] -= 1
+                if not self._lock_users[session_id]:
+                    del self._lock_users[session_id]
+                    del self._locks[session_id]
+
+    @contextmanager
+    def _access(self, session_id: str, *, promote: bool = True) -> Iterator[None]:
+        """Hold the session lock for a SQLite call, promoting the session first and recording the access after.
+
+        The access is recorded when the call ends, so a demotion that started copying
+        before the call finished sees a newer access time and keeps the session.
+
+        Args:
+            session_id: Session accessed
+            promote: Whether to look for the session in S3 if it is not in SQLite
+
+        """
+        with self._session_lock(session_id):
+            if promote and session_id not in self._hot_sessions:
+                self._promote(session_id)
+            try:
+                yield
+            finally:
+                if session_id in self._hot_sessions:
+                    self._last_access[session_id] = time.monotonic()
+
+    def _promote(self, session_id: str) -> None:
+        """Copy a session from S3 to SQLite (called with the session lock held)."""
+        with self._absent_lock:
+            if session_id in self._absent:
+                self._absent.move_to_end(session_id)
+                return
+        session = self.cold.read_session(session_id)
+        if session is None:
+            with self._absent_lock:
+                self._absent[session_id] = None
+                while len(self._absent) > self.absent_cache_size:
+                    self._absent.popitem(last=False)
+            return
+
+        logger.debug("session_id=<%s> | promoting session from S3", session_id)
+        self.hot.create_session(session)
+        agents_prefix = f"{self.cold.prefix}/{SESSION_PREFIX}{session_id}/agents/"
+        for page in self.cold.client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.cold.bucket, Prefix=agents_prefix, Delimiter="/"
+        ):
+            for common_prefix in page.get("CommonPrefixes", []):
+                agent_id = common_prefix["Prefix"][len(agents_prefix) :].rstrip("/").removeprefix(AGENT_PREFIX)
+                agent = self.cold.read_agent(session_id, agent_id)
+                if agent is None:
+                    continue
+                self.hot.create_agent(session_id, agent)
+                messages = self.cold.list_messages(session_id, agent_id)
+                for message in messages:
+                    self.hot.create_message(session_id, agent_id, message)
+                if messages and messages[0].message_id > 0:
+                    self.hot.set_pruned_message_count(session_id, agent_id, messages[0].message_id)
+
+        self._hot_sessions.add(session_id)
+        self._stale_cold.add(session_id)
+
+    def demote(self, session_id: str) -> bool:
+        """Move a session to S3 unless it is accessed meanwhile, and return whether it was moved."""
+        # Serialized with the demotion thread, which could otherwise delete the stale S3 copy being written here
+        with self._demote_lock:
+            return self._demote(session_id, self._last_access.get(session_id))
+
+    def _demote(self, session_id: str, started_at: float | None) -> bool:
+        """Move a session to S3 unless it was accessed after ``started_at`` (called with the demote lock held)."""
+        session = self.hot.read_session(session_id)
+        if session is None:
+            return False
+
+        if self.cold.read_session(session_id) is not None:
+            self.cold.delete_session(session_id)
+        self.cold.create_session(session)
+        for agent in self.hot.list_agents(session_id):
+            self.cold.create_agent(session_id, agent)
+            for message in self.hot.iter_messages(session_id, agent.agent_id):
+                self.cold.create_message(session_id, agent.agent_id, message)
+
+        with self._session_lock(session_id):
+            if self._last_access.get(session_id) != started_at:
+                logger.debug("session_id=<%s> | session accessed during demotion, keeping it in SQLite", session_id)
+                self._stale_cold.add(session_id)
+                return False
+            self.hot.delete_session(session_id)
+            self._hot_sessions.discard(session_id)
+            self._last_access.pop(session_id, None)
+            self._stale_cold.discard(session_id)
+        logger.debug("session_id=<%s> | demoted session to S3", session_id)
+        return True
+
+    def _demote_loop(self) -> None:
+        while not self._stop.wait(self.demote_interval):
+            self.demote_idle()
+
+    def demote_idle(self) -> int:
+        """Demote every session idle for longer than ``idle_timeout`` and return their number."""
+        with self._demote_lock:
+            return self._demote_idle()
+
+    def _demote_idle(self) -> int:
+        for session_id in list(self._stale_cold):
+            with self._session_lock(session_id):
+                if session_id not in self._hot_sessions:
+                    continue
+                self._stale_cold.discard(session_id)
+            try:
+                self.cold.delete_session(session_id)
+            except Exception:
+                logger.exception("session_id=<%s> | failed to delete stale S3 copy", session_id)
+
+        deadline = time.monotonic() - self.idle_timeout
+        demoted = 0
+        for session_id, last_access in list(self._last_access.items()):
+            if last_access > deadline or self._stop.is_set():
+                continue
+            try:
+                # Compare with the scanned access time, so an access after the scan keeps the session
+                demoted += self._demote(session_id, last_access)
+            except Exception:
+                logger.exception("session_id=<%s> | failed to demote session", session_id)
+        return demoted
+
+    # Session methods
+    def create_session(self, session: Session, **kwargs: Any) -> Session:
+        """Create a new session in SQLite."""
+        # A session being created is not looked up in S3
+        with self._access(session.session_id, promote=False):
+            created = self.hot.create_session(session, **kwargs)
+            self._hot_sessions.add(session.session_id)
+        with self._absent_lock:
+            self._absent.pop(session.session_id, None)
+        return created
+
+    def read_session(self, session_id: str, **kwargs: Any) -> Session | None:
+        """Read a session by ID."""
+        with self._access(session_id):
+            return self.hot.read_session(session_id, **kwargs)
+
+    # Agent methods
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """Create a new agent."""
+        with self._access(session_id):
+            self.hot.create_agent(session_id, session_agent, **kwargs)
+
+    def read_agent(self, session_id: str, agent_id: str, **kwargs: Any) -> SessionAgent | None:
+        """Read an agent by ID."""
+        with self._access(session_id):
+            return self.hot.read_agent(session_id, agent_id, **kwargs)
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        """Update an existing agent."""
+        with self._access(session_id):
+            self.hot.update_agent(session_id, session_agent, **kwargs)
+
+    # Message methods
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """Create a new message."""
+        with self._access(session_id):
+            self.hot.create_message(session_id, agent_id, session_message, **kwargs)
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs: Any) -> SessionMessage | None:
+        """Read a message by ID."""
+        with self._access(session_id):
+            return self.hot.read_message(session_id, agent_id, message_id, **kwargs)
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        """Update an existing message."""
+        with self._access(session_id):
+            self.hot.update_message(session_id, agent_id, session_message, **kwargs)
+
+    def list_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        **kwargs: Any,
+    ) -> list[SessionMessage]:
+        """List messages for a session."""
+        with self._access(session_id):
+            return self.hot.list_messages(session_id, agent_id, limit=limit, offset=offset, **kwargs)
+
+    # Lifecycle
+    def close(self) -> None:
+        """Stop the demotion thread. The hot and cold repositories stay open."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        atexit.unregister(self.close)
+        self._demoter.join()
+
+    def __enter__(self) -> Self:
+        """Use the repository as a context manager that stops the demotion thread on exit."""
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Stop the demotion thread."""
+        self.close()
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "tiered_session_management <session_id> [second]"
+        )
+        sys.exit(1)
+
+    session_id = sys.argv[1]
+
+    db_path = "data/sessions.db"
+    Path("data").mkdir(exist_ok=True)
+
+    # S3SessionManager はセッションマネージャーも兼ねるため、退避先用のセッションIDを渡す
+    cold_store = ParallelS3SessionManager(
+        session_id="tiered-storage",
+        bucket="strands-agents-hands-on",
+        prefix="cold-sessions",
+        boto_session=boto3.Session(region_name="us-east-1"),
+        region_name="us-east-1",
+    )
+
+    # デモのため、10秒アクセスのないセッションを S3 に退避
+    with (
+        SQLiteSessionRepository(db_path=db_path) as sqlite_repo,
+        TieredSessionRepository(sqlite_repo, cold_store, idle_timeout=10.0, demote_interval=5.0) as tiered_repo,
+    ):
+        session_manager = RepositorySessionManager(session_id=session_id, session_repository=tiered_repo)
+        agent = Agent(session_manager=session_manager)
+
+        if len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second":
+            print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+            response = agent("さっき私が教えた数字は何でしたか?")
+        else:
+            print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+            response = agent("私の好きな数字は42です。覚えておいてください。")
+            print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+            print(
+                "uv run python -m strands_agents_hands_on.examples.02_session."
+                f"tiered_session_management {session_id} second"
+            )
+
+        # アイドル状態のセッションをすぐに S3 に退避
+        tiered_repo.idle_timeout = 0.0
+        print(f"\nS3 に退避したセッション数: {tiered_repo.demote_idle()}")
+    cold_store.close()
@@ -0,0 +1,324 @@
+"""Usage example for write-behind batching on top of the SQLite session repository.
+
+Usage:
+    # 1回目の実行: 情報を伝える
+    uv run python -m strands_agents_hands_on.examples.02_session.write_behind_session_management user-123
+
+    # 2回目の実行: セッションが保存されているか確認
+    uv run python -m strands_agents_hands_on.examples.02_session.write_behind_session_management user-123 second
+"""
+
+import atexit
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from strands import Agent
+from strands.hooks import AfterInvocationEvent, HookRegistry
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.types.session import SessionAgent, SessionMessage
+
+from .custom_session_management import (
+    INSERT_BLOB_SQL,
+    INSERT_MESSAGE_SQL,
+    UPDATE_AGENT_SQL,
+    UPDATE_MESSAGE_SQL,
+    SQLiteSessionRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+MessageKey = tuple[str, str, int]
+AgentKey = tuple[str, str]
+
+
+class WriteBehindSQLiteSessionRepository(SQLiteSessionRepository):
+    """SQLite session repository that buffers message and agent writes in memory.
+
+    ``create_message``, ``update_message`` and ``update_agent`` only record the write in
+    memory and return immediately. Pending writes are flushed in a single transaction
+    with ``executemany`` when ``flush_size`` writes are queued, when the oldest pending
+    write is older than ``flush_interval`` seconds, when ``flush()`` is called (for
+    example by ``WriteBehindSessionManager`` at the end of each invocation), and on
+    ``close()``, context manager exit or interpreter shutdown.
+
+    Reads see pending writes: ``read_message`` and ``read_agent`` are answered from the
+    buffer, and ``list_messages``/``iter_messages`` flush the session's pending writes
+    before querying. Sessions and agents are still created synchronously, so buffered
+    rows never violate foreign keys.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "sessions.db",
+        flush_size: int = 64,
+        flush_interval: float = 1.0,
+        **pool_kwargs: Any,
+    ) -> None:
+        """Initialize the write-behind repository.
+
+        Args:
+            db_path: Path to the SQLite database file
+            flush_size: Number of pending writes that triggers a background flush
+            flush_interval: Maximum age in seconds of a pending write before it is flushed
+            **pool_kwargs: Connection pool options forwarded to SQLiteSessionRepository
+
+        """
+        super().__init__(db_path=db_path, **pool_kwargs)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        # (session_id, agent_id, message_id) -> (message, is_new)
+        self._pending_messages: dict[MessageKey, tuple[SessionMessage, bool]] = {}
+        self._pending_agents: dict[AgentKey, SessionAgent] = {}
+        # Writes taken by a flush that has not committed yet, still visible to readers
+        self._flushing_messages: dict[MessageKey, tuple[SessionMessage, bool]] = {}
+        self._flushing_agents: dict[AgentKey, SessionAgent] = {}
+        self._oldest_pending: float | None = None
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="sqlite-write-behind", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # Buffered writes
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **_kwargs: Any) -> None:
+        """Queue an agent update, coalescing it with any pending update of the same agent."""
+        with self._buffer_lock:
+            self._pending_agents[session_id, session_agent.agent_id] = session_agent
+            self._mark_pending()
+
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **_kwargs: Any) -> None:
+        """Queue a message insert."""
+        with self._buffer_lock:
+            self._pending_messages[session_id, agent_id, session_message.message_id] = (session_message, True)
+            self._mark_pending()
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **_kwargs: Any) -> None:
+        """Queue a message update, folding it into a pending insert of the same message."""
+        key = (session_id, agent_id, session_message.message_id)
+        with self._buffer_lock:
+            pending = self._pending_messages.get(key)
+            is_new = pending[1] if pending else False
+            self._pending_messages[key] = (session_message, is_new)
+            self._mark_pending()
+
+    def _mark_pending(self) -> None:
+        """Track the age of the buffer and wake the flusher once flush_size is reached.
+
+        Must be called with ``_buffer_lock`` held.
+        """
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        if len(self._pending_messages) + len(self._pending_agents) >= self.flush_size:
+            self._wakeup.set()
+
+    # Read-your-writes
+    def read_agent(self, session_id: str, agent_id: str, **kwargs: Any) -> SessionAgent | None:
+        """Read an agent, preferring a pending update over the stored row."""
+        with self._buffer_lock:
+            key = (session_id, agent_id)
+            pending = self._pending_agents.get(key) or self._flushing_agents.get(key)
+        if pending is not None:
+            return pending
+        return super().read_agent(session_id, agent_id, **kwargs)
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs: Any) -> SessionMessage | None:
+        """Read a message, preferring a pending write over the stored row."""
+        with self._buffer_lock:
+            key = (session_id, agent_id, message_id)
+            pending = self._pending_messages.get(key) or self._flushing_messages.get(key)
+        if pending is not None:
+            return pending[0]
+        return super().read_message(session_id, agent_id, message_id, **kwargs)
+
+    def list_agents(self, session_id: str) -> list[SessionAgent]:
+        """List the agents of a session, flushing pending writes first."""
+        self.flush()
+        return super().list_agents(session_id)
+
+    def delete_session(self, session_id: str) -> None:
+        """Delete a session, flushing pending writes first so none of them outlives it."""
+        self.flush()
+        super().delete_session(session_id)
+
+    def list_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        **kwargs: Any,
+    ) -> list[SessionMessage]:
+        """List messages, flushing the session's pending writes first so the result includes them."""
+        self._flush_if_pending(session_id, agent_id)
+        return super().list_messages(session_id, agent_id, limit=limit, offset=offset, **kwargs)
+
+    def iter_messages(
+        self,
+        session_id: str,
+        agent_id: str,
+        after_message_id: int | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SessionMessage]:
+        """Stream messages, flushing the session's pending writes first so the result includes them."""
+        self._flush_if_pending(session_id, agent_id)
+        return super().iter_messages(session_id, agent_id, after_message_id=after_message_id, batch_size=batch_size)
+
+    def _flush_if_pending(self, session_id: str, agent_id: str) -> None:
+        """Flush when the agent has pending or in-flight message writes."""
+        with self._buffer_lock:
+            has_pending = any(
+                key[:2] == (session_id, agent_id) for key in (*self._pending_messages, *self._flushing_messages)
+            )
+        if has_pending:
+            self.flush()
+
+    # Flushing
+    def flush(self) -> None:
+        """Write all pending messages and agent updates in one transaction."""
+        with self._flush_lock:
+            with self._buffer_lock:
+                messages, self._pending_messages = self._pending_messages, {}
+                agents, self._pending_agents = self._pending_agents, {}
+                self._flushing_messages, self._flushing_agents = messages, agents
+                self._oldest_pending = None
+            if not messages and not agents:
+                return
+
+            blobs: dict[str, bytes] = {}
+            inserts = [
+                self._message_insert_params(*key[:2], message, blobs) for key, (message, new) in messages.items() if new
+            ]
+            updates = [
+                self._message_update_params(*key[:2], message, blobs)
+                for key, (message, new) in messages.items()
+                if not new
+            ]
+            agent_updates = [self._agent_update_params(key[0], agent) for key, agent in agents.items()]
+
+            try:
+                with self._pool.connection(write=True) as conn:
+                    conn.executemany(INSERT_BLOB_SQL, blobs.items())
+                    conn.executemany(INSERT_MESSAGE_SQL, inserts)
+                    conn.executemany(UPDATE_MESSAGE_SQL, updates)
+                    conn.executemany(UPDATE_AGENT_SQL, agent_updates)
+            except Exception:
+                self._requeue(messages, agents)
+                raise
+            finally:
+                with self._buffer_lock:
+                    self._flushing_messages, self._flushing_agents = {}, {}
+
+    def _requeue(
+        self, messages: dict[MessageKey, tuple[SessionMessage, bool]], agents: dict[AgentKey, SessionAgent]
+    ) -> None:
+        """Put back writes from a failed flush without overwriting newer pending writes."""
+        with self._buffer_lock:
+            for key, (message, is_new) in messages.items():
+                if key in self._pending_messages:
+                    newer, _ = self._pending_messages[key]
+                    self._pending_messages[key] = (newer, is_new)
+                else:
+                    self._pending_messages[key] = (message, is_new)
+            for key, agent in agents.items():
+                self._pending_agents.setdefault(key, agent)
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+
+    def _flush_loop(self) -> None:
+        """Background loop that flushes on the size or time threshold."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            with self._buffer_lock:
+                oldest = self._oldest_pending
+                size = len(self._pending_messages) + len(self._pending_agents)
+            if oldest is None:
+                continue
+            if size >= self.flush_size or time.monotonic() - oldest >= self.flush_interval:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("write-behind flush failed, pending writes will be retried")
+
+    def close(self) -> None:
+        """Stop the background flusher, flush pending writes and close all connections."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._flusher.join()
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+
+class WriteBehindSessionManager(RepositorySessionManager):
+    """RepositorySessionManager that flushes a write-behind repository after each invocation."""
+
+    def __init__(self, session_id: str, session_repository: WriteBehindSQLiteSessionRepository, **kwargs: Any) -> None:
+        """Initialize the session manager.
+
+        Args:
+            session_id: ID to use for the session
+            session_repository: Write-behind repository to flush at the end of each invocation
+            **kwargs: Additional keyword arguments forwarded to RepositorySessionManager
+
+        """
+        super().__init__(session_id=session_id, session_repository=session_repository, **kwargs)
+        self.write_behind_repository = session_repository
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        """Register the session hooks plus a flush at the end of each invocation."""
+        # AfterInvocationEvent callbacks run in reverse registration order, so registering
+        # the flush first makes it run after the final sync_agent of the invocation.
+        registry.add_callback(AfterInvocationEvent, self._flush_after_invocation)
+        super().register_hooks(registry, **kwargs)
+
+    def _flush_after_invocation(self, event: AfterInvocationEvent) -> None:
+        self.write_behind_repository.flush()
+
+
+if __name__ == "__main__":
+    MIN_ARGS = 2
+    SECOND_ARG_INDEX = 2
+
+    if len(sys.argv) < MIN_ARGS:
+        print("Error: session_id が必要です")
+        print(
+            "Usage: python -m strands_agents_hands_on.examples.02_session."
+            "write_behind_session_management <session_id> [second]"
+        )
+        sys.exit(1)
+
+    session_id = sys.argv[1]
+
+    db_path = "data/sessions.db"
+    Path("data").mkdir(exist_ok=True)
+
+    # with ブロックを抜けるときに未書き込みのメッセージがフラッシュされる
+    with WriteBehindSQLiteSessionRepository(db_path=db_path, flush_size=32, flush_interval=0.5) as sqlite_repo:
+        session_manager = WriteBehindSessionManager(session_id=session_id, session_repository=sqlite_repo)
+        agent = Agent(session_manager=session_manager)
+
+        if len(sys.argv) > SECOND_ARG_INDEX and sys.argv[SECOND_ARG_INDEX] == "second":
+            print(f"=== 2回目の実行 (session_id: {session_id}) ===")
+            response = agent("さっき私が教えた数字は何でしたか?")
+        else:
+            print(f"=== 1回目の実行 (session_id: {session_id}) ===")
+            response = agent("私の好きな数字は42です。覚えておいてください。")
+            print("\n次に 'second' 引数をつけて実行してセッション永続化をテストしてください:")
+            print(
+                "uv run python -m strands_agents_hands_on.examples.02_session."
+                f"write_behind_session_management {session_id} second"
+            )
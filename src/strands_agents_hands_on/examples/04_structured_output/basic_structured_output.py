@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
 from strands import Agent
+from strands.models.bedrock import BedrockModel
+
+from strands_agents_hands_on.examples.schema_registry import PrecompiledSchemaModel, schema_registry
 
 
 class AIAgentInfo(BaseModel):
@@ -11,7 +14,13 @@ class AIAgentInfo(BaseModel):
     benefits: list[str] = Field(description="導入メリット")
 
 
-agent = Agent()
+# ツール仕様・JSONスキーマ・バリデータを起動時に一度だけ生成しておく
+schema_registry.warm_up(AIAgentInfo)
+
+# 事前生成したツール仕様とバリデータを structured_output で使う
+model = PrecompiledSchemaModel(BedrockModel())
+
+agent = Agent(model=model)
 
 result = agent.structured_output(
     AIAgentInfo,
@@ -2,6 +2,10 @@ from pathlib import Path
 
 from pydantic import BaseModel, Field
 from strands import Agent
+from strands.models.bedrock import BedrockModel
+
+from strands_agents_hands_on.examples.image_preprocessing import ImagePreprocessor
+from strands_agents_hands_on.examples.schema_registry import PrecompiledSchemaModel, schema_registry
 
 
 class ImageComparison(BaseModel):
@@ -14,23 +18,23 @@ class ImageComparison(BaseModel):
     overall_assessment: str = Field(description="全体的な評価・まとめ")
 
 
-agent = Agent()
+# ツール仕様・JSONスキーマ・バリデータを起動時に一度だけ生成しておく
+schema_registry.warm_up(ImageComparison)
+
+agent = Agent(model=PrecompiledSchemaModel(BedrockModel()))
 
 image1_path = Path("data/images/image1.png")
 image2_path = Path("data/images/image2.png")
 
-with image1_path.open("rb") as fp:
-    image1_bytes = fp.read()
-
-with image2_path.open("rb") as fp:
-    image2_bytes = fp.read()
+# 画像は縮小・再エンコードしてから送り、同じ内容の画像は再処理せずキャッシュから返す
+preprocessor = ImagePreprocessor()
 
 result = agent.structured_output(
     ImageComparison,
     [
         {"text": "これら2つの画像を比較して、違いを説明してください"},
-        {"image": {"format": "png", "source": {"bytes": image1_bytes}}},
-        {"image": {"format": "png", "source": {"bytes": image2_bytes}}},
+        preprocessor.content_block(image1_path),
+        preprocessor.content_block(image2_path),
     ],
 )
 
@@ -44,3 +48,5 @@ print("\n【共通点】")
 for sim in result.similarities:
     print(f"  - {sim}")
 print(f"\n【総合評価】\n{result.overall_assessment}")
+stats = preprocessor.stats
+print(f"\n画像の削減: {stats.bytes_saved:,}B (追加レイテンシ {stats.mean_latency_ms:.1f}ms/枚)")
@@ -0,0 +1,296 @@
+"""Stream structured output as partially populated models while the tool-call JSON arrives.
+
+Usage:
+    # Bedrock で AIAgentInfo を取得し、フィールドが揃うたびに表示
+    uv run python -m strands_agents_hands_on.examples.04_structured_output.streaming_structured_output
+
+    # スタブモデルで最初のフィールドまでの時間と完了までの時間を比較 (オフライン)
+    uv run python -m strands_agents_hands_on.examples.04_structured_output.streaming_structured_output --stub
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import AsyncGenerator, AsyncIterable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel, Field
+from strands import Agent
+from strands.event_loop import streaming
+from strands.hooks import AfterInvocationEvent, BeforeInvocationEvent
+from strands.types.agent import AgentInput
+from strands.types.content import Messages
+from strands.types.streaming import StreamEvent
+
+from strands_agents_hands_on.examples.schema_registry import schema_registry
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class _Frame:
+    kind: str  # "{" or "["
+    # For objects: "key" (expecting a key), "value" (after ":") or "after" (value complete)
+    state: str = "key"
+    key: str | None = None
+
+
+class PartialJSONParser:
+    """Incremental JSON parser returning the prefix of a document made of complete values.
+
+    Each chunk is scanned once, tracking nesting, strings and the end of the last
+    complete value. ``snapshot`` parses the text up to that point with the open
+    containers closed, so it holds every finished string, number, item and object,
+    and never a half-written one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty parser."""
+        self._text = ""
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._in_scalar = False
+        self._string_start = 0
+        # Length of the prefix ending with a complete value, and the brackets closing it
+        self._cut = 0
+        self._closers = ""
+        self._completed: list[str] = []
+
+    @property
+    def completed(self) -> tuple[str, ...]:
+        """Keys of the root object whose value is complete, in arrival order."""
+        return tuple(self._completed)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk and return whether a new value was completed."""
+        cut = self._cut
+        base = len(self._text)
+        self._text += chunk
+        for offset, char in enumerate(chunk):
+            position = base + offset
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string(position + 1)
+                continue
+            if self._in_scalar:
+                if char not in ",}]" and char not in WHITESPACE:
+                    continue
+                self._in_scalar = False
+                self._value_done(position)
+            self._structural(char, position)
+        return self._cut != cut
+
+    def _structural(self, char: str, position: int) -> None:
+        top = self._stack[-1] if self._stack else None
+        if char == '"':
+            self._in_string = True
+            self._string_start = position
+        elif char in "{[":
+            self._stack.append(_Frame(char))
+        elif char in "}]":
+            self._stack.pop()
+            self._value_done(position + 1)
+        elif char == ":" and top is not None:
+            top.state = "value"
+        elif char == ",":
+            if top is not None and top.kind == "{":
+                top.state = "key"
+        elif char not in WHITESPACE:
+            self._in_scalar = True
+
+    def _end_string(self, end: int) -> None:
+        top = self._stack[-1] if self._stack else None
+        if top is not None and top.kind == "{" and top.state == "key":
+            top.key = json.loads(self._text[self._string_start : end])
+            return
+        self._value_done(end)
+
+    def _value_done(self, end: int) -> None:
+        top = self._stack[-1] if self._stack else None
+        if top is not None and top.kind == "{":
+            top.state = "after"
+            if len(self._stack) == 1 and top.key is not None:
+                self._completed.append(top.key)
+        self._cut = end
+        self._closers = "".join("}" if frame.kind == "{" else "]" for frame in reversed(self._stack))
+
+    def snapshot(self) -> Any | None:
+        """Return the document made of the complete values so far (None before the first one)."""
+        if not self._cut:
+            return None
+        return json.loads(self._text[: self._cut] + self._closers)
+
+
+@dataclass
+class PartialOutput[T: BaseModel]:
+    """Structured output received so far.
+
+    Attributes:
+        output: Model holding the values received so far. Until ``done`` it is built
+            without validation: fields not received yet are None, lists hold the items
+            completed so far and nested models are plain dicts
+        completed: Fields whose value is complete, in arrival order
+        done: Whether ``output`` is the final, validated model
+        elapsed: Seconds since the request was sent
+
+    """
+
+    output: T
+    completed: tuple[str, ...]
+    done: bool = False
+    elapsed: float = 0.0
+
+
+def partial_model[T: BaseModel](output_model: type[T], data: dict[str, Any]) -> T:
+    """Build an unvalidated model from the fields received so far, leaving the others None."""
+    values = {name: data.get(name) for name in output_model.model_fields}
+    return output_model.model_construct(_fields_set=set(data) & set(output_model.model_fields), **values)
+
+
+async def stream_structured_output[T: BaseModel](
+    agent: Agent, output_model: type[T], prompt: AgentInput = None
+) -> AsyncGenerator[PartialOutput[T], None]:
+    """Stream ``agent.structured_output`` as partially populated models.
+
+    The tool-call JSON the model streams is parsed incrementally, and a partial model
+    is yielded whenever a value is completed (a field, or an item of a list field).
+    The last item is the validated model with ``done`` set; validation runs only once,
+    on the full response. Like ``structured_output``, the prompt is not added to the
+    conversation history.
+
+    Args:
+        agent: Agent whose model, system prompt and conversation are used
+        output_model: Pydantic model to extract
+        prompt: Prompt to send with the conversation history
+
+    Yields:
+        PartialOutput each time the output grows, then the final one
+
+    Raises:
+        ValueError: If no conversation history or prompt is provided
+
+    """
+    if not agent.messages and not prompt:
+        msg = "No conversation history or prompt provided"
+        raise ValueError(msg)
+
+    messages = agent.messages + agent._convert_prompt_to_messages(prompt)  # noqa: SLF001
+    tool_name = schema_registry.compile(output_model).tool_spec["name"]
+    parser = PartialJSONParser()
+    tool_use_id = None
+    start = time.perf_counter()
+
+    agent.hooks.invoke_callbacks(BeforeInvocationEvent(agent=agent))
+    try:
+        async for event in agent.model.structured_output(output_model, messages, system_prompt=agent.system_prompt):
+            if "output" in event and isinstance(event["output"], output_model):
+                fields = tuple(output_model.model_fields)
+                yield PartialOutput(event["output"], fields, done=True, elapsed=time.perf_counter() - start)
+                return
+
+            tool_use, delta = event.get("current_tool_use"), event.get("delta")
+            if not isinstance(tool_use, dict) or not isinstance(delta, dict) or "toolUse" not in delta:
+                continue
+            if tool_use.get("name") != tool_name:
+                continue
+            if tool_use.get("toolUseId") != tool_use_id:
+                tool_use_id = tool_use.get("toolUseId")
+                parser = PartialJSONParser()
+            if parser.feed(delta["toolUse"]["input"]) and isinstance(snapshot := parser.snapshot(), dict):
+                output = partial_model(output_model, snapshot)
+                yield PartialOutput(output, parser.completed, elapsed=time.perf_counter() - start)
+    finally:
+        agent.hooks.invoke_callbacks(AfterInvocationEvent(agent=agent))
+
+
+class AIAgentInfo(BaseModel):
+    """AIエージェントに関する情報"""
+
+    definition: str = Field(description="AIエージェントの定義")
+    key_features: list[str] = Field(description="主な特徴のリスト")
+    use_cases: list[str] = Field(description="具体的なユースケース")
+    benefits: list[str] = Field(description="導入メリット")
+
+
+class ChunkedStubModel(StubModel):
+    """StubModel streaming its structured output as tool-call JSON chunks, like Bedrock does."""
+
+    def __init__(self, structured: dict[str, Any], chunk_size: int = 8, chunk_delay: float = 0.02) -> None:
+        super().__init__(structured=structured)
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+
+    async def _tool_call(self, tool_name: str) -> AsyncIterable[StreamEvent]:
+        payload = json.dumps(self.structured, ensure_ascii=False)
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {"toolUse": {"name": tool_name, "toolUseId": "stub-1"}}}}
+        for start in range(0, len(payload), self.chunk_size):
+            await asyncio.sleep(self.chunk_delay)
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": payload[start : start + self.chunk_size]}}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "tool_use"}}
+
+    async def structured_output[S: BaseModel](
+        self,
+        output_model: type[S],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, S | Any], None]:
+        tool_name = schema_registry.compile(output_model).tool_spec["name"]
+        async for event in streaming.process_stream(self._tool_call(tool_name)):
+            yield event
+        yield {"output": output_model.model_validate(self.structured)}
+
+
+async def _demo(agent: Agent, prompt: str) -> None:
+    first_field = None
+    async for partial in stream_structured_output(agent, AIAgentInfo, prompt):
+        if first_field is None and partial.completed:
+            first_field = partial.elapsed
+        info = partial.output
+        if partial.done:
+            print(f"\n[{partial.elapsed:5.2f}s] 検証済み: {info.definition[:40]}...")
+            break
+        counts = ", ".join(
+            f"{name}={len(value)}"
+            for name in ("key_features", "use_cases", "benefits")
+            if (value := getattr(info, name))
+        )
+        print(f"[{partial.elapsed:5.2f}s] 完了: {', '.join(partial.completed) or '-'} | {counts}")
+
+    start = time.perf_counter()
+    await agent.structured_output_async(AIAgentInfo, prompt)
+    blocking = time.perf_counter() - start
+    print(f"\n最初のフィールドまで: {first_field or 0:.2f}s / structured_output の完了まで: {blocking:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stub", action="store_true", help="use a stub model instead of Bedrock")
+    args = parser.parse_args()
+
+    if args.stub:
+        structured = {
+            "definition": "目標に向けて自律的に計画し、ツールを使ってタスクを実行するAIシステム",
+            "key_features": ["自律性", "ツール利用", "計画立案", "記憶"],
+            "use_cases": ["カスタマーサポート", "コードレビュー", "データ分析"],
+            "benefits": ["作業の自動化", "応答時間の短縮"],
+        }
+        agent = Agent(model=ChunkedStubModel(structured), callback_handler=None)
+    else:
+        agent = Agent(callback_handler=None)
+    asyncio.run(_demo(agent, "AIエージェントについて教えてください"))
+
+
+if __name__ == "__main__":
+    main()
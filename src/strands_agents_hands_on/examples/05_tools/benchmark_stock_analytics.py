@@ -0,0 +1,143 @@
+"""Benchmark the NumPy stock analytics against pure-Python implementations on large series.
+
+Usage:
+    # 1千・10万・100万点の疑似株価で分析時間を比較
+    uv run python -m strands_agents_hands_on.examples.05_tools.benchmark_stock_analytics
+
+    # 系列の長さを変更
+    uv run python -m strands_agents_hands_on.examples.05_tools.benchmark_stock_analytics --sizes 5000000
+"""
+
+import argparse
+import itertools
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from .stock_analytics import TRADING_DAYS, compute_statistics, datasets
+
+
+def python_summary(prices: list[float], volumes: list[float]) -> dict:
+    """Compute the statistics of the original analyze_stock_data, with one Python pass per max/min/sum call."""
+    return {
+        "count": len(prices),
+        "high": max(prices),
+        "low": min(prices),
+        "mean": sum(prices) / len(prices),
+        "range": max(prices) - min(prices),
+        "range_pct": (max(prices) - min(prices)) / min(prices) * 100,
+        "mean_volume": sum(volumes) / len(volumes),
+        "total_volume": sum(volumes),
+    }
+
+
+def python_statistics(prices: list[float], volumes: list[float], windows: tuple[int, ...] = (20, 50)) -> dict:
+    """Compute the statistics of compute_statistics in pure Python, for comparison."""
+    count = len(prices)
+    high, low = max(prices), min(prices)
+    returns = [current / previous - 1 for previous, current in itertools.pairwise(prices)]
+    mean_return = sum(returns) / len(returns)
+    volatility = math.sqrt(sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1))
+    peak, max_drawdown = prices[0], 0.0
+    for price in prices:
+        peak = max(peak, price)
+        max_drawdown = min(max_drawdown, price / peak - 1)
+    total_volume = sum(volumes)
+    stats: dict[str, Any] = {
+        "count": count,
+        "first": prices[0],
+        "last": prices[-1],
+        "high": high,
+        "low": low,
+        "mean": sum(prices) / count,
+        "range": high - low,
+        "range_pct": (high - low) / low * 100,
+        "total_return_pct": (prices[-1] / prices[0] - 1) * 100,
+        "mean_return_pct": mean_return * 100,
+        "volatility_pct": volatility * 100,
+        "annualized_volatility_pct": volatility * math.sqrt(TRADING_DAYS) * 100,
+        "best_return_pct": max(returns) * 100,
+        "worst_return_pct": min(returns) * 100,
+        "max_drawdown_pct": max_drawdown * 100,
+    }
+    for window in windows:
+        stats[f"sma_{window}"] = sum(prices[-window:]) / window
+    stats |= {
+        "total_volume": total_volume,
+        "mean_volume": total_volume / count,
+        "vwap": sum(p * v for p, v in zip(prices, volumes, strict=True)) / total_volume,
+    }
+    return stats
+
+
+def synthetic_series(size: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Return a geometric random walk of prices and random volumes."""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size)))
+    volumes = rng.integers(1_000_000, 5_000_000, size).astype(np.float64)
+    return prices, volumes
+
+
+def best_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def check_equal(expected: dict, actual: dict) -> None:
+    """Raise if the statistics of both implementations differ beyond floating-point error."""
+    for key, value in expected.items():
+        if not math.isclose(value, actual[key], rel_tol=1e-6, abs_tol=1e-9):
+            msg = f"{key}: {value} != {actual[key]}"
+            raise AssertionError(msg)
+
+
+def bench_size(price_array: np.ndarray, volume_array: np.ndarray, repeat: int) -> tuple[float, float, float, float]:
+    """Return the duration of the pure-Python and NumPy analyses of one series (ms)."""
+    prices, volumes = price_array.tolist(), volume_array.tolist()
+    dataset = datasets.get(datasets.put(price_array, volume_array))
+    check_equal(python_statistics(prices, volumes), compute_statistics(dataset.prices, dataset.volumes))
+
+    def from_list() -> dict:
+        # Prices passed as tool arguments are converted from lists; a dataset ID skips the conversion
+        return compute_statistics(np.asarray(prices, dtype=np.float64), np.asarray(volumes, dtype=np.float64))
+
+    return (
+        best_ms(lambda: python_summary(prices, volumes), repeat),
+        best_ms(lambda: python_statistics(prices, volumes), repeat),
+        best_ms(from_list, repeat),
+        best_ms(lambda: compute_statistics(dataset.prices, dataset.volumes), repeat),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat} runs (ms)")
+    header = (
+        f"{'points':>10} | {'py summary':>10} | {'py full':>9} | {'np (list)':>9} | "
+        f"{'np (dataset)':>12} | {'vs summary':>10} | {'vs full':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        price_array, volume_array = synthetic_series(size)
+        summary, full, from_list, from_dataset = bench_size(price_array, volume_array, args.repeat)
+        print(
+            f"{size:>10,} | {summary:>10.2f} | {full:>9.2f} | {from_list:>9.2f} | {from_dataset:>12.2f} | "
+            f"{summary / from_dataset:>9.1f}x | {full / from_dataset:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark the streaming report builder against string concatenation on large analysis results.
+
+Usage:
+    # 1千・10万・100万指標のレポート生成時間・最初の行までの時間・ピークメモリを比較
+    uv run python -m strands_agents_hands_on.examples.05_tools.benchmark_stock_report
+
+    # 指標数と企業数を変更
+    uv run python -m strands_agents_hands_on.examples.05_tools.benchmark_stock_report --sizes 10000 --companies 10
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
+from .stock_report import format_metric, iter_chunks, iter_comparison_report, iter_stock_report, write_report
+
+
+def concat_report(analysis_data: Mapping[str, Any], company_info: Mapping[str, Any] | None = None) -> str:
+    """Build the report like the original format_stock_report, with repeated ``+=``."""
+    report = "# 株価分析レポート\n\n"
+
+    if company_info:
+        report += "## 企業情報\n\n"
+        for key, value in company_info.items():
+            report += f"- **{key}**: {value}\n"
+        report += "\n"
+
+    report += "## 分析結果\n\n"
+    report += "| 指標 | 値 |\n"
+    report += "|------|------|\n"
+
+    for key, value in analysis_data.items():
+        label, formatted = format_metric(key, value)
+        report += f"| {label} | {formatted} |\n"
+
+    return report
+
+
+def synthetic_analysis(size: int, seed: int = 1) -> dict[str, float]:
+    """Return an analysis result with ``size`` metrics."""
+    return {f"metric_{index}": index * seed / 7 for index in range(size)}
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float]:
+    """Return the duration (ms) and peak traced memory (MB) of ``func``; the two are measured in separate runs."""
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def first_chunk_ms(lines: Callable[[], Iterator[str]]) -> float:
+    """Return the time until the first chunk of a streamed report is available (ms)."""
+    start = time.perf_counter()
+    next(iter_chunks(lines()))
+    return (time.perf_counter() - start) * 1000
+
+
+def bench(label: str, build: Callable[[], Any], lines: Callable[[], Iterator[str]]) -> None:
+    """Print the cost of building a report in one string and of streaming it to a file."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:  # noqa: PTH123
+        built_ms, built_mb = measure(build)
+        joined_ms, joined_mb = measure(lambda: "".join(lines()))
+        streamed_ms, streamed_mb = measure(lambda: write_report(lines(), devnull))
+    first = first_chunk_ms(lines)
+    print(
+        f"{label:>18} | {built_ms:>9.1f} {built_mb:>7.1f} | {joined_ms:>9.1f} {joined_mb:>7.1f} | "
+        f"{streamed_ms:>9.1f} {streamed_mb:>7.2f} | {first:>8.3f} | {built_ms / first:>8.0f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--companies", type=int, default=5)
+    args = parser.parse_args()
+
+    print("ms / peak MB per report; streaming writes to os.devnull")
+    header = (
+        f"{'report':>18} | {'+= (ms)':>9} {'(MB)':>7} | {'join (ms)':>9} {'(MB)':>7} | "
+        f"{'stream':>9} {'(MB)':>7} | {'1st (ms)':>8} | {'latency':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        analysis = synthetic_analysis(size)
+        bench(f"{size:,} metrics", lambda: concat_report(analysis), lambda: iter_stock_report(analysis))  # noqa: B023
+
+    # The original tool has no multi-company layout, so the baseline concatenates the comparison rows
+    size = args.sizes[-1] // args.companies
+    analyses = {f"企業{seed}": synthetic_analysis(size, seed) for seed in range(1, args.companies + 1)}
+
+    def concat_comparison() -> str:
+        report = ""
+        for line in iter_comparison_report(analyses):
+            report += line
+        return report
+
+    bench(f"{args.companies}x{size:,}", concat_comparison, lambda: iter_comparison_report(analyses))
+
+
+if __name__ == "__main__":
+    main()
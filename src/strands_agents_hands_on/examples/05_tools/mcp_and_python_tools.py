@@ -1,70 +1,12 @@
 """uv run python -m strands_agents_hands_on.examples.05_tools.mcp_and_python_tools"""
 
 from mcp import StdioServerParameters, stdio_client
-from strands import Agent, tool
+from strands import Agent
 from strands.tools.mcp import MCPClient
 
-
-@tool
-def analyze_stock_data(prices: list[float], volumes: list[int] | None = None) -> dict:
-    """株価データを分析して統計情報を返すツール。
-
-    Args:
-        prices: 株価のリスト
-        volumes: 取引量のリスト (オプション)
-
-    Returns:
-        株価の統計情報を含む辞書
-
-    """
-    if not prices:
-        return {"error": "データがありません"}
-
-    result = {
-        "データ数": len(prices),
-        "最高値": f"${max(prices):.2f}",
-        "最安値": f"${min(prices):.2f}",
-        "平均株価": f"${sum(prices) / len(prices):.2f}",
-        "価格変動幅": f"${max(prices) - min(prices):.2f}",
-        "変動率": f"{((max(prices) - min(prices)) / min(prices) * 100):.2f}%",
-    }
-
-    if volumes:
-        result["平均取引量"] = f"{sum(volumes) / len(volumes):,.0f}"
-        result["総取引量"] = f"{sum(volumes):,}"
-
-    return result
-
-
-@tool()
-def format_stock_report(analysis_data: dict, company_info: dict | None = None) -> str:
-    """株価分析結果をMarkdown形式のレポートとして整形するツール。
-
-    Args:
-        analysis_data: 株価分析データの辞書
-        company_info: 企業情報の辞書 (オプション)
-
-    Returns:
-        Markdown形式のレポート文字列
-
-    """
-    report = "# 株価分析レポート\n\n"
-
-    if company_info:
-        report += "## 企業情報\n\n"
-        for key, value in company_info.items():
-            report += f"- **{key}**: {value}\n"
-        report += "\n"
-
-    report += "## 分析結果\n\n"
-    report += "| 指標 | 値 |\n"
-    report += "|------|------|\n"
-
-    for key, value in analysis_data.items():
-        report += f"| {key} | {value} |\n"
-
-    return report
-
+from .stock_analytics import analyze_stock_data, load_daily_prices
+from .stock_report import format_stock_report, stream_stock_report
+from .tool_memoization import ToolMemoizer
 
 # Fetch MCP Serverへの接続設定
 fetch_mcp_client = MCPClient(
@@ -80,21 +22,30 @@ fetch_mcp_client = MCPClient(
 with fetch_mcp_client:
     mcp_tools = fetch_mcp_client.list_tools_sync()
 
-    agent = Agent(tools=[analyze_stock_data, format_stock_report, *mcp_tools])
+    # Python ツールは入力が同じなら結果を再利用し、MCP の fetch は同じ URL を5分間キャッシュする
+    memoizer = ToolMemoizer({"fetch": 300})
+    agent = Agent(
+        tools=[load_daily_prices, analyze_stock_data, format_stock_report, stream_stock_report, *mcp_tools],
+        hooks=[memoizer],
+    )
 
     result = agent(
         """
 以下のタスクを実行してください:
 
-1. Alpha Vantage APIから株価データを取得
+1. Alpha Vantage APIから株価データを読み込み
    URL: https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=IBM&apikey=demo
 
-2. 取得したJSONデータから直近10日分の終値を抽出
+2. 読み込んだデータセットを分析 (株価の値はデータセットIDで渡す)
 
-3. 抽出した株価データを分析
+3. Alpha Vantage APIから企業情報を取得し、社名・業種・時価総額を抽出
+   URL: https://www.alphavantage.co/query?function=OVERVIEW&symbol=IBM&apikey=demo
 
-4. 分析結果をMarkdown形式のレポートとして整形して表示
+4. 分析結果と企業情報をMarkdown形式のレポートとして整形して表示
 
 エージェントは利用可能なツールを自動的に判断して使用してください。
 """
     )
+
+    for name, stats in memoizer.stats.items():
+        print(f"{name}: キャッシュヒット {stats.hits}, ミス {stats.misses}")
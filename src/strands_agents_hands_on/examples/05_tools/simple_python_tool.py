@@ -2,7 +2,10 @@
 
 from strands import Agent, tool
 
+from .tool_memoization import ToolMemoizer, memoize
 
+
+@memoize()
 @tool
 def calculator(x: float, y: float, operation: str) -> float:
     """数値計算を実行するツール。
@@ -34,6 +37,7 @@ def calculator(x: float, y: float, operation: str) -> float:
     raise ValueError(msg)
 
 
+@memoize()
 @tool
 def temperature_converter(value: float, from_unit: str, to_unit: str) -> float:
     """温度単位を変換するツール。
@@ -67,7 +71,9 @@ def temperature_converter(value: float, from_unit: str, to_unit: str) -> float:
     raise ValueError(msg)
 
 
-agent = Agent(tools=[calculator, temperature_converter])
+# 純粋関数のツールは同じ入力なら結果を再利用する
+memoizer = ToolMemoizer()
+agent = Agent(tools=[calculator, temperature_converter], hooks=[memoizer])
 
 print("=== 計算ツールの使用 ===")
 result1 = agent("125掛ける37はいくつ")
@@ -77,3 +83,6 @@ result2 = agent("摂氏25度は華氏で何度")
 
 print("=== 複数のツールを組み合わせた使用 ===")
 result3 = agent("摂氏20度と30度の平均を華氏で教えて")
+
+for name, stats in memoizer.stats.items():
+    print(f"{name}: キャッシュヒット {stats.hits}, ミス {stats.misses}")
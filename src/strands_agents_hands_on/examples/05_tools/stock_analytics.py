@@ -0,0 +1,263 @@
+"""Vectorized stock analytics tools: statistics over price/volume arrays or already-loaded datasets.
+
+Usage:
+    # 疑似データを登録し、データセットIDで分析
+    uv run python -m strands_agents_hands_on.examples.05_tools.stock_analytics
+"""
+
+import hashlib
+import json
+import math
+import threading
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from strands import tool
+
+from .tool_memoization import memoize
+
+# Trading days per year, used to annualize volatility
+TRADING_DAYS = 252
+# Statistics computed from daily returns and drawdowns
+RETURN_KEYS = (
+    "mean_return_pct",
+    "volatility_pct",
+    "annualized_volatility_pct",
+    "best_return_pct",
+    "worst_return_pct",
+    "max_drawdown_pct",
+)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """A price series and its optional volumes.
+
+    Attributes:
+        prices: Prices in chronological order (read-only float64 array)
+        volumes: Volumes aligned with ``prices`` (read-only float64 array), or None
+        dates: Dates of the points, if known
+
+    """
+
+    prices: np.ndarray
+    volumes: np.ndarray | None = None
+    dates: tuple[str, ...] = ()
+
+
+class DatasetStore:
+    """In-process store of price series, so tools can pass data by ID instead of through the model.
+
+    The least recently used datasets are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        """Initialize an empty store.
+
+        Args:
+            max_entries: Maximum number of stored datasets
+
+        """
+        self.max_entries = max_entries
+        self._datasets: OrderedDict[str, Dataset] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, prices: Any, volumes: Any = None, dates: tuple[str, ...] = ()) -> str:
+        """Store a series and return its ID (derived from its content and dates, so the same data gets the same ID)."""
+        price_array = _readonly(prices)
+        volume_array = _readonly(volumes) if volumes is not None else None
+        if volume_array is not None and volume_array.shape != price_array.shape:
+            msg = f"volumes has {volume_array.size} points but prices has {price_array.size}"
+            raise ValueError(msg)
+
+        digest = hashlib.sha256(price_array.tobytes())
+        if volume_array is not None:
+            digest.update(volume_array.tobytes())
+        if dates:
+            digest.update(json.dumps(dates).encode())
+        dataset_id = f"ds-{digest.hexdigest()[:12]}"
+        with self._lock:
+            self._datasets[dataset_id] = Dataset(price_array, volume_array, tuple(dates))
+            self._datasets.move_to_end(dataset_id)
+            while len(self._datasets) > self.max_entries:
+                self._datasets.popitem(last=False)
+        return dataset_id
+
+    def get(self, dataset_id: str) -> Dataset:
+        """Return a stored series.
+
+        Raises:
+            KeyError: If no dataset has this ID (or it was dropped)
+
+        """
+        with self._lock:
+            dataset = self._datasets.get(dataset_id)
+            if dataset is not None:
+                self._datasets.move_to_end(dataset_id)
+        if dataset is None:
+            msg = f"Unknown dataset: {dataset_id}"
+            raise KeyError(msg)
+        return dataset
+
+
+def _readonly(values: Any) -> np.ndarray:
+    array = np.ascontiguousarray(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+# Store shared by the tools of this module
+datasets = DatasetStore()
+
+
+def _moving_average(prices: np.ndarray, window: int) -> float | None:
+    """Return the simple moving average of the last ``window`` points (None if the series is shorter)."""
+    if window <= 0 or prices.size < window:
+        return None
+    return float(prices[-window:].mean())
+
+
+def compute_statistics(
+    prices: np.ndarray, volumes: np.ndarray | None = None, windows: tuple[int, ...] = (20, 50)
+) -> dict:
+    """Compute price, return, risk and volume statistics of a series with vectorized NumPy operations.
+
+    Each intermediate array (returns, running maximum) is computed once and reused,
+    so the cost is a few passes over the data regardless of the number of statistics.
+
+    Args:
+        prices: Prices in chronological order
+        volumes: Volumes aligned with ``prices``
+        windows: Windows of the simple moving averages to report
+
+    Returns:
+        Dictionary of numeric statistics (floats and ints, None when undefined)
+
+    """
+    count = int(prices.size)
+    high, low = float(prices.max()), float(prices.min())
+    first, last = float(prices[0]), float(prices[-1])
+    stats: dict[str, Any] = {
+        "count": count,
+        "first": first,
+        "last": last,
+        "high": high,
+        "low": low,
+        "mean": float(prices.mean()),
+        "range": high - low,
+        "range_pct": (high - low) / low * 100 if low else None,
+        "total_return_pct": (last / first - 1) * 100 if first else None,
+    }
+
+    # Returns and drawdowns divide by earlier prices, so they are undefined once a price is not positive
+    if count > 1 and low <= 0:
+        stats |= dict.fromkeys(RETURN_KEYS, None)
+    elif count > 1:
+        returns = np.diff(prices) / prices[:-1]
+        daily_volatility = float(returns.std(ddof=1)) if count > 2 else 0.0  # noqa: PLR2004
+        drawdowns = prices / np.maximum.accumulate(prices) - 1
+        stats |= {
+            "mean_return_pct": float(returns.mean()) * 100,
+            "volatility_pct": daily_volatility * 100,
+            "annualized_volatility_pct": daily_volatility * math.sqrt(TRADING_DAYS) * 100,
+            "best_return_pct": float(returns.max()) * 100,
+            "worst_return_pct": float(returns.min()) * 100,
+            "max_drawdown_pct": float(drawdowns.min()) * 100,
+        }
+
+    for window in windows:
+        stats[f"sma_{window}"] = _moving_average(prices, window)
+
+    if volumes is not None:
+        total_volume = float(volumes.sum())
+        stats |= {
+            "total_volume": total_volume,
+            "mean_volume": total_volume / count,
+            "vwap": float(prices @ volumes) / total_volume if total_volume else None,
+        }
+    return stats
+
+
+# Datasets are addressed by content, so a dataset ID always refers to the same data
+@memoize()
+@tool
+def analyze_stock_data(
+    prices: list[float] | None = None,
+    volumes: list[float] | None = None,
+    dataset_id: str | None = None,
+    windows: list[int] | None = None,
+) -> dict:
+    """株価データを分析して統計情報を数値で返すツール。
+
+    価格リストを直接渡すか、load_daily_prices で読み込んだデータセットのIDを指定する。
+    結果は数値のまま返すので、表示用の整形は format_stock_report で行う。
+
+    Args:
+        prices: 株価のリスト (古い順)
+        volumes: 取引量のリスト (オプション)
+        dataset_id: 読み込み済みデータセットのID (prices の代わりに指定)
+        windows: 移動平均の期間のリスト (デフォルトは 20 と 50)
+
+    Returns:
+        件数、高値・安値・平均、リターン、ボラティリティ、最大ドローダウン、移動平均、VWAP などの統計情報
+
+    """
+    if dataset_id is not None:
+        try:
+            dataset = datasets.get(dataset_id)
+        except KeyError:
+            return {"error": f"データセット {dataset_id} が見つかりません。load_daily_prices で読み込み直してください"}
+        price_array, volume_array = dataset.prices, dataset.volumes
+    elif prices:
+        price_array = np.asarray(prices, dtype=np.float64)
+        volume_array = np.asarray(volumes, dtype=np.float64) if volumes else None
+    else:
+        return {"error": "データがありません"}
+
+    if volume_array is not None and volume_array.shape != price_array.shape:
+        return {"error": f"取引量の件数 ({volume_array.size}) が株価の件数 ({price_array.size}) と一致しません"}
+    return compute_statistics(price_array, volume_array, tuple(windows or (20, 50)))
+
+
+@memoize(ttl=300)
+@tool
+def load_daily_prices(url: str) -> dict:
+    """Alpha Vantage の TIME_SERIES_DAILY API から株価を取得し、データセットとして登録するツール。
+
+    データはモデルのコンテキストを経由せずに保持され、analyze_stock_data に dataset_id で渡せる。
+
+    Args:
+        url: TIME_SERIES_DAILY API の URL
+
+    Returns:
+        データセットID、件数、期間
+
+    """
+    if not url.startswith("https://"):
+        return {"error": "https の URL を指定してください"}
+    with urllib.request.urlopen(url, timeout=30) as response:  # noqa: S310
+        payload = json.load(response)
+
+    series = payload.get("Time Series (Daily)")
+    if not series:
+        return {"error": f"時系列データが見つかりません: {list(payload)}"}
+    dates = sorted(series)
+    prices = [float(series[date]["4. close"]) for date in dates]
+    volumes = [float(series[date]["5. volume"]) for date in dates]
+    dataset_id = datasets.put(prices, volumes, tuple(dates))
+    return {"dataset_id": dataset_id, "count": len(dates), "start": dates[0], "end": dates[-1]}
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 1_000)))
+    volumes = rng.integers(1_000_000, 5_000_000, prices.size)
+    dataset_id = datasets.put(prices, volumes)
+
+    result = analyze_stock_data(dataset_id=dataset_id)
+    print(f"=== {dataset_id} ===")
+    for name, value in result.items():
+        print(f"  {name}: {value}")
@@ -0,0 +1,246 @@
+"""Stream Markdown stock reports row by row, for single companies and multi-company comparisons.
+
+Usage:
+    # スタブモデルで大きな分析結果の比較レポートをストリーミングし、チャンクの到着を確認
+    uv run python -m strands_agents_hands_on.examples.05_tools.stock_report
+
+    # 指標数と企業数を変更
+    uv run python -m strands_agents_hands_on.examples.05_tools.stock_report --metrics 100000 --companies 5
+"""
+
+import argparse
+import time
+from collections.abc import AsyncGenerator, Iterable, Iterator, Mapping
+from typing import Any, TextIO
+
+from strands import Agent, tool
+from strands.types.tools import ToolUse
+
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+from .tool_memoization import memoize
+
+# Label and format of the statistics returned by analyze_stock_data
+METRIC_FORMATS: dict[str, tuple[str, str]] = {
+    "count": ("データ数", "{:,}"),
+    "first": ("期間初日の終値", "${:,.2f}"),
+    "last": ("期間最終日の終値", "${:,.2f}"),
+    "high": ("最高値", "${:,.2f}"),
+    "low": ("最安値", "${:,.2f}"),
+    "mean": ("平均株価", "${:,.2f}"),
+    "range": ("価格変動幅", "${:,.2f}"),
+    "range_pct": ("変動率", "{:.2f}%"),
+    "total_return_pct": ("期間リターン", "{:+.2f}%"),
+    "mean_return_pct": ("平均日次リターン", "{:+.3f}%"),
+    "volatility_pct": ("日次ボラティリティ", "{:.2f}%"),
+    "annualized_volatility_pct": ("年率ボラティリティ", "{:.2f}%"),
+    "best_return_pct": ("日次最大上昇率", "{:+.2f}%"),
+    "worst_return_pct": ("日次最大下落率", "{:+.2f}%"),
+    "max_drawdown_pct": ("最大ドローダウン", "{:.2f}%"),
+    "total_volume": ("総取引量", "{:,.0f}"),
+    "mean_volume": ("平均取引量", "{:,.0f}"),
+    "vwap": ("VWAP", "${:,.2f}"),
+}
+
+# Rows of a streamed report sent per tool stream event
+DEFAULT_ROWS_PER_CHUNK = 100
+
+
+def _cell(text: str) -> str:
+    """Escape a Markdown table cell."""
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def format_metric(key: str, value: object) -> tuple[str, str]:
+    """Return the display label and formatted value of a statistic."""
+    if key.startswith("sma_"):
+        label, fmt = f"{key.removeprefix('sma_')}日移動平均", "${:,.2f}"
+    else:
+        label, fmt = METRIC_FORMATS.get(key, (key, "{}"))
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return label, "-" if value is None else str(value)
+    return label, fmt.format(value)
+
+
+def _iter_company_info(company_info: Mapping[str, Any]) -> Iterator[str]:
+    for key, value in company_info.items():
+        yield f"- **{key}**: {value}\n"
+    yield "\n"
+
+
+def iter_stock_report(analysis_data: Mapping[str, Any], company_info: Mapping[str, Any] | None = None) -> Iterator[str]:
+    """Yield the Markdown report of one company, one line (table row) at a time.
+
+    Args:
+        analysis_data: Statistics returned by analyze_stock_data
+        company_info: Company information to list above the table
+
+    Yields:
+        Lines of the report, each ending with a newline
+
+    """
+    yield "# 株価分析レポート\n\n"
+    if company_info:
+        yield "## 企業情報\n\n"
+        yield from _iter_company_info(company_info)
+
+    yield "## 分析結果\n\n"
+    yield "| 指標 | 値 |\n"
+    yield "|------|------|\n"
+    for key, value in analysis_data.items():
+        label, formatted = format_metric(key, value)
+        yield f"| {_cell(label)} | {_cell(formatted)} |\n"
+
+
+def iter_comparison_report(
+    analyses: Mapping[str, Mapping[str, Any]], company_info: Mapping[str, Mapping[str, Any]] | None = None
+) -> Iterator[str]:
+    """Yield a Markdown report comparing several companies, with one column per company.
+
+    Metrics are listed in the order they first appear; a company missing a metric shows "-".
+
+    Args:
+        analyses: Statistics returned by analyze_stock_data, by company name
+        company_info: Company information, by company name
+
+    Yields:
+        Lines of the report, each ending with a newline
+
+    """
+    yield "# 株価比較レポート\n\n"
+    for name, info in (company_info or {}).items():
+        yield f"## {name}\n\n"
+        yield from _iter_company_info(info)
+
+    names = list(analyses)
+    yield "## 分析結果\n\n"
+    yield "| 指標 | " + " | ".join(_cell(name) for name in names) + " |\n"
+    yield "|------|" + "------|" * len(names) + "\n"
+    # Rows are yielded as their metric is first seen, so the first row does not wait for the key union
+    seen: set[str] = set()
+    for analysis in analyses.values():
+        for key in analysis:
+            if key in seen:
+                continue
+            seen.add(key)
+            label = ""
+            cells = []
+            for other in analyses.values():
+                label, formatted = format_metric(key, other.get(key))
+                cells.append(_cell(formatted))
+            yield f"| {_cell(label)} | " + " | ".join(cells) + " |\n"
+
+
+def iter_chunks(lines: Iterable[str], rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK) -> Iterator[str]:
+    """Group report lines into chunks of ``rows_per_chunk`` lines."""
+    batch: list[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= rows_per_chunk:
+            yield "".join(batch)
+            batch.clear()
+    if batch:
+        yield "".join(batch)
+
+
+def write_report(lines: Iterable[str], fp: TextIO, rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK) -> int:
+    """Write a report to a file as it is generated, without holding it in memory; return the characters written."""
+    written = 0
+    for chunk in iter_chunks(lines, rows_per_chunk):
+        written += fp.write(chunk)
+    return written
+
+
+@memoize()
+@tool
+def format_stock_report(analysis_data: dict, company_info: dict | None = None) -> str:
+    """株価分析結果をMarkdown形式のレポートとして整形するツール。
+
+    Args:
+        analysis_data: analyze_stock_data が返す統計情報の辞書
+        company_info: 企業情報の辞書 (オプション)
+
+    Returns:
+        Markdown形式のレポート文字列
+
+    """
+    return "".join(iter_stock_report(analysis_data, company_info))
+
+
+# Not memoized: a cached result would replay only the final report, without the chunk events
+@tool
+async def stream_stock_report(
+    analyses: dict[str, dict],
+    company_info: dict[str, dict] | None = None,
+    rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK,
+) -> AsyncGenerator[Any, None]:
+    """複数企業の株価分析結果をMarkdown形式の比較レポートとして整形するツール。
+
+    レポートは生成された行から順にエージェントのストリームへ送られる。
+    大きな分析結果や多数の企業を扱う場合はこちらを使う。
+
+    Args:
+        analyses: 企業名をキー、analyze_stock_data が返す統計情報を値とする辞書
+        company_info: 企業名をキー、企業情報を値とする辞書 (オプション)
+        rows_per_chunk: 1回に送る行数
+
+    Returns:
+        Markdown形式のレポート文字列
+
+    """
+    if len(analyses) == 1:
+        name, analysis = next(iter(analyses.items()))
+        lines = iter_stock_report(analysis, (company_info or {}).get(name))
+    else:
+        lines = iter_comparison_report(analyses, company_info)
+
+    chunks: list[str] = []
+    for chunk in iter_chunks(lines, max(1, rows_per_chunk)):
+        chunks.append(chunk)
+        # Each yield reaches the callback handler and stream_async as a tool_stream_event
+        yield {"report_chunk": chunk, "chunk_index": len(chunks) - 1}
+    # The last value yielded is the tool result
+    yield "".join(chunks)
+
+
+def _call(call_id: str, name: str, tool_input: dict[str, Any]) -> list[str | ToolUse]:
+    return [{"toolUseId": call_id, "name": name, "input": tool_input}]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metrics", type=int, default=10_000)
+    parser.add_argument("--companies", type=int, default=3)
+    args = parser.parse_args()
+
+    # 指標数の多い分析結果を模擬する
+    analyses = {
+        f"企業{company + 1}": {f"metric_{index}": index * (company + 1) / 7 for index in range(args.metrics)}
+        for company in range(args.companies)
+    }
+    script = [
+        _call("t-1", "stream_stock_report", {"analyses": analyses, "rows_per_chunk": 1_000}),
+        "比較レポートを作成しました",
+    ]
+
+    start = time.perf_counter()
+    arrivals: list[tuple[float, int]] = []
+
+    def on_event(**kwargs: Any) -> None:
+        # The final result is also streamed, as a plain string
+        data = kwargs.get("tool_stream_event", {}).get("data")
+        if isinstance(data, dict) and "report_chunk" in data:
+            arrivals.append((time.perf_counter() - start, len(data["report_chunk"])))
+
+    agent = Agent(model=StubModel(script), tools=[stream_stock_report], callback_handler=on_event)
+    response = agent("企業の比較レポートを作成して")
+    elapsed = time.perf_counter() - start
+
+    print(f"=== {args.companies}社 x {args.metrics:,}指標 ===")
+    print(f"チャンク数: {len(arrivals)}, 合計 {sum(size for _, size in arrivals):,}文字")
+    print(f"最初のチャンクまで: {arrivals[0][0] * 1000:.1f}ms, 最後のチャンクまで: {arrivals[-1][0] * 1000:.1f}ms")
+    print(f"全体: {elapsed * 1000:.1f}ms\n\n{response}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Memoize results of pure tools (and, with a TTL, of impure ones) through the hook system.
+
+Usage:
+    # スタブモデルで同じ引数のツール呼び出しを繰り返し、2回目以降がキャッシュから返ることを確認
+    uv run python -m strands_agents_hands_on.examples.05_tools.tool_memoization
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, cast
+
+from strands import Agent, tool
+from strands.hooks import AfterToolCallEvent, BeforeToolCallEvent, HookProvider, HookRegistry
+from strands.types._events import ToolResultEvent
+from strands.types.tools import AgentTool, ToolGenerator, ToolResult, ToolSpec, ToolUse
+
+from strands_agents_hands_on.examples.response_cache import request_key
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+logger = logging.getLogger(__name__)
+
+# Attribute set by ``memoize`` on the tools that opt in
+MEMOIZE_ATTR = "memoize_policy"
+
+
+@dataclass(frozen=True)
+class MemoizePolicy:
+    """How long the results of a tool are reused.
+
+    Attributes:
+        ttl: Seconds a result stays valid (None for pure tools, whose results never expire)
+
+    """
+
+    ttl: float | None = None
+
+
+def memoize[A: AgentTool](ttl: float | None = None) -> Callable[[A], A]:
+    """Mark a tool for memoization by ToolMemoizer; apply it above ``@tool``.
+
+    Args:
+        ttl: Seconds a result stays valid (None for pure tools)
+
+    Returns:
+        Decorator returning the same tool, marked
+
+    """
+
+    def decorator(agent_tool: A) -> A:
+        setattr(agent_tool, MEMOIZE_ATTR, MemoizePolicy(ttl))
+        return agent_tool
+
+    return decorator
+
+
+@dataclass
+class ToolCacheStats:
+    """Counters of the memoized calls of one tool.
+
+    Attributes:
+        hits: Calls answered from the cache
+        misses: Calls executed because no valid result was cached
+        expired: Misses caused by an expired result
+        evictions: Results dropped because the cache was full
+        saved_seconds: Execution time of the original calls replayed by hits
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of calls answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    tool_name: str
+    result: ToolResult
+    expires_at: float | None
+    elapsed: float
+
+
+class CachedToolResult(AgentTool):
+    """Stand-in tool replaying a cached result, selected by ToolMemoizer on a hit.
+
+    Other hooks can tell a replayed call from an executed one with
+    ``isinstance(event.selected_tool, CachedToolResult)``.
+    """
+
+    def __init__(self, original: AgentTool, result: ToolResult) -> None:
+        """Initialize the stand-in with the tool it replaces and the result to replay."""
+        super().__init__()
+        self.original = original
+        self.result = result
+
+    @property
+    def tool_name(self) -> str:
+        return self.original.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self.original.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self.original.tool_type
+
+    async def stream(self, tool_use: ToolUse, invocation_state: dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        yield ToolResultEvent({**copy.deepcopy(self.result), "toolUseId": tool_use["toolUseId"]})
+
+
+class ToolMemoizer(HookProvider):
+    """Bounded LRU cache of tool results keyed on the tool name and canonicalized input.
+
+    Tools opt in with the ``memoize`` decorator, or by name in ``tools`` for tools
+    that cannot be decorated (MCP tools). On a hit, BeforeToolCallEvent swaps the
+    tool for a CachedToolResult, so the tool does not run; on a miss, the result is
+    stored from AfterToolCallEvent. Only successful results are cached, and inputs
+    are compared as canonical JSON, so the key order of the model's arguments does
+    not matter. Per-tool counters are in ``stats``.
+    """
+
+    def __init__(self, tools: Mapping[str, float | None] | None = None, max_entries: int = 256) -> None:
+        """Initialize the memoizer.
+
+        Args:
+            tools: Names of additional tools to memoize, with the TTL of their results (None for no expiry)
+            max_entries: Maximum number of cached results over all tools
+
+        """
+        self.policies = {name: MemoizePolicy(ttl) for name, ttl in (tools or {}).items()}
+        self.max_entries = max_entries
+        self.stats: dict[str, ToolCacheStats] = {}
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Cache key, TTL and start time of the calls being executed, by tool use ID
+        self._pending: dict[str, tuple[str, float | None, float]] = {}
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeToolCallEvent, self._before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self._after_tool_call)
+
+    def _policy(self, tool_name: str, selected_tool: AgentTool) -> MemoizePolicy | None:
+        return self.policies.get(tool_name) or getattr(selected_tool, MEMOIZE_ATTR, None)
+
+    def _before_tool_call(self, event: BeforeToolCallEvent) -> None:
+        selected_tool = event.selected_tool
+        if selected_tool is None:
+            return
+        tool_name = event.tool_use["name"]
+        policy = self._policy(tool_name, selected_tool)
+        if policy is None:
+            return
+
+        try:
+            key = request_key(tool_name, event.tool_use["input"])
+        except TypeError as e:
+            logger.debug("tool_name=<%s> | tool input cannot be cached: %s", tool_name, e)
+            return
+        now = time.monotonic()
+        with self._lock:
+            stats = self.stats.setdefault(tool_name, ToolCacheStats())
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+                del self._entries[key]
+                stats.expired += 1
+                entry = None
+            if entry is None:
+                stats.misses += 1
+                self._pending[event.tool_use["toolUseId"]] = (key, policy.ttl, time.perf_counter())
+                return
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            stats.saved_seconds += entry.elapsed
+
+        logger.debug("tool_name=<%s>, key=<%s> | replaying cached tool result", tool_name, key[:12])
+        event.selected_tool = CachedToolResult(selected_tool, entry.result)
+
+    def _after_tool_call(self, event: AfterToolCallEvent) -> None:
+        with self._lock:
+            pending = self._pending.pop(event.tool_use["toolUseId"], None)
+        if pending is None or event.exception is not None or event.result.get("status") != "success":
+            return
+
+        key, ttl, started_at = pending
+        now = time.perf_counter()
+        result = copy.deepcopy({name: value for name, value in event.result.items() if name != "toolUseId"})
+        entry = _Entry(
+            tool_name=event.tool_use["name"],
+            result=cast("ToolResult", result),
+            expires_at=time.monotonic() + ttl if ttl is not None else None,
+            elapsed=now - started_at,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.stats.setdefault(evicted.tool_name, ToolCacheStats()).evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+
+@memoize()
+@tool
+def multiply(x: float, y: float) -> float:
+    """2つの数値を掛け算するツール。
+
+    Args:
+        x: 第一オペランド
+        y: 第二オペランド
+
+    Returns:
+        計算結果
+
+    """
+    return x * y
+
+
+@tool
+def exchange_rate(currency: str) -> float:
+    """通貨の対円レートを取得するツール (外部APIの呼び出しを模擬)。
+
+    Args:
+        currency: 通貨コード (USD, EUR など)
+
+    Returns:
+        1通貨単位あたりの円
+
+    """
+    time.sleep(0.5)
+    return {"USD": 150.0, "EUR": 162.0}.get(currency.upper(), 1.0)
+
+
+def _call(call_id: str, name: str, tool_input: dict[str, Any]) -> list[str | ToolUse]:
+    return [{"toolUseId": call_id, "name": name, "input": tool_input}]
+
+
+if __name__ == "__main__":
+    # 引数の順序が違っても同じ入力として扱われる
+    script = [
+        _call("t-1", "exchange_rate", {"currency": "USD"}),
+        _call("t-2", "multiply", {"x": 125, "y": 37}),
+        "USDは150円、125掛ける37は4625です",
+        _call("t-3", "exchange_rate", {"currency": "USD"}),
+        _call("t-4", "multiply", {"y": 37, "x": 125}),
+        "同じ結果です",
+    ]
+    # MCP ツールのように decorate できないツールは名前と TTL (秒) で指定する
+    memoizer = ToolMemoizer({"exchange_rate": 300})
+    agent = Agent(model=StubModel(script), tools=[multiply, exchange_rate], hooks=[memoizer], callback_handler=None)
+
+    for prompt in ["USDのレートと125掛ける37を教えて", "もう一度教えて"]:
+        start = time.perf_counter()
+        response = agent(prompt)
+        print(f"=== {prompt} ({time.perf_counter() - start:.2f}s) ===\n{response}\n")
+
+    for name, stats in memoizer.stats.items():
+        print(
+            f"{name}: ヒット {stats.hits}, ミス {stats.misses} (ヒット率 {stats.hit_rate:.0%}), "
+            f"節約 {stats.saved_seconds:.2f}s"
+        )
@@ -0,0 +1,211 @@
+"""uv run python -m strands_agents_hands_on.examples.06_multi_agents.agent_pool"""
+
+import copy
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from strands import Agent
+from strands.agent.state import AgentState
+from strands.telemetry.metrics import EventLoopMetrics
+
+PoolKey = tuple[Hashable, ...]
+
+
+@dataclass
+class PoolStats:
+    """Counters of an AgentPool.
+
+    Attributes:
+        created: Agents constructed because no idle agent was available
+        reused: Checkouts served by an idle agent
+        returned: Agents handed back to the pool
+        discarded: Returned agents dropped because the pool was full or the caller asked for it
+        construction_seconds: Total time spent constructing agents
+
+    """
+
+    created: int = 0
+    reused: int = 0
+    returned: int = 0
+    discarded: int = 0
+    construction_seconds: float = 0.0
+
+    @property
+    def reuse_rate(self) -> float:
+        """Fraction of checkouts served by an idle agent."""
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+
+    @property
+    def mean_construction_ms(self) -> float:
+        """Average construction time of an agent in milliseconds."""
+        return self.construction_seconds / self.created * 1000 if self.created else 0.0
+
+
+@dataclass
+class _InitialState:
+    key: PoolKey
+    state: dict[str, Any]
+    conversation_manager_state: dict[str, Any]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn an Agent keyword argument into a hashable part of the pool key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list | tuple | set):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, Hashable):
+        return value
+    # Unhashable objects (for example a shared model instance) are keyed by identity
+    return ("id", id(value))
+
+
+class AgentPool:
+    """Pool of warm sub-agents keyed by system prompt and Agent configuration.
+
+    Constructing an Agent builds its model client, tool registry and hooks, which can
+    cost more than a short sub-agent call. ``checkout`` hands out an idle agent built
+    with the same ``system_prompt`` and keyword arguments, or constructs a new one, and
+    ``release`` resets its conversation (messages, state, conversation manager and
+    metrics) and keeps it for the next checkout.
+
+    A checked-out agent belongs to its caller alone, so the pool can be shared by
+    threads and coroutines. An agent that is never released is simply garbage collected. Agents
+    with a session manager are not pooled, because their conversation is persisted.
+    """
+
+    def __init__(self, max_idle_per_key: int = 8, agent_factory: Callable[..., Agent] = Agent) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_idle_per_key: Maximum number of idle agents kept for each configuration
+            agent_factory: Callable constructing an agent from Agent keyword arguments
+
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self.agent_factory = agent_factory
+        self.stats = PoolStats()
+        self._idle: defaultdict[PoolKey, deque[Agent]] = defaultdict(deque)
+        # Initial state of every agent constructed by the pool, dropped with the agent
+        self._initial: weakref.WeakKeyDictionary[Agent, _InitialState] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def checkout(self, system_prompt: str | None = None, **agent_kwargs: Any) -> Agent:
+        """Return an agent with an empty conversation for the given configuration."""
+        if agent_kwargs.get("session_manager") is not None:
+            msg = "agents with a session manager cannot be pooled"
+            raise ValueError(msg)
+
+        key = (system_prompt, _freeze(agent_kwargs))
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.stats.reused += 1
+                return idle.pop()
+
+        start = time.perf_counter()
+        agent = self.agent_factory(system_prompt=system_prompt, **agent_kwargs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats.created += 1
+            self.stats.construction_seconds += elapsed
+            self._initial[agent] = _InitialState(
+                key=key,
+                state=copy.deepcopy(agent.state.get()),
+                conversation_manager_state=agent.conversation_manager.get_state(),
+            )
+        return agent
+
+    def release(self, agent: Agent, *, discard: bool = False) -> None:
+        """Reset an agent returned by ``checkout`` and keep it for reuse.
+
+        Args:
+            agent: Agent obtained from ``checkout``
+            discard: Drop the agent instead, for example after a failed or cancelled call
+
+        """
+        with self._lock:
+            initial = self._initial.get(agent)
+        if initial is None:
+            msg = "agent was not checked out from this pool"
+            raise ValueError(msg)
+        if not discard:
+            self._reset(agent, initial)
+
+        with self._lock:
+            self.stats.returned += 1
+            idle = self._idle[initial.key]
+            if discard or len(idle) >= self.max_idle_per_key:
+                self.stats.discarded += 1
+                del self._initial[agent]
+            else:
+                idle.append(agent)
+
+    @staticmethod
+    def _reset(agent: Agent, initial: _InitialState) -> None:
+        agent.messages = []
+        agent.state = AgentState(copy.deepcopy(initial.state))
+        agent.conversation_manager.restore_from_session(initial.conversation_manager_state)
+        agent.event_loop_metrics = EventLoopMetrics()
+        agent.trace_span = None
+
+    @contextmanager
+    def acquire(self, system_prompt: str | None = None, **agent_kwargs: Any) -> Iterator[Agent]:
+        """Check an agent out for the duration of a ``with`` block.
+
+        The agent is discarded instead of reused if the block raises.
+        """
+        agent = self.checkout(system_prompt, **agent_kwargs)
+        try:
+            yield agent
+        except BaseException:
+            self.release(agent, discard=True)
+            raise
+        self.release(agent)
+
+    def factory(self, system_prompt: str | None = None, **agent_kwargs: Any) -> Callable[[], Agent]:
+        """Return a zero-argument factory checking out agents, for ParallelSubAgents."""
+        return lambda: self.checkout(system_prompt, **agent_kwargs)
+
+    def idle_count(self) -> int:
+        """Return the number of idle agents across all configurations."""
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def clear(self) -> None:
+        """Drop every idle agent."""
+        with self._lock:
+            for idle in self._idle.values():
+                for agent in idle:
+                    del self._initial[agent]
+            self._idle.clear()
+
+
+if __name__ == "__main__":
+    from .parallel_agents_as_tools import SPECIALIST_PROMPTS
+
+    pool = AgentPool()
+    requests = [
+        ("research_destination", "パタゴニアのハイキングシーズンを教えてください"),
+        ("recommend_product", "パタゴニア向けのハイキングブーツを推薦してください"),
+        ("research_destination", "パタゴニアで注意すべき天候は?"),
+    ]
+
+    print("=" * 80)
+    print("サブエージェントプールの実行")
+    print("=" * 80)
+
+    for specialist, request in requests:
+        with pool.acquire(system_prompt=SPECIALIST_PROMPTS[specialist], callback_handler=None) as agent:
+            print(f"\n## {specialist}: {request}\n{agent(request)}")
+
+    stats = pool.stats
+    print(f"\n生成数: {stats.created}, 再利用数: {stats.reused} (再利用率 {stats.reuse_rate:.0%})")
+    print(f"平均生成時間: {stats.mean_construction_ms:.1f}ms")
@@ -2,6 +2,11 @@
 
 from strands import Agent, tool
 
+from .agent_pool import AgentPool
+
+# サブエージェントを呼び出しごとに生成せず、会話をリセットして再利用する
+sub_agents = AgentPool()
+
 
 @tool
 def research_destination(query: str) -> str:
@@ -14,13 +19,13 @@ def research_destination(query: str) -> str:
         リサーチ結果
 
     """
-    research_agent = Agent(
+    with sub_agents.acquire(
         system_prompt="""
 あなたは旅行先のリサーチを専門とするアシスタントです。
 指定された場所について、気候、観光スポット、文化、注意事項などを調査して報告してください。
     """.strip(),
-    )
-    return str(research_agent(query))
+    ) as research_agent:
+        return str(research_agent(query))
 
 
 @tool
@@ -34,14 +39,14 @@ def recommend_product(requirements: str) -> str:
         商品推薦結果
 
     """
-    product_agent = Agent(
+    with sub_agents.acquire(
         system_prompt="""
 あなたは商品推薦を専門とするアシスタントです。
 ユーザーの要件に基づいて、最適な商品を推薦してください。
 具体的な商品名、特徴、価格帯、おすすめポイントを含めてください。
     """.strip(),
-    )
-    return str(product_agent(requirements))
+    ) as product_agent:
+        return str(product_agent(requirements))
 
 
 orchestrator = Agent(
@@ -57,3 +62,7 @@ print("Agents as Tools パターンの実行")
 print("=" * 80)
 
 result = orchestrator("パタゴニア旅行に適したハイキングブーツを探しています")
+
+stats = sub_agents.stats
+print(f"\nサブエージェント生成数: {stats.created}, 再利用数: {stats.reused}")
+print(f"平均生成時間: {stats.mean_construction_ms:.1f}ms")
@@ -0,0 +1,95 @@
+"""Benchmark short sub-agent calls with per-call Agent construction and with an AgentPool.
+
+Sub-agents answer with a stubbed model, but each construction builds a real Bedrock
+client (no request is sent), so the measured setup cost matches a default Agent.
+
+Usage:
+    # 8 スレッドから 200 回のサブエージェント呼び出しを行い、毎回生成する場合とプールを使う場合を比較
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.benchmark_agent_pool
+
+    # 呼び出し回数、並列数、モデルの疑似レイテンシを変更
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.benchmark_agent_pool \
+        --calls 500 --threads 16 --delay 0.05
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from strands import Agent
+from strands.models.bedrock import BedrockModel
+
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+from .agent_pool import AgentPool
+from .parallel_agents_as_tools import SPECIALIST_PROMPTS
+
+REGION = "us-east-1"
+
+
+def _agent_factory(delay: float) -> Callable[..., Agent]:
+    def build(**agent_kwargs: Any) -> Agent:
+        # Pay the client setup cost of a default Agent, then answer offline
+        BedrockModel(region_name=REGION)
+        return Agent(model=StubModel(delay=delay), **agent_kwargs)
+
+    return build
+
+
+def _run(calls: int, threads: int, call: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, range(calls)))
+    return time.perf_counter() - start
+
+
+def bench_per_call(calls: int, threads: int, delay: float) -> float:
+    """Construct a new sub-agent for every call, as agents_as_tools originally did."""
+    build = _agent_factory(delay)
+    prompts = list(SPECIALIST_PROMPTS.values())
+
+    def call(index: int) -> None:
+        agent = build(system_prompt=prompts[index % len(prompts)], callback_handler=None)
+        agent(f"依頼 {index}")
+
+    return _run(calls, threads, call)
+
+
+def bench_pooled(calls: int, threads: int, delay: float) -> tuple[float, AgentPool]:
+    """Check a warm sub-agent out of an AgentPool for every call."""
+    pool = AgentPool(max_idle_per_key=threads, agent_factory=_agent_factory(delay))
+    prompts = list(SPECIALIST_PROMPTS.values())
+
+    def call(index: int) -> None:
+        with pool.acquire(system_prompt=prompts[index % len(prompts)], callback_handler=None) as agent:
+            agent(f"依頼 {index}")
+
+    return _run(calls, threads, call), pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.02, help="emulated latency of every model call (seconds)")
+    args = parser.parse_args()
+
+    per_call = bench_per_call(args.calls, args.threads, args.delay)
+    pooled, pool = bench_pooled(args.calls, args.threads, args.delay)
+    stats = pool.stats
+
+    print(f"calls={args.calls} threads={args.threads} model delay={args.delay}s")
+    print(f"{'mode':>8} | {'total (s)':>9} | {'calls/s':>8}")
+    print("-" * 32)
+    print(f"{'per-call':>8} | {per_call:>9.2f} | {args.calls / per_call:>8.1f}")
+    print(f"{'pooled':>8} | {pooled:>9.2f} | {args.calls / pooled:>8.1f}")
+    print(
+        f"\npool: created={stats.created} reused={stats.reused} reuse_rate={stats.reuse_rate:.1%} "
+        f"mean_construction={stats.mean_construction_ms:.1f}ms speedup={per_call / pooled:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
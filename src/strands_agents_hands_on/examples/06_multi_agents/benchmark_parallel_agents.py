@@ -0,0 +1,96 @@
+"""Benchmark sequential and parallel agents-as-tools orchestration with a stubbed model.
+
+Usage:
+    # サブエージェント呼び出し数 2, 4, 8 で逐次実行と並列実行のレイテンシを比較
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.benchmark_parallel_agents
+
+    # モデルの疑似レイテンシと同時実行数の上限を変更
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.benchmark_parallel_agents \
+        --delay 0.5 --max-concurrency 2
+"""
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from strands import Agent, tool
+
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+from .parallel_agents_as_tools import SPECIALIST_PROMPTS, ParallelSubAgents, SpecialistTask
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from strands_agents_hands_on.examples.stub_model import Turn
+
+FAN_OUTS = (2, 4, 8)
+
+
+def _tasks(count: int) -> list[SpecialistTask]:
+    names = list(SPECIALIST_PROMPTS)
+    return [{"specialist": names[i % len(names)], "request": f"依頼 {i}"} for i in range(count)]
+
+
+def bench_sequential(tasks: list[SpecialistTask], delay: float) -> float:
+    """One tool call per model turn, each building and running its sub-agent, as in agents_as_tools."""
+
+    @tool
+    def ask_specialist(specialist: str, request: str) -> str:
+        """専門エージェントに依頼するツール。
+
+        Args:
+            specialist: 専門エージェント名
+            request: 依頼内容
+
+        Returns:
+            専門エージェントの回答
+
+        """
+        agent = Agent(model=StubModel(delay=delay), system_prompt=SPECIALIST_PROMPTS[specialist], callback_handler=None)
+        return str(agent(request))
+
+    script: list[Turn] = [
+        [{"toolUseId": f"call-{i}", "name": "ask_specialist", "input": dict(task)}] for i, task in enumerate(tasks)
+    ]
+    orchestrator = Agent(model=StubModel([*script, "完了"], delay=delay), tools=[ask_specialist], callback_handler=None)
+    start = time.perf_counter()
+    orchestrator("依頼をまとめて処理してください")
+    return time.perf_counter() - start
+
+
+def bench_parallel(tasks: list[SpecialistTask], delay: float, max_concurrency: int) -> float:
+    """Fan all tasks out concurrently from a single consult_specialists call."""
+    factories: dict[str, Callable[[], Agent]] = {
+        name: lambda prompt=prompt: Agent(model=StubModel(delay=delay), system_prompt=prompt, callback_handler=None)
+        for name, prompt in SPECIALIST_PROMPTS.items()
+    }
+    specialists = ParallelSubAgents(factories, max_concurrency=max_concurrency)
+    script: list[Turn] = [
+        [{"toolUseId": "call-0", "name": "consult_specialists", "input": {"tasks": tasks}}],
+        "完了",
+    ]
+    orchestrator = Agent(model=StubModel(script, delay=delay), tools=[specialists.as_tool()], callback_handler=None)
+    start = time.perf_counter()
+    orchestrator("依頼をまとめて処理してください")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.2, help="emulated latency of every model call (seconds)")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"model delay={args.delay}s max_concurrency={args.max_concurrency}")
+    print(f"{'sub-agents':>10} | {'sequential (s)':>14} | {'parallel (s)':>12} | {'speedup':>7}")
+    print("-" * 54)
+    for count in FAN_OUTS:
+        tasks = _tasks(count)
+        sequential = bench_sequential(tasks, args.delay)
+        parallel = bench_parallel(tasks, args.delay, args.max_concurrency)
+        print(f"{count:>10} | {sequential:>14.2f} | {parallel:>12.2f} | {sequential / parallel:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""uv run python -m strands_agents_hands_on.examples.06_multi_agents.parallel_agents_as_tools"""
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TypedDict
+
+from strands import Agent, tool
+from strands.types.tools import AgentTool
+
+from .agent_pool import AgentPool
+
+SPECIALIST_PROMPTS = {
+    "research_destination": """
+あなたは旅行先のリサーチを専門とするアシスタントです。
+指定された場所について、気候、観光スポット、文化、注意事項などを調査して報告してください。
+    """.strip(),
+    "recommend_product": """
+あなたは商品推薦を専門とするアシスタントです。
+ユーザーの要件に基づいて、最適な商品を推薦してください。
+具体的な商品名、特徴、価格帯、おすすめポイントを含めてください。
+    """.strip(),
+}
+
+
+class SpecialistTask(TypedDict):
+    """A request for one specialist sub-agent."""
+
+    specialist: str
+    request: str
+
+
+@dataclass
+class SubAgentResult:
+    """Outcome of one sub-agent call.
+
+    Attributes:
+        specialist: Name of the specialist that handled the request
+        request: Prompt sent to the sub-agent
+        output: Final response text (None if the call failed)
+        error: Error description if the call failed or timed out
+        elapsed: Wall time of the call in seconds
+
+    """
+
+    specialist: str
+    request: str
+    output: str | None = None
+    error: str | None = None
+    elapsed: float = 0.0
+
+
+class ParallelSubAgents:
+    """Run independent sub-agent calls concurrently and merge their results in order.
+
+    Each call gets its sub-agent from the specialist's factory and awaits
+    ``invoke_async``, so the calls share one event loop instead of running one after
+    another. At most ``max_concurrency`` calls run at once and each one is cancelled
+    after ``timeout`` seconds. A failing or timed-out call is reported in its result and
+    does not affect the others.
+
+    Passing ``AgentPool.factory`` factories and ``AgentPool.release`` as ``release``
+    reuses warm sub-agents instead of constructing one per call.
+    """
+
+    def __init__(
+        self,
+        factories: Mapping[str, Callable[[], Agent]],
+        max_concurrency: int = 4,
+        timeout: float | None = 120.0,
+        release: Callable[[Agent], None] | None = None,
+    ) -> None:
+        """Initialize the fan-out helper.
+
+        Args:
+            factories: Functions returning a sub-agent, keyed by specialist name
+            max_concurrency: Maximum number of sub-agents running at the same time
+            timeout: Seconds after which a sub-agent call is cancelled (None for no limit)
+            release: Called with each sub-agent after a successful call, for example to return it to a pool
+
+        """
+        self.factories = factories
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.release = release
+
+    async def run(self, tasks: Sequence[SpecialistTask]) -> list[SubAgentResult]:
+        """Run the tasks concurrently and return their results in the order of ``tasks``."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*(self._run_task(semaphore, task) for task in tasks))
+
+    async def _run_task(self, semaphore: asyncio.Semaphore, task: SpecialistTask) -> SubAgentResult:
+        result = SubAgentResult(specialist=task["specialist"], request=task["request"])
+        factory = self.factories.get(task["specialist"])
+        if factory is None:
+            result.error = f"unknown specialist: {task['specialist']}"
+            return result
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                agent = factory()
+                response = await asyncio.wait_for(agent.invoke_async(task["request"]), self.timeout)
+                result.output = str(response)
+                if self.release is not None:
+                    self.release(agent)
+            except TimeoutError:
+                result.error = f"timed out after {self.timeout} seconds"
+            except Exception as e:  # noqa: BLE001
+                result.error = f"{type(e).__name__}: {e}"
+            result.elapsed = time.perf_counter() - start
+        return result
+
+    def as_tool(self) -> AgentTool:
+        """Return a ``consult_specialists`` tool that fans a list of requests out to the sub-agents."""
+        names = ", ".join(self.factories)
+
+        @tool(
+            name="consult_specialists",
+            description=(
+                "複数の専門エージェントに独立した依頼を同時に送り、結果を依頼順にまとめて返すツール。"
+                f"互いに依存しない依頼は1回の呼び出しにまとめてください。利用可能な専門エージェント: {names}"
+            ),
+        )
+        async def consult_specialists(tasks: list[SpecialistTask]) -> str:
+            """専門エージェントに依頼を並列に送るツール。
+
+            Args:
+                tasks: 依頼のリスト (specialist: 専門エージェント名, request: 依頼内容)
+
+            Returns:
+                依頼順に並べた各専門エージェントの回答
+
+            """
+            sections = []
+            for result in await self.run(tasks):
+                body = f"エラー: {result.error}" if result.error is not None else result.output
+                sections.append(f"## {result.specialist}: {result.request}\n{body}")
+            return "\n\n".join(sections)
+
+        return consult_specialists
+
+
+if __name__ == "__main__":
+    # サブエージェントはプールから取り出し、呼び出しが成功したら会話をリセットして再利用する
+    pool = AgentPool()
+    specialists = ParallelSubAgents(
+        {
+            name: pool.factory(system_prompt=prompt, callback_handler=None)
+            for name, prompt in SPECIALIST_PROMPTS.items()
+        },
+        max_concurrency=4,
+        timeout=120.0,
+        release=pool.release,
+    )
+
+    orchestrator = Agent(
+        system_prompt="""
+あなたはユーザーの要求を理解し、適切な専門エージェントに作業を委譲するオーケストレーターです。
+互いに独立した依頼は consult_specialists ツールの1回の呼び出しにまとめて並列に実行し、
+結果を統合して回答してください。
+        """.strip(),
+        tools=[specialists.as_tool()],
+    )
+
+    print("=" * 80)
+    print("Agents as Tools パターンの並列実行")
+    print("=" * 80)
+
+    result = orchestrator("パタゴニア旅行に適したハイキングブーツを探しています")
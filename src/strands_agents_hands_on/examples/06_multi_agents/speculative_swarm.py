@@ -0,0 +1,308 @@
+"""Compare Swarm and SpeculativeSwarm time-to-final-answer on a scripted researcher → coder → reviewer pipeline.
+
+Usage:
+    # スタブモデルで通常の Swarm と投機実行ありの Swarm のレイテンシを比較
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.speculative_swarm
+
+    # モデルの疑似レイテンシを変更
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.speculative_swarm --delay 0.5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from strands import Agent
+from strands.agent import AgentResult
+from strands.multiagent import Swarm
+from strands.multiagent.base import NodeResult, Status
+from strands.multiagent.swarm import SwarmNode, SwarmResult
+from strands.types.content import ContentBlock
+from strands.types.tools import ToolUse
+
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+from .swarm_profiler import HANDOFF_TOOL_NAME
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeculationStats:
+    """Counters of a SpeculativeSwarm.
+
+    Attributes:
+        launched: Speculative node runs started
+        hits: Speculative runs whose result was used
+        misses: Speculative runs dropped because the swarm went elsewhere or the input changed
+        wasted_tokens: Tokens used by dropped speculative runs
+        saved_seconds: Time the used speculative runs had already been running when the swarm reached them
+
+    """
+
+    launched: int = 0
+    hits: int = 0
+    misses: int = 0
+    wasted_tokens: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of finished speculations whose result was used."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Speculation:
+    node: SwarmNode
+    context_text: str
+    launched_at: float
+    input_tokens: int
+    output_tokens: int
+    future: Future[AgentResult] | None = None
+    finished_at: float | None = None
+    # Earlier run of the same node, discarded before this one starts
+    replaces: "_Speculation | None" = None
+    # Handoffs requested by the speculative run, replayed if its result is used
+    handoffs: list[tuple[SwarmNode, str, dict[str, Any]]] = field(default_factory=list)
+
+
+# Speculative run the current task belongs to
+_speculating: contextvars.ContextVar[_Speculation | None] = contextvars.ContextVar("speculating", default=None)
+
+
+class SpeculativeSwarm(Swarm):
+    """Swarm that starts the next node as soon as a handoff is requested.
+
+    In a plain Swarm, a node that calls ``handoff_to_agent`` still finishes its turn
+    (another model call to wrap up) before the target node starts. Once the handoff
+    tool has run, the target's input (handoff message, history, shared context) is
+    fully determined, so this swarm starts the target right away, concurrently with
+    the wrap-up of the current node.
+
+    When the swarm reaches the target, the speculative run is used if the input it
+    would build now is identical. Otherwise (the node handed off again, or another
+    handoff changed the shared context) the run is cancelled and the node executes
+    normally, and its tokens are counted as wasted. Handoffs made by a speculative run
+    are held back and applied only when its result is used, and a speculative run
+    does not start further speculation.
+
+    Speculation is only safe for nodes whose tools have no side effects that matter
+    if the result is dropped. ``stats`` reports the hit rate, wasted tokens and saved
+    time over the lifetime of the swarm.
+    """
+
+    def __init__(self, nodes: list[Agent], **kwargs: Any) -> None:
+        """Initialize the swarm. Accepts the same keyword arguments as Swarm."""
+        self.stats = SpeculationStats()
+        self._speculations: dict[str, _Speculation] = {}
+        self._speculation_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._invocation_state: dict[str, Any] = {}
+        # Node executed by the swarm loop (state.current_node already points to the handoff target)
+        self._running_node: SwarmNode | None = None
+        super().__init__(nodes, **kwargs)
+
+    async def invoke_async(
+        self, task: str | list[ContentBlock], invocation_state: dict[str, Any] | None = None, **kwargs: Any
+    ) -> SwarmResult:
+        """Invoke the swarm asynchronously, dropping speculative runs left over at the end."""
+        self._loop = asyncio.get_running_loop()
+        self._invocation_state = invocation_state or {}
+        try:
+            return await super().invoke_async(task, invocation_state, **kwargs)
+        finally:
+            with self._speculation_lock:
+                leftovers = list(self._speculations.values())
+                self._speculations.clear()
+            for speculation in leftovers:
+                await self._discard(speculation)
+
+    def _handle_handoff(self, target_node: SwarmNode, message: str, context: dict[str, Any]) -> None:
+        speculation = _speculating.get()
+        if speculation is not None:
+            speculation.handoffs.append((target_node, message, context))
+            return
+
+        super()._handle_handoff(target_node, message, context)
+        previous_node = self._running_node
+        if (
+            previous_node is None
+            or self.state.completion_status != Status.EXECUTING
+            or self.state.current_node != target_node
+            or target_node == previous_node
+        ):
+            return
+        self._launch(target_node, previous_node)
+
+    def _launch(self, target_node: SwarmNode, previous_node: SwarmNode) -> None:
+        """Start the target node with the input it will get once ``previous_node`` finishes."""
+        loop = self._loop
+        if loop is None:
+            return
+        self.state.node_history.append(previous_node)
+        try:
+            context_text = self._build_node_input(target_node)
+        finally:
+            self.state.node_history.pop()
+
+        usage = target_node.executor.event_loop_metrics.accumulated_usage
+        speculation = _Speculation(
+            node=target_node,
+            context_text=context_text,
+            launched_at=time.perf_counter(),
+            input_tokens=usage["inputTokens"],
+            output_tokens=usage["outputTokens"],
+        )
+        with self._speculation_lock:
+            speculation.replaces = self._speculations.pop(target_node.node_id, None)
+            self._speculations[target_node.node_id] = speculation
+            self.stats.launched += 1
+
+        logger.debug("node=<%s> | starting speculative run", target_node.node_id)
+        speculation.future = asyncio.run_coroutine_threadsafe(self._speculate(speculation), loop)
+
+    async def _speculate(self, speculation: _Speculation) -> AgentResult:
+        # The replaced run uses the same Agent, which must not run twice at once
+        replaced = speculation.replaces
+        if replaced is not None:
+            await self._discard(replaced)
+            speculation.replaces = None
+            usage = speculation.node.executor.event_loop_metrics.accumulated_usage
+            speculation.input_tokens, speculation.output_tokens = usage["inputTokens"], usage["outputTokens"]
+
+        _speculating.set(speculation)
+        try:
+            speculation.node.reset_executor_state()
+            return await speculation.node.executor.invoke_async(
+                self._node_input(speculation.context_text), **self._invocation_state
+            )
+        finally:
+            speculation.finished_at = time.perf_counter()
+
+    def _node_input(self, context_text: str) -> list[ContentBlock]:
+        node_input = [ContentBlock(text=f"Context:\n{context_text}\n\n")]
+        if not isinstance(self.state.task, str):
+            node_input = node_input + self.state.task
+        return node_input
+
+    async def _discard(self, speculation: _Speculation) -> None:
+        """Cancel a speculative run, wait for it to stop and count its tokens as wasted."""
+        if speculation.future is not None:
+            speculation.future.cancel()
+            with contextlib.suppress(BaseException):
+                await asyncio.wrap_future(speculation.future)
+        # A run cancelled before it started has not discarded the run it replaces yet
+        if speculation.replaces is not None:
+            await self._discard(speculation.replaces)
+            speculation.replaces = None
+        usage = speculation.node.executor.event_loop_metrics.accumulated_usage
+        wasted = usage["inputTokens"] - speculation.input_tokens + usage["outputTokens"] - speculation.output_tokens
+        with self._speculation_lock:
+            self.stats.misses += 1
+            self.stats.wasted_tokens += wasted
+        logger.debug("node=<%s>, wasted_tokens=<%d> | dropped speculative run", speculation.node.node_id, wasted)
+
+    async def _execute_node(
+        self, node: SwarmNode, task: str | list[ContentBlock], invocation_state: dict[str, Any]
+    ) -> AgentResult:
+        self._running_node = node
+        with self._speculation_lock:
+            speculation = self._speculations.pop(node.node_id, None)
+        if speculation is None or speculation.future is None:
+            return await super()._execute_node(node, task, invocation_state)
+
+        reached_at = time.perf_counter()
+        if speculation.context_text != self._build_node_input(node):
+            await self._discard(speculation)
+            return await super()._execute_node(node, task, invocation_state)
+        try:
+            result = await asyncio.wrap_future(speculation.future)
+        except Exception:  # noqa: BLE001
+            logger.debug("node=<%s> | speculative run failed, executing node again", node.node_id)
+            await self._discard(speculation)
+            return await super()._execute_node(node, task, invocation_state)
+
+        self.state.handoff_message = None
+        finished_at = speculation.finished_at or time.perf_counter()
+        with self._speculation_lock:
+            self.stats.hits += 1
+            self.stats.saved_seconds += min(reached_at, finished_at) - speculation.launched_at
+
+        usage = node.executor.event_loop_metrics.accumulated_usage
+        input_tokens = usage["inputTokens"] - speculation.input_tokens
+        output_tokens = usage["outputTokens"] - speculation.output_tokens
+        node_result = NodeResult(
+            result=result,
+            execution_time=round((finished_at - speculation.launched_at) * 1000),
+            status=Status.COMPLETED,
+            accumulated_usage={
+                "inputTokens": input_tokens,
+                "outputTokens": output_tokens,
+                "totalTokens": input_tokens + output_tokens,
+            },
+            accumulated_metrics=result.metrics.accumulated_metrics,
+            execution_count=1,
+        )
+        self.state.results[node.node_id] = node_result
+        self._accumulate_metrics(node_result)
+
+        for target_node, message, context in speculation.handoffs:
+            self._handle_handoff(target_node, message, context)
+        return result
+
+
+def _handoff(call_id: str, agent_name: str, message: str) -> list[str | ToolUse]:
+    return [{"toolUseId": call_id, "name": HANDOFF_TOOL_NAME, "input": {"agent_name": agent_name, "message": message}}]
+
+
+def _build_nodes(delay: float) -> list[Agent]:
+    return [
+        Agent(
+            name="researcher",
+            model=StubModel([_handoff("r-1", "coder", "要件をまとめました"), "引き継ぎました"], delay=delay),
+            callback_handler=None,
+        ),
+        Agent(
+            name="coder",
+            model=StubModel([_handoff("c-1", "reviewer", "実装しました"), "引き継ぎました"], delay=delay),
+            callback_handler=None,
+        ),
+        Agent(name="reviewer", model=StubModel(["最終レポート"], delay=delay), callback_handler=None),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.3, help="emulated latency of every model call (seconds)")
+    args = parser.parse_args()
+
+    task = "シンプルな計算機のREST APIを設計して実装してください"
+    results = {}
+    for label, swarm_class in (("Swarm", Swarm), ("SpeculativeSwarm", SpeculativeSwarm)):
+        nodes = _build_nodes(args.delay)
+        swarm = swarm_class(nodes, entry_point=nodes[0], max_handoffs=20, node_timeout=300)
+        start = time.perf_counter()
+        result = swarm(task)
+        results[label] = time.perf_counter() - start
+        history = " → ".join(node.node_id for node in result.node_history)
+        print(f"{label:>16}: {results[label]:.2f}s ({result.status.value}, {history})")
+        if isinstance(swarm, SpeculativeSwarm):
+            stats = swarm.stats
+            print(
+                f"{'':>16}  launched={stats.launched} hit_rate={stats.hit_rate:.0%} "
+                f"wasted_tokens={stats.wasted_tokens} saved={stats.saved_seconds:.2f}s"
+            )
+    print(f"\nspeedup: {results['Swarm'] / results['SpeculativeSwarm']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
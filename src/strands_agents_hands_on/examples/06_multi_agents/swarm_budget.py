@@ -0,0 +1,345 @@
+"""Enforce token, cost and latency budgets on a Swarm, replayed offline with scripted agents.
+
+Usage:
+    # coder ↔ reviewer が往復し続ける Swarm を、予算なし・予算あり・レビュー承認ありで比較
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.swarm_budget
+
+    # 予算を変更
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.swarm_budget --max-tokens 4000 --latency-slo 0.5
+"""
+
+import argparse
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from strands import Agent
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+from strands.multiagent import Swarm
+from strands.multiagent.base import Status
+from strands.types.tools import ToolUse
+
+from strands_agents_hands_on.examples.stub_model import StubModel, Turn
+
+from .swarm_profiler import HANDOFF_TOOL_NAME
+
+# Claude Sonnet on Amazon Bedrock (USD per 1,000 tokens)
+DEFAULT_INPUT_PRICE_PER_1K = 0.003
+DEFAULT_OUTPUT_PRICE_PER_1K = 0.015
+
+
+@dataclass
+class BudgetUsage:
+    """Resources consumed by one swarm run.
+
+    Attributes:
+        input_tokens: Input tokens used by all nodes
+        output_tokens: Output tokens used by all nodes
+        cost: Estimated cost in USD
+        node_tokens: Total tokens used by each node
+        redirects: Handoffs sent to the finalizer instead of their requested target
+        approved: Whether the run ended because an approver approved the work
+        stop_reason: Why the budget ended the run early (None if it did not)
+
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    node_tokens: dict[str, int] = field(default_factory=dict)
+    redirects: int = 0
+    approved: bool = False
+    stop_reason: str | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        """Input and output tokens used by all nodes."""
+        return self.input_tokens + self.output_tokens
+
+
+class SwarmBudget(HookProvider):
+    """End or redirect a Swarm run based on tokens, estimated cost and a latency SLO.
+
+    The Swarm's own limits only count handoffs and wall-clock time. This controller,
+    registered on every node with ``attach``, tracks the tokens of the current run and
+    acts at tool-call and invocation boundaries:
+
+    - Past ``soft_limit`` of any budget, handoffs are redirected to the ``finalizer``
+      node, so the run wraps up instead of starting another coder ↔ reviewer round.
+      The same happens to handoffs towards a node that has used its ``node_token_caps``
+      share. A handoff from the finalizer to itself ends the run after its turn.
+    - Past the full token, cost or latency budget, the run is marked failed: the
+      current node stops after its pending tool calls and no further node starts.
+    - When a node listed in ``approvers`` answers with text matching
+      ``approval_pattern``, the run is marked completed right away and the node does
+      not call the model again, so an approval costs no extra handoff.
+
+    Token usage is read from each agent's event loop metrics, which Strands updates
+    after every model call, so a budget can be exceeded by at most one model response.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        max_tokens: int | None = None,
+        max_cost: float | None = None,
+        latency_slo: float | None = None,
+        node_token_caps: dict[str, int] | None = None,
+        finalizer: str | None = None,
+        approvers: tuple[str, ...] = (),
+        approval_pattern: str = r"\bAPPROVED\b",
+        soft_limit: float = 0.8,
+        input_price_per_1k: float = DEFAULT_INPUT_PRICE_PER_1K,
+        output_price_per_1k: float = DEFAULT_OUTPUT_PRICE_PER_1K,
+    ) -> None:
+        """Initialize the budget controller.
+
+        Args:
+            max_tokens: Maximum input and output tokens of a run
+            max_cost: Maximum estimated cost of a run in USD
+            latency_slo: Seconds a run may take from the start of the swarm
+            node_token_caps: Maximum tokens each named node may use in a run
+            finalizer: Node that receives redirected handoffs to wrap the run up
+            approvers: Nodes whose approval ends the run
+            approval_pattern: Regular expression marking an approval in an approver's answer
+            soft_limit: Fraction of a budget after which handoffs go to the finalizer
+            input_price_per_1k: Price of 1,000 input tokens in USD
+            output_price_per_1k: Price of 1,000 output tokens in USD
+
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.latency_slo = latency_slo
+        self.node_token_caps = node_token_caps or {}
+        self.finalizer = finalizer
+        self.approvers = approvers
+        self.approval_pattern = re.compile(approval_pattern)
+        self.soft_limit = soft_limit
+        self.input_price_per_1k = input_price_per_1k
+        self.output_price_per_1k = output_price_per_1k
+
+        self.usage = BudgetUsage()
+        self._swarm: Swarm | None = None
+        self._run: object = None
+        self._seen: dict[str, tuple[int, int]] = {}
+        self._stopping: set[str] = set()
+        self._lock = threading.Lock()
+
+    def attach(self, swarm: Swarm) -> None:
+        """Register the controller on every node of ``swarm``."""
+        self._swarm = swarm
+        for node in swarm.nodes.values():
+            node.executor.hooks.add_hook(self)
+
+    def register_hooks(self, registry: HookRegistry, **_kwargs: Any) -> None:
+        """Register the budget checks."""
+        registry.add_callback(BeforeInvocationEvent, self._before_invocation)
+        registry.add_callback(AfterModelCallEvent, self._after_model_call)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self._after_tool_call)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+
+    # Accounting
+    def _record(self, agent: Agent) -> None:
+        """Add the tokens the agent used since the last check (called with the lock held)."""
+        usage = agent.event_loop_metrics.accumulated_usage
+        input_seen, output_seen = self._seen.get(agent.name, (usage["inputTokens"], usage["outputTokens"]))
+        input_tokens, output_tokens = usage["inputTokens"] - input_seen, usage["outputTokens"] - output_seen
+        self._seen[agent.name] = (usage["inputTokens"], usage["outputTokens"])
+
+        self.usage.input_tokens += input_tokens
+        self.usage.output_tokens += output_tokens
+        self.usage.cost += (input_tokens * self.input_price_per_1k + output_tokens * self.output_price_per_1k) / 1000
+        self.usage.node_tokens[agent.name] = self.usage.node_tokens.get(agent.name, 0) + input_tokens + output_tokens
+
+    def _elapsed(self) -> float:
+        return time.time() - self._swarm.state.start_time if self._swarm else 0.0
+
+    def _fraction_used(self) -> float:
+        """Return the largest used fraction among the token, cost and latency budgets."""
+        fractions = [0.0]
+        if self.max_tokens:
+            fractions.append(self.usage.total_tokens / self.max_tokens)
+        if self.max_cost:
+            fractions.append(self.usage.cost / self.max_cost)
+        if self.latency_slo:
+            fractions.append(self._elapsed() / self.latency_slo)
+        return max(fractions)
+
+    def _exhausted_reason(self) -> str | None:
+        if self.max_tokens and self.usage.total_tokens >= self.max_tokens:
+            return f"token budget exhausted ({self.usage.total_tokens}/{self.max_tokens})"
+        if self.max_cost and self.usage.cost >= self.max_cost:
+            return f"cost budget exhausted (${self.usage.cost:.4f}/${self.max_cost:.4f})"
+        if self.latency_slo and self._elapsed() >= self.latency_slo:
+            return f"latency SLO exhausted ({self._elapsed():.1f}s/{self.latency_slo:.1f}s)"
+        return None
+
+    def _over_node_cap(self, node: str) -> bool:
+        cap = self.node_token_caps.get(node)
+        return cap is not None and self.usage.node_tokens.get(node, 0) >= cap
+
+    def _end_run(self, status: Status, reason: str | None = None) -> None:
+        """Mark the swarm run finished, which makes the swarm ignore further handoffs."""
+        if self._swarm is None or self._swarm.state.completion_status != Status.EXECUTING:
+            return
+        self._swarm.state.completion_status = status
+        self.usage.stop_reason = reason
+
+    # Hooks
+    def _before_invocation(self, event: BeforeInvocationEvent) -> None:
+        with self._lock:
+            # A new SwarmState means a new run of the swarm
+            run = self._swarm.state if self._swarm else None
+            if run is not self._run:
+                self._run = run
+                self.usage = BudgetUsage()
+                self._stopping.clear()
+            usage = event.agent.event_loop_metrics.accumulated_usage
+            self._seen[event.agent.name] = (usage["inputTokens"], usage["outputTokens"])
+
+    def _after_model_call(self, event: AfterModelCallEvent) -> None:
+        node = event.agent.name
+        if node not in self.approvers or event.stop_response is None:
+            return
+        text = "".join(block.get("text", "") for block in event.stop_response.message["content"])
+        if self.approval_pattern.search(text):
+            with self._lock:
+                self.usage.approved = True
+                self._end_run(Status.COMPLETED)
+                self._stopping.add(node)
+
+    def _before_tool_call(self, event: BeforeToolCallEvent) -> None:
+        with self._lock:
+            self._record(event.agent)
+            if event.tool_use["name"] != HANDOFF_TOOL_NAME or self.finalizer is None:
+                return
+            tool_input = event.tool_use["input"]
+            target = tool_input.get("agent_name") if isinstance(tool_input, dict) else None
+            if target == self.finalizer or not (
+                self._fraction_used() >= self.soft_limit or self._over_node_cap(str(target))
+            ):
+                return
+            # 予算が残り少ないため、最終担当のノードに作業をまとめさせる
+            self.usage.redirects += 1
+            event.tool_use = {
+                **event.tool_use,
+                "input": {
+                    **tool_input,
+                    "agent_name": self.finalizer,
+                    "message": f"[budget] Wrap up the task now. Requested handoff to {target}: "
+                    f"{tool_input.get('message', '')}",
+                },
+            }
+
+    def _after_tool_call(self, event: AfterToolCallEvent) -> None:
+        node = event.agent.name
+        with self._lock:
+            self._record(event.agent)
+            reason = self._exhausted_reason()
+            if reason is not None:
+                self._end_run(Status.FAILED, reason)
+            if reason is not None or node in self._stopping or self._over_node_cap(node):
+                # Skip the model call that would follow the tool results
+                event.invocation_state.setdefault("request_state", {})["stop_event_loop"] = True
+
+    def _after_invocation(self, event: AfterInvocationEvent) -> None:
+        with self._lock:
+            self._record(event.agent)
+            self._stopping.discard(event.agent.name)
+            reason = self._exhausted_reason()
+            if reason is not None:
+                self._end_run(Status.FAILED, reason)
+
+
+def _handoff(call_id: str, agent_name: str, message: str) -> list[str | ToolUse]:
+    return [{"toolUseId": call_id, "name": HANDOFF_TOOL_NAME, "input": {"agent_name": agent_name, "message": message}}]
+
+
+def _build_swarm(delay: float, rounds: int, *, approve_at: int | None = None) -> Swarm:
+    """Build a swarm whose reviewer sends the work back ``rounds`` times (or approves at round ``approve_at``)."""
+    coder_script: list[Turn] = []
+    reviewer_script: list[Turn] = []
+    for i in range(rounds):
+        coder_script += [_handoff(f"c-{i}", "reviewer", f"修正版 {i} を実装しました"), "引き継ぎました"]
+        if i == approve_at:
+            # 承認しつつ念のため coder に戻そうとするケース
+            reviewer_script += [["APPROVED: 問題ありません", *_handoff(f"v-{i}", "coder", "念のため最終確認を")]]
+        else:
+            reviewer_script += [_handoff(f"v-{i}", "coder", f"指摘 {i}: エラー処理が不足しています"), "差し戻しました"]
+
+    researcher = Agent(
+        name="researcher",
+        model=StubModel([_handoff("r-0", "coder", "要件をまとめました"), "引き継ぎました"], delay=delay),
+        callback_handler=None,
+    )
+    coder = Agent(name="coder", model=StubModel(coder_script, delay=delay), callback_handler=None)
+    reviewer = Agent(
+        name="reviewer",
+        model=StubModel(reviewer_script, delay=delay, default_text="最終レポート"),
+        callback_handler=None,
+    )
+    return Swarm([researcher, coder, reviewer], entry_point=researcher, max_handoffs=20, max_iterations=20)
+
+
+def _report(label: str, swarm: Swarm, elapsed: float, budget: SwarmBudget | None) -> None:
+    usage = swarm.state.accumulated_usage
+    history = " → ".join(node.node_id for node in swarm.state.node_history)
+    print(f"\n## {label}")
+    print(f"status: {swarm.state.completion_status.value}, time: {elapsed:.2f}s, nodes: {history}")
+    if budget is None:
+        print(f"tokens (swarm): {usage['totalTokens']}")
+        return
+    cost = budget.usage.cost
+    print(f"tokens: {budget.usage.total_tokens}, cost: ${cost:.4f}, redirects: {budget.usage.redirects}")
+    print(f"approved: {budget.usage.approved}, stop_reason: {budget.usage.stop_reason}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.05, help="emulated latency of every model call (seconds)")
+    parser.add_argument("--max-tokens", type=int, default=2000)
+    parser.add_argument("--latency-slo", type=float, default=None, help="seconds a run may take")
+    args = parser.parse_args()
+
+    task = "シンプルな計算機のREST APIを設計して実装してください"
+
+    # 1. 予算なし: coder ↔ reviewer の往復が max_handoffs まで続く
+    swarm = _build_swarm(args.delay, rounds=10)
+    start = time.perf_counter()
+    swarm(task)
+    _report("予算なし", swarm, time.perf_counter() - start, None)
+
+    # 2. トークン予算: 8割を超えたら reviewer に最終化させ、使い切ったら打ち切る
+    swarm = _build_swarm(args.delay, rounds=10)
+    budget = SwarmBudget(
+        max_tokens=args.max_tokens,
+        latency_slo=args.latency_slo,
+        node_token_caps={"coder": args.max_tokens // 2},
+        finalizer="reviewer",
+    )
+    budget.attach(swarm)
+    start = time.perf_counter()
+    swarm(task)
+    _report("トークン予算あり", swarm, time.perf_counter() - start, budget)
+
+    # 3. レビュー承認による早期終了
+    swarm = _build_swarm(args.delay, rounds=10, approve_at=1)
+    budget = SwarmBudget(max_tokens=args.max_tokens, finalizer="reviewer", approvers=("reviewer",))
+    budget.attach(swarm)
+    start = time.perf_counter()
+    swarm(task)
+    _report("レビュー承認で終了", swarm, time.perf_counter() - start, budget)
+
+
+if __name__ == "__main__":
+    main()
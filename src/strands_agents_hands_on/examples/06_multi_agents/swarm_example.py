@@ -3,6 +3,9 @@
 from strands import Agent
 from strands.multiagent import Swarm
 
+from .swarm_budget import SwarmBudget
+from .swarm_profiler import SwarmProfiler
+
 researcher = Agent(
     name="researcher",
     system_prompt="""
@@ -24,7 +27,7 @@ reviewer = Agent(
     system_prompt="""
 あなたはコードレビュー担当のエージェントです。
 実装されたコードをレビューし、問題があればcoderにフィードバックを返し、
-問題なければ最終レポートを作成してください。
+問題なければ「APPROVED」と記載した上で最終レポートを作成してください。
     """.strip(),
 )
 
@@ -40,6 +43,22 @@ swarm = Swarm(
     repetitive_handoff_min_unique_agents=0,  # ピンポン検出に必要な最小ユニークエージェント数(0だと無効)
 )
 
+# トークン・コスト・レイテンシの予算を設定
+# 予算の8割を超えたら reviewer に最終化させ、承認 (APPROVED) されたら即座に終了
+budget = SwarmBudget(
+    max_tokens=200_000,
+    max_cost=1.0,  # USD
+    latency_slo=600,  # 秒
+    node_token_caps={"coder": 100_000},
+    finalizer="reviewer",
+    approvers=("reviewer",),
+)
+budget.attach(swarm)
+
+# ノードごとの時間・トークン・ハンドオフを記録
+profiler = SwarmProfiler()
+profiler.attach(swarm)
+
 # 実行
 print("=" * 80)
 print("Swarm パターンの実行")
@@ -47,6 +66,7 @@ print("=" * 80)
 print("タスク: シンプルな計算機APIの設計と実装")
 print("=" * 80)
 
+profiler.reset()
 result = swarm(
     """
 シンプルな計算機のREST APIを設計して実装してください。
@@ -55,3 +75,13 @@ result = swarm(
 - エラーハンドリングを含める
 """
 )
+
+print("=" * 80)
+print("プロファイル")
+print("=" * 80)
+print(profiler.format_summary())
+print(
+    f"\n推定コスト: ${budget.usage.cost:.4f}, 承認: {budget.usage.approved}, 打ち切り理由: {budget.usage.stop_reason}"
+)
+profiler.export_chrome_trace("data/swarm_trace.json")
+print("\nChrome トレースを出力しました: data/swarm_trace.json (chrome://tracing や Perfetto で表示)")
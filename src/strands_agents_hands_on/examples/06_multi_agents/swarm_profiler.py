@@ -0,0 +1,384 @@
+"""Profile a Swarm offline with scripted agents and export the timeline.
+
+Usage:
+    # スタブモデルで researcher → coder → reviewer → coder → reviewer のハンドオフを再現し、プロファイルを表示
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.swarm_profiler
+
+    # Chrome トレース (chrome://tracing や https://ui.perfetto.dev で表示) の出力先を変更
+    uv run python -m strands_agents_hands_on.examples.06_multi_agents.swarm_profiler --trace data/trace.json
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from strands import Agent
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+from strands.multiagent import Swarm
+from strands.types.tools import ToolUse
+
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+HANDOFF_TOOL_NAME = "handoff_to_agent"
+
+
+@dataclass
+class Span:
+    """A timed interval of the swarm execution, in seconds since the profiler origin.
+
+    Attributes:
+        name: Node name, or model / tool name for nested spans
+        category: "node", "model" or "tool"
+        node: Node the span belongs to
+        start: Start time
+        end: End time
+        args: Extra data shown in the trace viewer
+
+    """
+
+    name: str
+    category: str
+    node: str
+    start: float
+    end: float
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Length of the span in seconds."""
+        return self.end - self.start
+
+
+@dataclass
+class Handoff:
+    """A successful handoff between two nodes.
+
+    Attributes:
+        from_node: Node that called the handoff tool
+        to_node: Node the work was handed to
+        at: Time the handoff tool returned
+        message: Handoff message
+        queue_delay: Time between the handoff and the start of the target node (None until it starts)
+
+    """
+
+    from_node: str
+    to_node: str
+    at: float
+    message: str
+    queue_delay: float | None = None
+
+
+@dataclass
+class NodeProfile:
+    """Totals for one node across all of its executions.
+
+    Attributes:
+        node: Node name
+        runs: Number of executions
+        wall: Wall time of the executions in seconds
+        model: Time spent waiting for the model in seconds
+        tool: Time spent in tool calls in seconds (concurrent calls are added up)
+        queue: Time between being handed work and starting in seconds
+        model_calls: Number of model calls
+        tool_calls: Number of tool calls
+        input_tokens: Input tokens used
+        output_tokens: Output tokens used
+
+    """
+
+    node: str
+    runs: int = 0
+    wall: float = 0.0
+    model: float = 0.0
+    tool: float = 0.0
+    queue: float = 0.0
+    model_calls: int = 0
+    tool_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class SwarmProfiler(HookProvider):
+    """Record where a Swarm spends its time and tokens.
+
+    ``attach`` registers the profiler on every node of a swarm. For each node execution
+    it records the wall time, the model calls and tool calls nested in it, the token
+    usage and the queueing delay: the time between the handoff to the node (or the
+    profiler origin for the entry node) and the start of its execution, which covers
+    the wrap-up turn of the previous node and the swarm's own overhead.
+
+    The timeline can be exported as Chrome trace JSON, readable by chrome://tracing and
+    Perfetto, and ``format_summary`` renders per-node totals together with the handoff
+    path and the number of back-and-forth handoffs between the same two nodes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty profile whose origin is the current time."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every record and move the origin to now. Call it right before running the swarm."""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self.spans: list[Span] = []
+            self.handoffs: list[Handoff] = []
+            self._node_start: dict[str, tuple[float, dict[str, int]]] = {}
+            self._model_start: dict[str, float] = {}
+            self._tool_start: dict[str, float] = {}
+            self._pending_handoff: dict[str, Handoff] = {}
+            self._queue: dict[str, float] = {}
+
+    def attach(self, swarm: Swarm) -> None:
+        """Register the profiler on every node of ``swarm``."""
+        for node in swarm.nodes.values():
+            node.executor.hooks.add_hook(self)
+
+    def register_hooks(self, registry: HookRegistry, **_kwargs: Any) -> None:
+        """Register the timing callbacks."""
+        registry.add_callback(BeforeInvocationEvent, self._before_invocation)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+        registry.add_callback(BeforeModelCallEvent, self._before_model_call)
+        registry.add_callback(AfterModelCallEvent, self._after_model_call)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self._after_tool_call)
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _before_invocation(self, event: BeforeInvocationEvent) -> None:
+        node, now = event.agent.name, self._now()
+        usage = event.agent.event_loop_metrics.accumulated_usage
+        with self._lock:
+            self._node_start[node] = (now, {"input": usage["inputTokens"], "output": usage["outputTokens"]})
+            handoff = self._pending_handoff.pop(node, None)
+            if handoff is not None:
+                handoff.queue_delay = now - handoff.at
+                self._queue[node] = handoff.queue_delay
+            elif not any(span.category == "node" for span in self.spans):
+                self._queue[node] = now
+            else:
+                self._queue[node] = 0.0
+
+    def _after_invocation(self, event: AfterInvocationEvent) -> None:
+        node, now = event.agent.name, self._now()
+        usage = event.agent.event_loop_metrics.accumulated_usage
+        with self._lock:
+            start, tokens = self._node_start.pop(node, (now, {"input": 0, "output": 0}))
+            self.spans.append(
+                Span(
+                    name=node,
+                    category="node",
+                    node=node,
+                    start=start,
+                    end=now,
+                    args={
+                        "input_tokens": usage["inputTokens"] - tokens["input"],
+                        "output_tokens": usage["outputTokens"] - tokens["output"],
+                        "queue_delay": self._queue.pop(node, 0.0),
+                    },
+                )
+            )
+
+    def _before_model_call(self, event: BeforeModelCallEvent) -> None:
+        with self._lock:
+            self._model_start[event.agent.name] = self._now()
+
+    def _after_model_call(self, event: AfterModelCallEvent) -> None:
+        node, now = event.agent.name, self._now()
+        stop_reason = event.stop_response.stop_reason if event.stop_response else "error"
+        with self._lock:
+            start = self._model_start.pop(node, now)
+            self.spans.append(Span("model", "model", node, start, now, {"stop_reason": stop_reason}))
+
+    def _before_tool_call(self, event: BeforeToolCallEvent) -> None:
+        with self._lock:
+            self._tool_start[event.tool_use["toolUseId"]] = self._now()
+
+    def _after_tool_call(self, event: AfterToolCallEvent) -> None:
+        node, now, tool_use = event.agent.name, self._now(), event.tool_use
+        with self._lock:
+            start = self._tool_start.pop(tool_use["toolUseId"], now)
+            status = event.result["status"]
+            self.spans.append(Span(tool_use["name"], "tool", node, start, now, {"status": status}))
+            tool_input = tool_use["input"] if isinstance(tool_use["input"], dict) else {}
+            if tool_use["name"] == HANDOFF_TOOL_NAME and status == "success":
+                handoff = Handoff(node, str(tool_input.get("agent_name")), now, str(tool_input.get("message", "")))
+                self.handoffs.append(handoff)
+                self._pending_handoff[handoff.to_node] = handoff
+
+    def node_profiles(self) -> list[NodeProfile]:
+        """Return per-node totals in order of first execution."""
+        profiles: dict[str, NodeProfile] = {}
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        for span in spans:
+            profile = profiles.setdefault(span.node, NodeProfile(span.node))
+            if span.category == "node":
+                profile.runs += 1
+                profile.wall += span.duration
+                profile.queue += span.args["queue_delay"]
+                profile.input_tokens += span.args["input_tokens"]
+                profile.output_tokens += span.args["output_tokens"]
+            elif span.category == "model":
+                profile.model_calls += 1
+                profile.model += span.duration
+            else:
+                profile.tool_calls += 1
+                profile.tool += span.duration
+        return list(profiles.values())
+
+    def bounces(self) -> Counter[tuple[str, str]]:
+        """Count handoffs that send work straight back to the node that handed it over."""
+        counts: Counter[tuple[str, str]] = Counter()
+        with self._lock:
+            handoffs = list(self.handoffs)
+        for previous, current in itertools.pairwise(handoffs):
+            if (current.from_node, current.to_node) == (previous.to_node, previous.from_node):
+                counts[min(current.from_node, current.to_node), max(current.from_node, current.to_node)] += 1
+        return counts
+
+    def format_summary(self) -> str:
+        """Render per-node totals, the handoff path and ping-pong counts as a text table."""
+        header = (
+            f"{'node':<12} | {'runs':>4} | {'wall (s)':>8} | {'model (s)':>9} | {'tool (s)':>8} | "
+            f"{'queue (s)':>9} | {'in tok':>7} | {'out tok':>7}"
+        )
+        lines = [header, "-" * len(header)]
+        total = NodeProfile("total")
+        for profile in self.node_profiles():
+            lines.append(
+                f"{profile.node:<12} | {profile.runs:>4} | {profile.wall:>8.2f} | {profile.model:>9.2f} | "
+                f"{profile.tool:>8.2f} | {profile.queue:>9.2f} | {profile.input_tokens:>7} | {profile.output_tokens:>7}"
+            )
+            total.runs += profile.runs
+            total.wall += profile.wall
+            total.model += profile.model
+            total.tool += profile.tool
+            total.queue += profile.queue
+            total.input_tokens += profile.input_tokens
+            total.output_tokens += profile.output_tokens
+        lines.append("-" * len(header))
+        lines.append(
+            f"{total.node:<12} | {total.runs:>4} | {total.wall:>8.2f} | {total.model:>9.2f} | "
+            f"{total.tool:>8.2f} | {total.queue:>9.2f} | {total.input_tokens:>7} | {total.output_tokens:>7}"
+        )
+
+        if self.handoffs:
+            path = [self.handoffs[0].from_node] + [handoff.to_node for handoff in self.handoffs]
+            lines.append(f"\nhandoffs ({len(self.handoffs)}): {' → '.join(path)}")
+        for (node_a, node_b), count in self.bounces().items():
+            lines.append(f"ping-pong {node_a} ⇄ {node_b}: {count}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the timeline in Chrome trace event format, one track per node."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+            handoffs = list(self.handoffs)
+
+        tracks: dict[str, int] = {}
+        for span in spans:
+            tracks.setdefault(span.node, len(tracks) + 1)
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": node}}
+            for node, tid in tracks.items()
+        ]
+        events.extend(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "pid": 1,
+                "tid": tracks[span.node],
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "args": span.args,
+            }
+            for span in spans
+        )
+        for flow_id, handoff in enumerate(handoffs, start=1):
+            if handoff.to_node not in tracks:
+                continue
+            common = {"name": "handoff", "cat": "handoff", "pid": 1, "id": flow_id}
+            events.append({**common, "ph": "s", "tid": tracks[handoff.from_node], "ts": handoff.at * 1e6})
+            if handoff.queue_delay is not None:
+                start = (handoff.at + handoff.queue_delay) * 1e6
+                events.append({**common, "ph": "f", "bp": "e", "tid": tracks[handoff.to_node], "ts": start})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str | Path) -> None:
+        """Write the Chrome trace JSON to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), ensure_ascii=False))
+
+
+def _handoff(call_id: str, agent_name: str, message: str) -> list[str | ToolUse]:
+    return [{"toolUseId": call_id, "name": HANDOFF_TOOL_NAME, "input": {"agent_name": agent_name, "message": message}}]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.1, help="emulated latency of every model call (seconds)")
+    parser.add_argument("--trace", default="data/swarm_trace.json")
+    args = parser.parse_args()
+
+    # 各エージェントの応答をスクリプト化: reviewer が一度 coder に差し戻す
+    researcher = Agent(
+        name="researcher",
+        model=StubModel([_handoff("r-1", "coder", "要件をまとめました"), "引き継ぎました"], delay=args.delay),
+        callback_handler=None,
+    )
+    coder = Agent(
+        name="coder",
+        model=StubModel(
+            [
+                _handoff("c-1", "reviewer", "実装しました"),
+                "引き継ぎました",
+                _handoff("c-2", "reviewer", "指摘を修正しました"),
+                "引き継ぎました",
+            ],
+            delay=args.delay,
+        ),
+        callback_handler=None,
+    )
+    reviewer = Agent(
+        name="reviewer",
+        model=StubModel(
+            [_handoff("v-1", "coder", "エラー処理が不足しています"), "差し戻しました", "最終レポート"],
+            delay=args.delay,
+        ),
+        callback_handler=None,
+    )
+    swarm = Swarm([researcher, coder, reviewer], entry_point=researcher, max_handoffs=20, node_timeout=300)
+
+    profiler = SwarmProfiler()
+    profiler.attach(swarm)
+    profiler.reset()
+    result = swarm("シンプルな計算機のREST APIを設計して実装してください")
+
+    print(f"status: {result.status.value}")
+    print(profiler.format_summary())
+    profiler.export_chrome_trace(args.trace)
+    print(f"\nChrome トレースを出力しました: {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Batch inference over Agent and structured_output with bounded concurrency and rate limiting.
+
+Usage:
+    # スタブモデルで 200 件の構造化抽出を逐次実行と batch_run で比較 (一部のリクエストはスロットリングされる)
+    uv run python -m strands_agents_hands_on.examples.batch_inference
+
+    # 件数、並列数、レート制限 (リクエスト/秒)、スロットリング率を変更
+    uv run python -m strands_agents_hands_on.examples.batch_inference \
+        --prompts 1000 --concurrency 32 --rate-limit 100 --throttle-rate 0.1
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from botocore.config import Config as BotocoreConfig
+from pydantic import BaseModel, Field
+from strands import Agent
+from strands.hooks import AfterModelCallEvent
+from strands.models.bedrock import BedrockModel
+from strands.types.content import Messages
+from strands.types.exceptions import ModelThrottledException
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolSpec
+
+from strands_agents_hands_on.examples.schema_registry import PrecompiledSchemaModel, schema_registry
+from strands_agents_hands_on.examples.stub_model import StubModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class TokenBucket:
+    """Asyncio token bucket allowing ``rate`` acquisitions per second with bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (defaults to ``rate``, i.e. one second of burst)
+
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` tokens are available and take them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                # Waiting while holding the lock keeps callers served in arrival order
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one prompt of a batch.
+
+    Attributes:
+        index: Position of the prompt in the input
+        prompt: The prompt
+        output: Response text, or the validated model with ``output_model`` (None if the prompt failed)
+        error: Error description if every attempt failed
+        attempts: Number of attempts made
+        elapsed: Wall time from the first attempt to the result in seconds
+
+    """
+
+    index: int
+    prompt: str
+    output: Any = None
+    error: str | None = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+
+def _default_agent_factory() -> Callable[[], Agent]:
+    # The model client is the expensive part of an Agent, so every agent shares one.
+    # botocore retries throttled calls itself by default; a single attempt leaves retries to batch_run
+    client_config = BotocoreConfig(retries={"total_max_attempts": 1, "mode": "standard"})
+    model = PrecompiledSchemaModel(BedrockModel(boto_client_config=client_config))
+    return lambda: Agent(model=model, callback_handler=None)
+
+
+def _raise_throttled(event: AfterModelCallEvent) -> None:
+    """Abort the event loop on throttling instead of letting it sleep and retry.
+
+    The event loop retries a throttled model call itself (fixed exponential backoff
+    without jitter, outside the rate limiter). This callback runs before that sleep, so
+    the exception reaches ``_run_with_retries`` right away.
+    """
+    if isinstance(event.exception, ModelThrottledException):
+        raise event.exception
+
+
+def _agent_call(
+    factory: Callable[[], Agent], prompt: str, output_model: type[BaseModel] | None
+) -> Callable[[], Awaitable[Any]]:
+    async def call() -> Any:
+        # A fresh agent per attempt, so a failed attempt leaves nothing in the conversation
+        agent = factory()
+        if output_model is not None:
+            return await agent.structured_output_async(output_model, prompt)
+        agent.hooks.add_callback(AfterModelCallEvent, _raise_throttled)
+        return str(await agent.invoke_async(prompt))
+
+    return call
+
+
+async def _run_with_retries(
+    call: Callable[[], Awaitable[Any]],
+    index: int,
+    prompt: str,
+    bucket: TokenBucket | None,
+    retry: tuple[int, float, float],
+) -> BatchResult:
+    """Run ``call``, retrying throttled attempts with exponential backoff and full jitter."""
+    max_retries, base_delay, max_delay = retry
+    result = BatchResult(index=index, prompt=prompt)
+    start = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        if bucket is not None:
+            await bucket.acquire()
+        result.attempts = attempt + 1
+        try:
+            result.output = await call()
+            break
+        except ModelThrottledException as e:
+            if attempt == max_retries:
+                result.error = f"throttled after {result.attempts} attempts: {e}"
+                break
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))  # noqa: S311
+            logger.debug("index=<%d>, attempt=<%d>, delay=<%.2f> | throttled, retrying", index, attempt, delay)
+            await asyncio.sleep(delay)
+        except Exception as e:  # noqa: BLE001
+            result.error = f"{type(e).__name__}: {e}"
+            break
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def batch_run(  # noqa: PLR0913
+    prompts: Sequence[str],
+    *,
+    concurrency: int = 8,
+    rate_limit: float | None = None,
+    output_model: type[BaseModel] | None = None,
+    agent_factory: Callable[[], Agent] | None = None,
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> AsyncIterator[BatchResult]:
+    """Run independent prompts concurrently and yield their results as they complete.
+
+    Every prompt runs on a fresh agent from ``agent_factory``, so no conversation
+    leaks between prompts. At most ``concurrency`` prompts are in flight and at most
+    ``rate_limit`` requests start per second. A throttled attempt is retried after an
+    exponential backoff with full jitter; other errors fail the prompt immediately.
+    The agent event loop's own throttling retry is disabled, and the default agents'
+    boto client makes a single attempt, so every retry goes through the rate limiter.
+    Custom agent factories should configure their model client the same way.
+    Failures are reported in the results and do not stop the batch.
+
+    Args:
+        prompts: Prompts to run
+        concurrency: Maximum number of prompts in flight
+        rate_limit: Maximum number of requests started per second (None for no limit)
+        output_model: Pydantic model to extract with ``structured_output`` (plain text if None)
+        agent_factory: Function building an agent per prompt (agents sharing one BedrockModel by default)
+        max_retries: Maximum number of retries of a throttled prompt
+        base_delay: Backoff before the first retry in seconds
+        max_delay: Maximum backoff in seconds
+
+    Yields:
+        BatchResult of each prompt, in completion order
+
+    """
+    factory = agent_factory or _default_agent_factory()
+    retry = (max_retries, base_delay, max_delay)
+    bucket = TokenBucket(rate_limit) if rate_limit else None
+    if output_model is not None:
+        schema_registry.warm_up(output_model)
+    pending: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(len(prompts)):
+        pending.put_nowait(index)
+    results: asyncio.Queue[BatchResult] = asyncio.Queue()
+
+    async def worker() -> None:
+        while not pending.empty():
+            index = pending.get_nowait()
+            agent_call = _agent_call(factory, prompts[index], output_model)
+            result = await _run_with_retries(agent_call, index, prompts[index], bucket, retry)
+            await results.put(result)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(prompts)))]
+    try:
+        for _ in range(len(prompts)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+class AIAgentInfo(BaseModel):
+    """AIエージェントに関する情報"""
+
+    definition: str = Field(description="AIエージェントの定義")
+    key_features: list[str] = Field(description="主な特徴のリスト")
+
+
+class FlakyStubModel(StubModel):
+    """StubModel whose requests are throttled with probability ``throttle_rate``."""
+
+    def __init__(self, throttle_rate: float, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.throttle_rate = throttle_rate
+
+    async def structured_output(
+        self,
+        output_model: type[T],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, T | Any], None]:
+        if random.random() < self.throttle_rate:  # noqa: S311
+            raise ModelThrottledException("ThrottlingException: Too many requests")
+        async for event in super().structured_output(output_model, prompt, system_prompt, **kwargs):
+            yield event
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        if random.random() < self.throttle_rate:  # noqa: S311
+            raise ModelThrottledException("ThrottlingException: Too many requests")
+        async for event in super().stream(messages, tool_specs, system_prompt, **kwargs):
+            yield event
+
+
+async def _run_batch(args: argparse.Namespace, prompts: list[str], model: StubModel) -> list[BatchResult]:
+    return [
+        result
+        async for result in batch_run(
+            prompts,
+            concurrency=args.concurrency,
+            rate_limit=args.rate_limit,
+            output_model=AIAgentInfo,
+            agent_factory=lambda: Agent(model=model, callback_handler=None),
+            base_delay=0.05,
+        )
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate-limit", type=float, default=100.0, help="requests per second")
+    parser.add_argument("--delay", type=float, default=0.1, help="emulated latency of every model call (seconds)")
+    parser.add_argument("--throttle-rate", type=float, default=0.05, help="fraction of throttled requests")
+    args = parser.parse_args()
+
+    structured = {"definition": "自律的にタスクを実行するAI", "key_features": ["自律性", "ツール利用"]}
+    model = FlakyStubModel(args.throttle_rate, delay=args.delay, structured=structured)
+    prompts = [f"AIエージェントについて教えてください ({i})" for i in range(args.prompts)]
+
+    # 逐次実行は時間がかかるため先頭の一部だけ実行し、全件分に換算する
+    sample = prompts[: max(1, args.prompts // 10)]
+    start = time.perf_counter()
+    for prompt in sample:
+        for _ in range(10):
+            try:
+                Agent(model=model, callback_handler=None).structured_output(AIAgentInfo, prompt)
+                break
+            except ModelThrottledException:
+                time.sleep(0.05)
+    serial = (time.perf_counter() - start) * len(prompts) / len(sample)
+
+    start = time.perf_counter()
+    results = asyncio.run(_run_batch(args, prompts, model))
+    batched = time.perf_counter() - start
+
+    failed = sum(result.error is not None for result in results)
+    retried = sum(result.attempts > 1 for result in results)
+    print(f"prompts={args.prompts} concurrency={args.concurrency} rate_limit={args.rate_limit}/s delay={args.delay}s")
+    print(f"serial (estimated): {serial:.2f}s")
+    print(f"batch_run:          {batched:.2f}s ({serial / batched:.1f}x, {args.prompts / batched:.1f} prompts/s)")
+    print(f"retried: {retried}, failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Benchmark the per-call schema overhead of structured output with and without SchemaRegistry.
+
+Usage:
+    # 出力モデルごとのスキーマ処理時間と、スタブモデルでの structured_output 1回あたりの時間を比較
+    uv run python -m strands_agents_hands_on.examples.benchmark_schema_registry
+
+    # 計測回数を変更
+    uv run python -m strands_agents_hands_on.examples.benchmark_schema_registry --calls 5000
+"""
+
+import argparse
+import time
+from collections.abc import AsyncGenerator, Callable
+from typing import TYPE_CHECKING, Any, cast
+
+from pydantic import BaseModel, Field
+from strands import Agent
+from strands.event_loop import streaming
+from strands.tools.structured_output import convert_pydantic_to_tool_spec
+from strands.types.content import Messages
+
+from strands_agents_hands_on.examples.schema_registry import PrecompiledSchemaModel, SchemaRegistry
+from strands_agents_hands_on.examples.stub_model import StubModel, Turn
+
+if TYPE_CHECKING:
+    from strands.types.tools import ToolChoice
+
+
+class AIAgentInfo(BaseModel):
+    """AIエージェントに関する情報"""
+
+    definition: str = Field(description="AIエージェントの定義")
+    key_features: list[str] = Field(description="主な特徴のリスト")
+    use_cases: list[str] = Field(description="具体的なユースケース")
+    benefits: list[str] = Field(description="導入メリット")
+
+
+class ImageComparison(BaseModel):
+    """2つの画像の比較結果"""
+
+    image1_description: str = Field(description="1枚目の画像の説明")
+    image2_description: str = Field(description="2枚目の画像の説明")
+    differences: list[str] = Field(description="2つの画像の違いのリスト")
+    similarities: list[str] = Field(description="2つの画像の共通点のリスト")
+    overall_assessment: str = Field(description="全体的な評価・まとめ")
+
+
+class Section(BaseModel):
+    """レポートの節"""
+
+    title: str = Field(description="節のタイトル")
+    findings: list[str] = Field(description="発見事項")
+    confidence: float | None = Field(default=None, description="確信度 (0-1)")
+
+
+class Report(BaseModel):
+    """入れ子のモデルを含む調査レポート"""
+
+    summary: str = Field(description="要約")
+    sections: list[Section] = Field(description="節のリスト")
+
+
+SAMPLES: dict[type[BaseModel], dict[str, Any]] = {
+    AIAgentInfo: {
+        "definition": "自律的にタスクを実行するAI",
+        "key_features": ["自律性", "ツール利用", "計画立案"],
+        "use_cases": ["カスタマーサポート", "データ分析"],
+        "benefits": ["作業の自動化"],
+    },
+    ImageComparison: {
+        "image1_description": "猫の写真",
+        "image2_description": "犬の写真",
+        "differences": ["動物の種類"],
+        "similarities": ["屋外で撮影"],
+        "overall_assessment": "構図は似ているが被写体が異なる",
+    },
+    Report: {
+        "summary": "調査結果の要約",
+        "sections": [
+            {"title": "背景", "findings": ["a", "b"]},
+            {"title": "結果", "findings": ["c"], "confidence": 0.8},
+        ],
+    },
+}
+
+
+class ToolCallStubModel(StubModel):
+    """StubModel answering every call with a forced tool call, and doing Bedrock's per-call schema work."""
+
+    def __init__(self, output_model: type[BaseModel]) -> None:
+        super().__init__()
+        self.output_model = output_model
+
+    def _next_turn(self) -> Turn:
+        name = self.output_model.__name__
+        return [{"toolUseId": "stub-1", "name": name, "input": SAMPLES[self.output_model]}]
+
+    async def structured_output[T: BaseModel](
+        self,
+        output_model: type[T],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, T | Any], None]:
+        # Same steps as BedrockModel.structured_output
+        tool_spec = convert_pydantic_to_tool_spec(output_model)
+        response = self.stream(prompt, [tool_spec], system_prompt, tool_choice=cast("ToolChoice", {"any": {}}))
+        stop: Any = None
+        async for event in streaming.process_stream(response):
+            stop = event.get("stop", stop)
+            yield event
+        _, message, _, _ = stop
+        tool_input = next(block["toolUse"]["input"] for block in message["content"] if "toolUse" in block)
+        yield {"output": output_model(**tool_input)}
+
+
+def per_call_us(func: Callable[[], Any], calls: int) -> float:
+    """Return the mean duration of ``func`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def bench_schema_work(output_model: type[BaseModel], calls: int) -> tuple[float, float, float]:
+    """Return the cold compile time and the per-call schema work without and with the registry (us)."""
+    data = SAMPLES[output_model]
+
+    def uncached() -> None:
+        # Tool spec for the request, JSON schema for the response cache key, then validation
+        convert_pydantic_to_tool_spec(output_model)
+        output_model.model_json_schema()
+        output_model(**data)
+
+    registry = SchemaRegistry()
+    start = time.perf_counter()
+    registry.warm_up(output_model)
+    cold = (time.perf_counter() - start) * 1e6
+
+    def cached() -> None:
+        compiled = registry.compile(output_model)
+        _ = compiled.tool_spec, compiled.schema_hash
+        compiled.validate(data)
+
+    return cold, per_call_us(uncached, calls), per_call_us(cached, calls)
+
+
+def bench_agent(output_model: type[BaseModel], calls: int) -> tuple[float, float]:
+    """Return the per-call duration of Agent.structured_output on a stub model without and with the registry (us)."""
+    registry = SchemaRegistry()
+    registry.warm_up(output_model)
+    plain = Agent(model=ToolCallStubModel(output_model), callback_handler=None)
+    precompiled = Agent(model=PrecompiledSchemaModel(ToolCallStubModel(output_model), registry), callback_handler=None)
+    return (
+        per_call_us(lambda: plain.structured_output(output_model, "テスト"), calls),
+        per_call_us(lambda: precompiled.structured_output(output_model, "テスト"), calls),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"schema work per call ({args.calls} calls)")
+    print(f"{'model':>16} | {'compile (us)':>12} | {'before (us)':>11} | {'after (us)':>10} | {'speedup':>7}")
+    print("-" * 69)
+    for output_model in SAMPLES:
+        cold, before, after = bench_schema_work(output_model, args.calls)
+        print(
+            f"{output_model.__name__:>16} | {cold:>12.1f} | {before:>11.1f} | {after:>10.2f} | {before / after:>6.0f}x"
+        )
+
+    calls = max(1, args.calls // 4)
+    print(f"\nAgent.structured_output on a stub model ({calls} calls)")
+    print(f"{'model':>16} | {'before (us)':>11} | {'after (us)':>10} | {'saved':>6}")
+    print("-" * 53)
+    for output_model in SAMPLES:
+        before, after = bench_agent(output_model, calls)
+        print(f"{output_model.__name__:>16} | {before:>11.1f} | {after:>10.1f} | {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark SemanticCache lookup latency and hit / false-hit rates.
+
+Usage:
+    # 1k / 10k / 100k エントリでの検索レイテンシと、閾値ごとのヒット率・誤ヒット率を計測
+    uv run python -m strands_agents_hands_on.examples.benchmark_semantic_cache
+
+    # エントリ数と埋め込みの次元数を変更
+    uv run python -m strands_agents_hands_on.examples.benchmark_semantic_cache \
+        --sizes 100000 500000 --dim 768
+"""
+
+import argparse
+import time
+from collections.abc import Sequence
+
+import numpy as np
+
+from .semantic_cache import SemanticCache
+
+TOPICS = [
+    "AIエージェント",
+    "機械学習",
+    "深層学習",
+    "強化学習",
+    "自然言語処理",
+    "画像認識",
+    "Pythonの非同期処理",
+    "Pythonのデコレータ",
+    "Rustの所有権",
+    "Goのgoroutine",
+    "Dockerコンテナ",
+    "Kubernetes",
+    "AWS Lambda",
+    "Amazon S3",
+    "SQLiteのWALモード",
+    "PostgreSQLのインデックス",
+    "REST API",
+    "GraphQL",
+    "OAuth 2.0",
+    "TLS証明書",
+]
+TEMPLATES = [
+    "{topic}について教えてください",
+    "{topic}について教えて下さい。",
+    "{topic}について詳しく教えてください",
+    "{topic}とは何ですか?",
+    "{topic}の概要を説明してください",
+]
+
+
+class RandomEmbedder:
+    """Embedder returning random vectors, to fill a cache quickly for latency measurements."""
+
+    def __init__(self, dim: int, seed: int = 0) -> None:
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        return self.rng.standard_normal((len(texts), self.dim), dtype=np.float32)
+
+
+def bench_latency(size: int, dim: int, queries: int) -> tuple[float, float, float]:
+    """Fill a cache with ``size`` entries and return p50 / p99 lookup latency (ms) and the fill time (s)."""
+    cache = SemanticCache(RandomEmbedder(dim), threshold=0.99, max_entries=size)
+    start = time.perf_counter()
+    batch = 10_000
+    for offset in range(0, size, batch):
+        count = min(batch, size - offset)
+        cache.add_many([f"prompt {offset + i}" for i in range(count)], ["response"] * count)
+    fill = time.perf_counter() - start
+
+    latencies = []
+    for i in range(queries):
+        start = time.perf_counter()
+        cache.lookup(f"query {i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return float(p50), float(p99), fill
+
+
+def bench_accuracy(threshold: float) -> tuple[float, float]:
+    """Return hit and false-hit rates of paraphrased queries when half of the topics are cached.
+
+    Queries about uncached topics should miss, so any hit on them counts as a false hit.
+    False hits are counted here instead of with ``report_false_hit``, which would retire
+    the entry and make later queries miss, so every threshold sees the same cache.
+    """
+    cache = SemanticCache(threshold=threshold)
+    cached_topics = TOPICS[::2]
+    cache.add_many([TEMPLATES[0].format(topic=topic) for topic in cached_topics], cached_topics)
+    false_hits = 0
+    for topic in TOPICS:
+        for template in TEMPLATES[1:]:
+            hit = cache.lookup(template.format(topic=topic))
+            if hit is not None and hit.response != topic:
+                false_hits += 1
+    stats = cache.stats
+    return stats.hit_rate, false_hits / stats.hits if stats.hits else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"lookup latency (dim={args.dim}, {args.queries} queries)")
+    print(f"{'entries':>8} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | {'fill (s)':>8}")
+    print("-" * 42)
+    for size in args.sizes:
+        p50, p99, fill = bench_latency(size, args.dim, args.queries)
+        print(f"{size:>8} | {p50:>8.3f} | {p99:>8.3f} | {fill:>8.2f}")
+
+    print(
+        f"\nHashingEmbedder, {len(TOPICS) // 2} of {len(TOPICS)} topics cached, {len(TEMPLATES) - 1} paraphrases each"
+    )
+    print(f"{'threshold':>9} | {'hit rate':>8} | {'false hits':>10}")
+    print("-" * 33)
+    for threshold in (0.3, 0.4, 0.5, 0.6, 0.7, 0.8):
+        hit_rate, false_hit_rate = bench_accuracy(threshold)
+        print(f"{threshold:>9.2f} | {hit_rate:>8.1%} | {false_hit_rate:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Downscale and re-encode images before sending them to the model, caching results by content hash.
+
+Usage:
+    # data/images の画像を2回処理し、削減バイト数とキャッシュヒットを確認
+    uv run python -m strands_agents_hands_on.examples.image_preprocessing
+
+    # 任意の画像を最大 1024px・JPEG で処理
+    uv run python -m strands_agents_hands_on.examples.image_preprocessing screenshot.png --max-edge 1024 --format jpeg
+"""
+
+import argparse
+import hashlib
+import io
+import mmap
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Literal, cast
+
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+from strands.types.content import ContentBlock
+
+ImageFormat = Literal["png", "jpeg", "gif", "webp"]
+
+# Longest edge Claude models use without downscaling on their side
+DEFAULT_MAX_EDGE = 1568
+# Approximate image token cost of Claude models: width * height / 750
+PIXELS_PER_TOKEN = 750
+
+PIL_FORMATS: dict[ImageFormat, str] = {"png": "PNG", "jpeg": "JPEG", "gif": "GIF", "webp": "WEBP"}
+FORMATS_BY_PIL: dict[str, ImageFormat] = {pil: name for name, pil in PIL_FORMATS.items()}
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    """An image ready to be sent to the model.
+
+    Attributes:
+        digest: SHA-256 of the original file
+        format: Format of ``data``
+        data: Encoded image bytes
+        original_size: Width and height of the original image
+        size: Width and height of ``data``
+        original_bytes: Size of the original file
+
+    """
+
+    digest: str
+    format: ImageFormat
+    data: bytes
+    original_size: tuple[int, int]
+    size: tuple[int, int]
+    original_bytes: int
+
+    @property
+    def estimated_tokens(self) -> int:
+        """Approximate input tokens of the processed image."""
+        return self.size[0] * self.size[1] // PIXELS_PER_TOKEN
+
+    @property
+    def original_estimated_tokens(self) -> int:
+        """Approximate input tokens the original image would have cost."""
+        return self.original_size[0] * self.original_size[1] // PIXELS_PER_TOKEN
+
+    def content_block(self) -> ContentBlock:
+        """Return the image content block for an agent prompt."""
+        return {"image": {"format": self.format, "source": {"bytes": self.data}}}
+
+
+@dataclass
+class ImagePreprocessStats:
+    """Counters of an ImagePreprocessor.
+
+    Attributes:
+        processed: Images decoded and re-encoded
+        cache_hits: Images answered from the cache by content hash
+        input_bytes: Bytes of the original files of every request
+        output_bytes: Bytes of the returned images of every request
+        process_seconds: Time spent hashing, decoding and encoding
+
+    """
+
+    processed: int = 0
+    cache_hits: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    process_seconds: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes removed from the requests."""
+        return self.input_bytes - self.output_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of requests answered from the cache."""
+        total = self.processed + self.cache_hits
+        return self.cache_hits / total if total else 0.0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        """Average time added per request in milliseconds."""
+        total = self.processed + self.cache_hits
+        return self.process_seconds / total * 1000 if total else 0.0
+
+
+class ImagePreprocessor:
+    """Prepare image files for the model: downscale to ``max_edge`` and re-encode.
+
+    Files are memory-mapped, so hashing and decoding read the page cache directly
+    instead of copying the whole file into a bytes object first. Results are kept
+    in an LRU cache keyed by the SHA-256 of the file content and the settings, so an
+    image sent again (in a later turn or another conversation) is neither decoded
+    nor re-encoded, and the same bytes object is reused.
+
+    If the re-encoded image is not smaller than the original and no downscaling was
+    needed, the original bytes are sent unchanged.
+    """
+
+    def __init__(
+        self,
+        max_edge: int = DEFAULT_MAX_EDGE,
+        output_format: ImageFormat = "webp",
+        quality: int = 80,
+        max_entries: int = 256,
+    ) -> None:
+        """Initialize the preprocessor.
+
+        Args:
+            max_edge: Maximum width and height of the sent images in pixels
+            output_format: Format to re-encode to
+            quality: Encoder quality for lossy formats (1-100)
+            max_entries: Maximum number of cached images
+
+        """
+        self.max_edge = max_edge
+        self.output_format: ImageFormat = output_format
+        self.quality = quality
+        self.max_entries = max_entries
+        self.stats = ImagePreprocessStats()
+        self._cache: OrderedDict[str, ProcessedImage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def process(self, path: str | Path) -> ProcessedImage:
+        """Return the processed image of a file, from the cache if its content was seen before.
+
+        Raises:
+            ValueError: If the file is empty
+            UnidentifiedImageError: If the file is not an image
+
+        """
+        start = time.perf_counter()
+        path = Path(path)
+        # mmap cannot map an empty file
+        if path.stat().st_size == 0:
+            msg = f"Empty image file: {path}"
+            raise ValueError(msg)
+        with path.open("rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest = hashlib.sha256(mapped).hexdigest()
+            key = f"{digest}:{self.max_edge}:{self.output_format}:{self.quality}"
+            with self._lock:
+                processed = self._cache.get(key)
+                if processed is not None:
+                    self._cache.move_to_end(key)
+            if processed is None:
+                processed = self._encode(mapped, digest, path)
+                with self._lock:
+                    self._cache[key] = processed
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+                hit = False
+            else:
+                hit = True
+
+        with self._lock:
+            if hit:
+                self.stats.cache_hits += 1
+            else:
+                self.stats.processed += 1
+            self.stats.input_bytes += processed.original_bytes
+            self.stats.output_bytes += len(processed.data)
+            self.stats.process_seconds += time.perf_counter() - start
+        return processed
+
+    def content_block(self, path: str | Path) -> ContentBlock:
+        """Return the image content block of a file for an agent prompt."""
+        return self.process(path).content_block()
+
+    def _encode(self, mapped: mmap.mmap, digest: str, path: Path) -> ProcessedImage:
+        output_format = self.output_format
+        try:
+            opened = Image.open(cast("IO[bytes]", mapped))
+        except (UnidentifiedImageError, ValueError) as e:
+            # Some plugins probe past the end of a short file, which mmap rejects with ValueError
+            msg = f"Not an image file: {path}"
+            raise UnidentifiedImageError(msg) from e
+        with opened as image:
+            original_format = FORMATS_BY_PIL.get(image.format or "")
+            original_size = image.size
+            # thumbnail keeps the aspect ratio, and lets JPEG decode at a reduced scale directly
+            image.thumbnail((self.max_edge, self.max_edge), Image.Resampling.LANCZOS)
+            # Apply the EXIF orientation to the pixels, since the re-encoded image carries no EXIF.
+            # Transposing after thumbnail keeps its reduced-scale JPEG decoding; the bound is square either way
+            rotated = image.getexif().get(ExifTags.Base.Orientation, 1) not in (0, 1)
+            upright = ImageOps.exif_transpose(image) if rotated else image
+            if output_format == "jpeg" and upright.mode not in ("RGB", "L"):
+                converted = upright.convert("RGB")
+            elif upright.mode not in ("RGB", "RGBA", "L", "LA"):
+                converted = upright.convert("RGBA")
+            else:
+                converted = upright
+            buffer = io.BytesIO()
+            converted.save(buffer, PIL_FORMATS[output_format], quality=self.quality)
+            size = upright.size
+
+        data = buffer.getvalue()
+        # The original is only sent as is when it is already upright
+        if not rotated and size == original_size and len(data) >= len(mapped) and original_format is not None:
+            return ProcessedImage(digest, original_format, mapped[:], original_size, size, len(mapped))
+        return ProcessedImage(digest, output_format, data, original_size, size, len(mapped))
+
+    def clear(self) -> None:
+        """Drop every cached image."""
+        with self._lock:
+            self._cache.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=["data/images/image1.png", "data/images/image2.png"])
+    parser.add_argument("--max-edge", type=int, default=DEFAULT_MAX_EDGE)
+    parser.add_argument("--format", choices=list(PIL_FORMATS), default="webp")
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+
+    preprocessor = ImagePreprocessor(args.max_edge, cast("ImageFormat", args.format), args.quality)
+    # 2回目はキャッシュから返る (同じ会話の後続ターンで同じ画像を送る場合を想定)
+    for attempt in range(2):
+        for path in args.paths:
+            start = time.perf_counter()
+            image = preprocessor.process(path)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(
+                f"[{attempt + 1}回目] {path}: {image.original_bytes:,}B {image.original_size} → "
+                f"{len(image.data):,}B {image.size} {image.format} "
+                f"(推定トークン {image.original_estimated_tokens} → {image.estimated_tokens}, {elapsed:.1f}ms)"
+            )
+
+    stats = preprocessor.stats
+    print(
+        f"\n削減: {stats.bytes_saved:,}B ({stats.bytes_saved / max(stats.input_bytes, 1):.0%}), "
+        f"キャッシュヒット率: {stats.hit_rate:.0%}, 平均追加レイテンシ: {stats.mean_latency_ms:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Model wrapper caching responses of deterministic calls, in memory or in SQLite.
+
+Usage:
+    # 同じプロンプトを2回送り、2回目がキャッシュから返ることを確認
+    uv run python -m strands_agents_hands_on.examples.response_cache
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, AsyncIterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+from pydantic import BaseModel
+from strands.models.model import Model
+from strands.types.content import Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolSpec
+
+from strands_agents_hands_on.examples.schema_registry import schema_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL
+)
+"""
+SELECT_SQL = "SELECT value, expires_at FROM responses WHERE key = ?"
+UPSERT_SQL = "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)"
+DELETE_SQL = "DELETE FROM responses WHERE key = ?"
+DELETE_EXPIRED_SQL = "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?"
+
+
+class ResponseCacheBackend(Protocol):
+    """Storage for cached responses, keyed by request hash."""
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None if it is missing or expired."""
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value."""
+        ...
+
+
+class MemoryResponseCache:
+    """Bounded in-process LRU cache with TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Seconds a response stays valid (None for no expiry)
+
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Values are stored serialized so callers never share mutable objects
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value, evicting the least recently used entry if full."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        serialized = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._entries[key] = (expires_at, serialized)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResponseCache:
+    """On-disk response cache with TTL, shared by every process using the same file."""
+
+    def __init__(self, db_path: str = "data/response_cache.db", ttl: float | None = None) -> None:
+        """Initialize the cache and create its table if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Seconds a response stays valid (None for no expiry)
+
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(CREATE_TABLE_SQL)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            row = self._conn.execute(SELECT_SQL, (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute(DELETE_SQL, (key,))
+                self._conn.commit()
+                return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._conn.execute(UPSERT_SQL, (key, json.dumps(value, ensure_ascii=False), expires_at))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired responses and return their number."""
+        with self._lock:
+            deleted = self._conn.execute(DELETE_EXPIRED_SQL, (time.time(),)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class ResponseCacheStats:
+    """Counters of a CachedModel.
+
+    Attributes:
+        hits: Calls answered from the cache
+        misses: Calls forwarded to the wrapped model
+        bypassed: Calls forwarded without reading or writing the cache (``bypass`` or a request that cannot be keyed)
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of cacheable calls answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _canonical(value: Any) -> Any:
+    """Make request parts JSON-serializable with a stable representation."""
+    if isinstance(value, bytes):
+        # Images and documents are keyed by content hash instead of their full bytes
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    # Collapsing other values to their type would give requests that differ in them the same key
+    msg = f"Cannot build a cache key from a {type(value).__qualname__} value"
+    raise TypeError(msg)
+
+
+def request_key(*parts: Any) -> str:
+    """Return the SHA-256 hash of the canonical JSON encoding of ``parts``.
+
+    Raises:
+        TypeError: If a part contains a value other than JSON types, bytes and pydantic models
+
+    """
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_canonical)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CachedModel(Model):
+    """Model wrapper that replays cached responses for identical requests.
+
+    The cache key is a hash of the wrapped model's class and config (model ID and
+    parameters), the system prompt, the messages and the tool specs, so any change in
+    the request is a miss. Responses are stored as the list of stream events and only
+    once the stream completed, and ``structured_output`` results are stored as the
+    validated model's data and validated again on a hit.
+
+    Replayed responses report zero token usage and latency, so metrics reflect what
+    the calls actually cost. Set ``bypass`` to call the wrapped model without reading
+    or writing the cache; requests containing values that cannot be keyed are forwarded
+    the same way. Caching only makes sense for deterministic calls (for
+    example temperature 0 in regression and evaluation runs).
+    """
+
+    def __init__(self, model: Model, cache: ResponseCacheBackend, *, bypass: bool = False) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            model: Model to forward cache misses to
+            cache: Backend storing the responses (MemoryResponseCache or SQLiteResponseCache)
+            bypass: Forward every call to the wrapped model without using the cache
+
+        """
+        self.model = model
+        self.cache = cache
+        self.bypass = bypass
+        self.stats = ResponseCacheStats()
+
+    @property
+    def config(self) -> Any:
+        """Config of the wrapped model."""
+        return self.model.get_config()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.model.update_config(**model_config)
+
+    def get_config(self) -> Any:
+        return self.model.get_config()
+
+    def _key(self, kind: str, *parts: Any) -> str | None:
+        """Return the cache key of a request, or None if the cache is bypassed or the request cannot be keyed."""
+        if self.bypass:
+            return None
+        try:
+            return request_key(kind, type(self.model).__qualname__, self.model.get_config(), *parts)
+        except TypeError as e:
+            logger.debug("kind=<%s> | request cannot be cached: %s", kind, e)
+            return None
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        key = self._key("stream", system_prompt, messages, tool_specs)
+        if key is None:
+            self.stats.bypassed += 1
+            async for event in self.model.stream(messages, tool_specs, system_prompt, **kwargs):
+                yield event
+            return
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            for event in cached:
+                if "metadata" in event:
+                    event["metadata"]["usage"] = {"inputTokens": 0, "outputTokens": 0, "totalTokens": 0}
+                    event["metadata"]["metrics"] = {"latencyMs": 0}
+                yield event
+            return
+
+        self.stats.misses += 1
+        events: list[StreamEvent] = []
+        async for event in self.model.stream(messages, tool_specs, system_prompt, **kwargs):
+            events.append(event)
+            yield event
+        if any("messageStop" in event for event in events):
+            self.cache.set(key, events)
+
+    async def structured_output(
+        self,
+        output_model: type[T],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, T | Any], None]:
+        schema_hash = None if self.bypass else schema_registry.compile(output_model).schema_hash
+        key = self._key("structured_output", schema_hash, system_prompt, prompt)
+        if key is None:
+            self.stats.bypassed += 1
+            async for event in self.model.structured_output(output_model, prompt, system_prompt, **kwargs):
+                yield event
+            return
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            yield {"output": output_model.model_validate(cached)}
+            return
+
+        self.stats.misses += 1
+        async for event in self.model.structured_output(output_model, prompt, system_prompt, **kwargs):
+            if isinstance(event.get("output"), output_model):
+                self.cache.set(key, event["output"].model_dump(mode="json"))
+            yield event
+
+
+if __name__ == "__main__":
+    from strands import Agent
+    from strands.models.bedrock import BedrockModel
+
+    # 決定的な応答にするため temperature を 0 に設定
+    model = CachedModel(BedrockModel(temperature=0.0), SQLiteResponseCache("data/response_cache.db", ttl=24 * 3600))
+
+    for attempt in range(2):
+        agent = Agent(model=model, callback_handler=None)
+        start = time.perf_counter()
+        response = agent("AIエージェントについて教えてください")
+        elapsed = time.perf_counter() - start
+        print(f"=== {attempt + 1}回目 ({elapsed:.2f}s) ===\n{response}\n")
+
+    print(f"キャッシュヒット: {model.stats.hits}, ミス: {model.stats.misses} (ヒット率 {model.stats.hit_rate:.0%})")
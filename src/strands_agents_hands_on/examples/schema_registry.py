@@ -0,0 +1,230 @@
+"""Registry of precompiled tool specs, JSON schemas and validators for structured output models.
+
+Usage:
+    # 登録済みのモデルをウォームアップし、コンパイル結果を確認
+    uv run python -m strands_agents_hands_on.examples.schema_registry
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import AsyncGenerator, AsyncIterable
+from dataclasses import dataclass
+from typing import Any, cast
+
+from pydantic import BaseModel, TypeAdapter
+from strands.event_loop import streaming
+from strands.models.model import Model
+from strands.tools.structured_output import convert_pydantic_to_tool_spec
+from strands.types.content import Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolChoice, ToolSpec
+
+
+@dataclass(frozen=True)
+class CompiledSchema[T: BaseModel]:
+    """Everything structured output needs for one output model, computed once.
+
+    Attributes:
+        output_model: The pydantic model class
+        tool_spec: Tool spec sent to the model to force the structured response
+        json_schema: JSON schema of the model
+        schema_hash: SHA-256 of the canonical JSON schema, usable in cache keys
+        adapter: Validator of the model's data
+
+    """
+
+    output_model: type[T]
+    tool_spec: ToolSpec
+    json_schema: dict[str, Any]
+    schema_hash: str
+    adapter: TypeAdapter[T]
+
+    def validate(self, data: Any) -> T:
+        """Validate Python data (for example a tool call input) into the model."""
+        return self.adapter.validate_python(data)
+
+    def validate_json(self, data: str | bytes) -> T:
+        """Validate a JSON document into the model without building intermediate dicts."""
+        return self.adapter.validate_json(data)
+
+
+@dataclass
+class SchemaRegistryStats:
+    """Counters of a SchemaRegistry.
+
+    Attributes:
+        hits: Lookups answered by an already compiled schema
+        misses: Lookups that compiled a schema
+        compile_seconds: Total time spent compiling schemas
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    compile_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without compiling."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SchemaRegistry:
+    """Thread-safe memo of CompiledSchema per output model class.
+
+    Converting a model into a tool spec walks and flattens its JSON schema, which
+    costs far more than validating a typical response. The registry does that work
+    once per class, and ``warm_up`` lets it happen at import or startup instead of on
+    the first request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.stats = SchemaRegistryStats()
+        self._compiled: dict[type[BaseModel], CompiledSchema[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of compiled models."""
+        return len(self._compiled)
+
+    def __contains__(self, output_model: type[BaseModel]) -> bool:
+        """Return whether the model is already compiled."""
+        return output_model in self._compiled
+
+    def compile[T: BaseModel](self, output_model: type[T]) -> CompiledSchema[T]:
+        """Return the compiled schema of the model, compiling it on first use."""
+        with self._lock:
+            compiled = self._compiled.get(output_model)
+            if compiled is not None:
+                self.stats.hits += 1
+                return compiled
+
+            start = time.perf_counter()
+            json_schema = output_model.model_json_schema()
+            encoded = json.dumps(json_schema, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+            compiled = CompiledSchema(
+                output_model=output_model,
+                tool_spec=convert_pydantic_to_tool_spec(output_model),
+                json_schema=json_schema,
+                schema_hash=hashlib.sha256(encoded.encode()).hexdigest(),
+                adapter=TypeAdapter(output_model),
+            )
+            self._compiled[output_model] = compiled
+            self.stats.misses += 1
+            self.stats.compile_seconds += time.perf_counter() - start
+            return compiled
+
+    def warm_up(self, *output_models: type[BaseModel]) -> None:
+        """Compile the models ahead of their first request."""
+        for output_model in output_models:
+            self.compile(output_model)
+
+    def clear(self) -> None:
+        """Drop every compiled schema."""
+        with self._lock:
+            self._compiled.clear()
+
+
+# Registry shared by the examples
+schema_registry = SchemaRegistry()
+
+
+class PrecompiledSchemaModel(Model):
+    """Model wrapper answering ``structured_output`` with schemas from a SchemaRegistry.
+
+    It forces a call of the output model's tool like BedrockModel does, but takes the
+    tool spec and the validator from the registry instead of converting the model on
+    every call. It suits providers implementing structured output by forced tool use
+    (Bedrock, Anthropic). ``stream`` is forwarded unchanged.
+    """
+
+    def __init__(self, model: Model, registry: SchemaRegistry | None = None) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            model: Model to send the requests to
+            registry: Registry of compiled schemas (the shared ``schema_registry`` by default)
+
+        """
+        self.model = model
+        self.registry = registry or schema_registry
+
+    @property
+    def config(self) -> Any:
+        """Config of the wrapped model."""
+        return self.model.get_config()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.model.update_config(**model_config)
+
+    def get_config(self) -> Any:
+        return self.model.get_config()
+
+    def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        return self.model.stream(messages, tool_specs, system_prompt, **kwargs)
+
+    async def structured_output[T: BaseModel](
+        self,
+        output_model: type[T],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, T | Any], None]:
+        compiled = self.registry.compile(output_model)
+        tool_name = compiled.tool_spec["name"]
+        response = self.model.stream(
+            prompt,
+            [compiled.tool_spec],
+            system_prompt,
+            tool_choice=cast("ToolChoice", {"any": {}}),
+            **kwargs,
+        )
+        stop: Any = None
+        async for event in streaming.process_stream(response):
+            stop = event.get("stop", stop)
+            yield event
+
+        if stop is None:
+            msg = "Model stream ended without a stop event"
+            raise ValueError(msg)
+        stop_reason, message, _, _ = stop
+        if stop_reason != "tool_use":
+            msg = f'Model returned stop_reason: {stop_reason} instead of "tool_use".'
+            raise ValueError(msg)
+
+        tool_input = None
+        for block in message["content"]:
+            if "toolUse" in block and block["toolUse"]["name"] == tool_name:
+                tool_input = block["toolUse"]["input"]
+        if tool_input is None:
+            msg = f"No {tool_name} tool use was found in the model response."
+            raise ValueError(msg)
+
+        yield {"output": compiled.validate(tool_input)}
+
+
+if __name__ == "__main__":
+    from pydantic import Field
+
+    class AIAgentInfo(BaseModel):
+        """AIエージェントに関する情報"""
+
+        definition: str = Field(description="AIエージェントの定義")
+        key_features: list[str] = Field(description="主な特徴のリスト")
+
+    schema_registry.warm_up(AIAgentInfo)
+    compiled = schema_registry.compile(AIAgentInfo)
+    print(f"ツール名: {compiled.tool_spec['name']}")
+    print(f"スキーマハッシュ: {compiled.schema_hash[:16]}...")
+    print(f"コンパイル時間: {schema_registry.stats.compile_seconds * 1000:.2f}ms")
+    print(compiled.validate_json('{"definition": "自律的なAI", "key_features": ["ツール利用"]}'))
@@ -0,0 +1,254 @@
+"""Semantic prompt cache answering near-duplicate questions from earlier responses.
+
+Usage:
+    # 言い回しの異なる同じ質問がキャッシュから返ることを確認
+    uv run python -m strands_agents_hands_on.examples.semantic_cache
+"""
+
+import hashlib
+import threading
+import unicodedata
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from strands import Agent
+
+# Embeds a batch of texts into a (len(texts), dim) float array
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+class HashingEmbedder:
+    """Local embedder hashing character n-grams into a fixed-size vector.
+
+    It needs no model download and handles Japanese text, where word boundaries are
+    not marked, because it works on characters. Similar wording gives similar
+    vectors, but it does not understand meaning: plug in a sentence embedding model
+    (any callable returning an array) for paraphrases with different wording.
+    """
+
+    def __init__(self, dim: int = 512, ngram_sizes: tuple[int, ...] = (2, 3)) -> None:
+        """Initialize the embedder.
+
+        Args:
+            dim: Dimension of the vectors
+            ngram_sizes: Lengths of the character n-grams to hash
+
+        """
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed the texts into a (len(texts), dim) float32 array."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            normalized = "".join(unicodedata.normalize("NFKC", text).lower().split())
+            for size in self.ngram_sizes:
+                for start in range(len(normalized) - size + 1):
+                    digest = hashlib.blake2b(normalized[start : start + size].encode(), digest_size=8).digest()
+                    bucket = int.from_bytes(digest[:4], "little") % self.dim
+                    vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vectors
+
+
+@dataclass
+class SemanticCacheStats:
+    """Counters of a SemanticCache.
+
+    Attributes:
+        hits: Lookups answered by a cached entry above the similarity threshold
+        misses: Lookups without a close enough entry
+        false_hits: Hits reported as wrong with ``report_false_hit``
+        evictions: Entries dropped because the cache was full
+        hit_similarity: Sum of the similarities of all hits
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    false_hits: int = 0
+    evictions: int = 0
+    hit_similarity: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def false_hit_rate(self) -> float:
+        """Fraction of hits reported as wrong."""
+        return self.false_hits / self.hits if self.hits else 0.0
+
+    @property
+    def mean_hit_similarity(self) -> float:
+        """Average cosine similarity of the hits."""
+        return self.hit_similarity / self.hits if self.hits else 0.0
+
+
+@dataclass
+class SemanticHit:
+    """A cached entry matching a lookup.
+
+    Attributes:
+        slot: Index of the entry, to pass to ``report_false_hit``
+        prompt: Prompt the response was cached for
+        response: Cached response
+        similarity: Cosine similarity between the lookup and the cached prompt
+
+    """
+
+    slot: int
+    prompt: str
+    response: str
+    similarity: float
+
+
+class SemanticCache:
+    """Bounded cache of responses searched by cosine similarity of prompt embeddings.
+
+    Embeddings are L2-normalized and kept in one preallocated NumPy matrix, so a lookup
+    is a single matrix-vector product over all entries followed by an argmax. When the
+    cache is full, the least recently used entry is overwritten in place.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        threshold: float = 0.8,
+        max_entries: int = 10_000,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            embedder: Function embedding a batch of texts (HashingEmbedder by default)
+            threshold: Minimum cosine similarity for a cached response to be returned
+            max_entries: Maximum number of cached responses
+
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.stats = SemanticCacheStats()
+        self._vectors: np.ndarray | None = None
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._prompts: list[str] = []
+        self._responses: list[str] = []
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._prompts)
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.asarray(self.embedder(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def lookup(self, prompt: str) -> SemanticHit | None:
+        """Return the most similar cached entry if it is above the threshold."""
+        query = self._embed([prompt])[0]
+        with self._lock:
+            self._clock += 1
+            if self._vectors is None or not self._prompts:
+                self.stats.misses += 1
+                return None
+            similarities = self._vectors[: len(self._prompts)] @ query
+            slot = int(np.argmax(similarities))
+            similarity = float(similarities[slot])
+            if similarity < self.threshold:
+                self.stats.misses += 1
+                return None
+            self._last_used[slot] = self._clock
+            self.stats.hits += 1
+            self.stats.hit_similarity += similarity
+            return SemanticHit(slot, self._prompts[slot], self._responses[slot], similarity)
+
+    def add(self, prompt: str, response: str) -> None:
+        """Cache a response, overwriting the least recently used entry if the cache is full."""
+        self.add_many([prompt], [response])
+
+    def add_many(self, prompts: Sequence[str], responses: Sequence[str]) -> None:
+        """Cache several responses with one embedding call."""
+        vectors = self._embed(prompts)
+        with self._lock:
+            matrix = self._vectors
+            if matrix is None:
+                matrix = self._vectors = np.zeros((self.max_entries, vectors.shape[1]), dtype=np.float32)
+            for vector, prompt, response in zip(vectors, prompts, responses, strict=True):
+                self._clock += 1
+                if len(self._prompts) < self.max_entries:
+                    slot = len(self._prompts)
+                    self._prompts.append(prompt)
+                    self._responses.append(response)
+                else:
+                    slot = int(np.argmin(self._last_used))
+                    self._prompts[slot] = prompt
+                    self._responses[slot] = response
+                    self.stats.evictions += 1
+                matrix[slot] = vector
+                self._last_used[slot] = self._clock
+
+    def report_false_hit(self, hit: SemanticHit) -> None:
+        """Record that a hit returned a wrong answer and stop returning that entry."""
+        with self._lock:
+            self.stats.false_hits += 1
+            if hit.slot < len(self._prompts) and self._prompts[hit.slot] == hit.prompt and self._vectors is not None:
+                # A zero vector has similarity 0 with every query, and is the first to be overwritten
+                self._vectors[hit.slot] = 0.0
+                self._last_used[hit.slot] = 0
+
+
+class SemanticCachedAgent:
+    """Call an agent only when no cached response answers a similar prompt.
+
+    The cache is keyed on the prompt alone, so it suits single-turn agents: with
+    ``stateless`` (the default) the agent's conversation is cleared after every call,
+    so each answer depends only on its prompt.
+    """
+
+    def __init__(self, agent: Agent, cache: SemanticCache, *, stateless: bool = True) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            agent: Agent answering cache misses
+            cache: Semantic cache holding earlier answers
+            stateless: Clear the agent's conversation after each call
+
+        """
+        self.agent = agent
+        self.cache = cache
+        self.stateless = stateless
+        self.last_hit: SemanticHit | None = None
+
+    def __call__(self, prompt: str) -> str:
+        """Return a cached answer for a similar prompt, or ask the agent and cache its answer."""
+        self.last_hit = self.cache.lookup(prompt)
+        if self.last_hit is not None:
+            return self.last_hit.response
+
+        response = str(self.agent(prompt))
+        if self.stateless:
+            self.agent.messages = []
+        self.cache.add(prompt, response)
+        return response
+
+
+if __name__ == "__main__":
+    agent = SemanticCachedAgent(Agent(callback_handler=None), SemanticCache())
+
+    for prompt in [
+        "AIエージェントについて教えてください",
+        "AIエージェントについて教えてください。",
+        "AI エージェントについて教えて下さい",
+        "Pythonの非同期処理について教えてください",
+    ]:
+        response = agent(prompt)
+        hit = agent.last_hit
+        source = f"キャッシュ (類似度 {hit.similarity:.2f}: {hit.prompt})" if hit else "エージェント"
+        print(f"=== {prompt} → {source} ===\n{response[:200]}\n")
+
+    stats = agent.cache.stats
+    print(f"ヒット率: {stats.hit_rate:.0%} (ヒット {stats.hits}, ミス {stats.misses})")
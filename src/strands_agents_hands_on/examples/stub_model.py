@@ -0,0 +1,120 @@
+"""Scripted model with artificial latency, used by the benchmarks to run agents offline."""
+
+import asyncio
+import json
+import threading
+from collections.abc import AsyncGenerator, AsyncIterable, Sequence
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from strands.models.model import Model
+from strands.types.content import Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolSpec, ToolUse
+
+T = TypeVar("T", bound=BaseModel)
+
+# A scripted model turn: a text answer, or content blocks (text and tool calls) to return
+Turn = str | list[str | ToolUse]
+
+# Rough characters-per-token ratio used for the reported token usage
+CHARS_PER_TOKEN = 4
+
+
+class StubModel(Model):
+    """Model that replays scripted turns after sleeping ``delay`` seconds.
+
+    Each ``stream`` call consumes the next turn of ``script``; once the script is
+    exhausted every call answers ``default_text``. Token usage is estimated from the
+    text length, so token accounting code sees plausible numbers.
+    """
+
+    def __init__(
+        self,
+        script: Sequence[Turn] = (),
+        delay: float = 0.0,
+        default_text: str = "ok",
+        structured: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the stub model.
+
+        Args:
+            script: Turns returned by successive ``stream`` calls
+            delay: Seconds to sleep before each response, emulating model latency
+            default_text: Answer once the script is exhausted
+            structured: Field values returned by ``structured_output``
+
+        """
+        self.script = list(script)
+        self.delay = delay
+        self.default_text = default_text
+        self.structured = structured or {}
+        self.calls = 0
+        self.config: dict[str, Any] = {"model_id": "stub"}
+        self._lock = threading.Lock()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> dict[str, Any]:
+        return self.config
+
+    def _next_turn(self) -> Turn:
+        with self._lock:
+            turn = self.script[self.calls] if self.calls < len(self.script) else self.default_text
+            self.calls += 1
+        return turn
+
+    async def structured_output(
+        self,
+        output_model: type[T],
+        prompt: Messages,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, T | Any], None]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        yield {"output": output_model.model_validate(self.structured)}
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        turn = self._next_turn()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        input_chars = len(system_prompt or "") + sum(
+            len(block.get("text", "")) for message in messages for block in message["content"]
+        )
+        yield {"messageStart": {"role": "assistant"}}
+        stop_reason, output_chars = "end_turn", 0
+        for block in [turn] if isinstance(turn, str) else turn:
+            if isinstance(block, str):
+                yield {"contentBlockDelta": {"delta": {"text": block}}}
+                yield {"contentBlockStop": {}}
+                output_chars += len(block)
+                continue
+            yield {
+                "contentBlockStart": {"start": {"toolUse": {"name": block["name"], "toolUseId": block["toolUseId"]}}}
+            }
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(block["input"])}}}}
+            yield {"contentBlockStop": {}}
+            stop_reason, output_chars = "tool_use", output_chars + len(json.dumps(block))
+        yield {"messageStop": {"stopReason": stop_reason}}
+
+        input_tokens = input_chars // CHARS_PER_TOKEN + 1
+        output_tokens = output_chars // CHARS_PER_TOKEN + 1
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                    "totalTokens": input_tokens + output_tokens,
+                },
+                "metrics": {"latencyMs": int(self.delay * 1000)},
+            }
+        }